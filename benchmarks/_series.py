@@ -0,0 +1,63 @@
+"""Module to generate synthetic time series for benchmarks."""
+from typing import Tuple
+
+import numpy as np
+
+
+SERIES_KINDS = ['periodic', 'trend', 'noise', 'mixture']
+
+
+def make_series(n: int, kind: str='mixture', irregular: bool=False, seed: int=0) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate a synthetic univariate time series.
+
+    Series are built from the following components:
+        * `periodic`: Sum of two sines with different periods and amplitudes,
+        * `trend`: Quadratic trend,
+        * `noise`: Gaussian white noise,
+        * `mixture`: Sum of all of the above.
+
+    Parameters
+    ----------
+    n: int
+        Number of data points, usually between `10^2` and `10^5`.
+
+    kind: str
+        Kind of series to generate, one of `SERIES_KINDS`.
+
+    irregular: bool
+        Whether to sample time points uniformly at random instead of on a regular grid.
+
+    seed: int
+        Seed used for all randomness, such that series are reproducible.
+
+    Returns
+    -------
+    x, y: Tuple[np.ndarray, np.ndarray]
+        Time points and observations, both of shape `(n,)`.
+
+    Raises
+    ------
+    ValueError
+        If `kind` is unknown.
+
+    """
+    if kind not in SERIES_KINDS:
+        raise ValueError(f'Unknown kind of series `{kind}`, available are `{SERIES_KINDS}`.')
+
+    random_state = np.random.RandomState(seed)
+    if irregular:
+        x = np.sort(random_state.uniform(0, 10, size=n))
+    else:
+        x = np.linspace(0, 10, n)
+
+    periodic = np.sin(2 * np.pi * x) + 0.5 * np.sin(2 * np.pi * x / 3.7)
+    trend = 0.05 * x ** 2 - 0.3 * x
+    noise = random_state.normal(scale=0.3, size=n)
+
+    components = {
+        'periodic': periodic,
+        'trend': trend,
+        'noise': noise,
+        'mixture': periodic + trend + noise,
+    }
+    return x, components[kind]
@@ -0,0 +1,316 @@
+"""Run benchmarks of `kerndisc` and compare them against a stored baseline.
+
+Benchmarks cover the subsystems of `kerndisc` individually, i.e., preprocessing, expansion,
+simplification, textual representation and evaluation, as well as an end-to-end `discover`.
+All randomness is seeded, such that runs are comparable.
+
+For each benchmark the latency of every repetition is recorded, from which mean, median, p95
+and throughput (items processed per second) are derived. Peak memory is recorded as increase of
+the peak resident set size of the process and as peak of traced python/numpy allocations. As tracing
+allocations slows down python heavy code considerably, the latter is measured in a separate, untimed
+repetition.
+
+Usage
+-----
+From the repositories root, with `src` on the `PYTHONPATH` (see `.env`), run:
+```
+    > python benchmarks/run_benchmarks.py --output results.json
+```
+To store a baseline and later compare against it, failing if any benchmarks median latency
+regressed by more than 20 %:
+```
+    > python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    > python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.2
+```
+
+"""
+import argparse
+from copy import deepcopy
+import json
+import logging
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from _series import make_series, SERIES_KINDS  # noqa: I202, I100
+from kerndisc import discover, preprocess  # noqa: I202, I100
+from kerndisc._util import build_all_implemented_base_asts
+from kerndisc.description import ast_to_text, simplify
+from kerndisc.evaluation import evaluate_asts
+from kerndisc.expansion import clear_expansion_cache, expand_asts
+
+
+_LOGGER = logging.getLogger('benchmarks')
+_PREPROCESS_SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5]
+_SAMPLINGS = {'regular': False, 'irregular': True}
+_SEED = 0
+
+# A benchmark takes the parsed arguments, does its setup and returns a callable running one repetition,
+# which returns the number of items it processed.
+Benchmark = Callable[[argparse.Namespace], Callable[[], int]]
+
+
+def _make_random_asts(count: int, depth: int, seed: int=_SEED) -> List[Any]:
+    """Make random kernel ASTs by repeatedly applying a random expansion to base kernels."""
+    random_state = random.Random(seed)
+    asts = []
+    for _ in range(count):
+        ast = random_state.choice(build_all_implemented_base_asts())
+        for _ in range(depth):
+            ast = random_state.choice(expand_asts([ast]))
+        asts.append(ast)
+    return asts
+
+
+def _benchmark_preprocess(n: int, kind: str, irregular: bool) -> Benchmark:
+    def _setup(args: argparse.Namespace) -> Callable[[], int]:
+        x, y = make_series(n, kind=kind, irregular=irregular)
+
+        def _run() -> int:
+            preprocess(x, y, rescale_x_to_upper_bound=10.)
+            return n
+
+        return _run
+    return _setup
+
+
+def _benchmark_expand_asts(warm: bool) -> Benchmark:
+    def _setup(args: argparse.Namespace) -> Callable[[], int]:
+        asts = _make_random_asts(args.ast_count, args.ast_depth)
+        clear_expansion_cache()
+        if warm:
+            expand_asts(asts)
+
+        def _run() -> int:
+            if not warm:
+                clear_expansion_cache()
+            expand_asts(asts)
+            return len(asts)
+
+        return _run
+    return _setup
+
+
+def _benchmark_simplify(args: argparse.Namespace) -> Callable[[], int]:
+    asts = _make_random_asts(args.ast_count, args.ast_depth)
+
+    def _run() -> int:
+        for ast in asts:
+            simplify(ast)
+        return len(asts)
+
+    return _run
+
+
+def _benchmark_ast_to_text(args: argparse.Namespace) -> Callable[[], int]:
+    asts = _make_random_asts(args.ast_count, args.ast_depth)
+
+    def _run() -> int:
+        for ast in asts:
+            ast_to_text(ast)
+        return len(asts)
+
+    return _run
+
+
+def _benchmark_evaluate_asts(n: int, kind: str, irregular: bool) -> Benchmark:
+    def _setup(args: argparse.Namespace) -> Callable[[], int]:
+        x, y = preprocess(*make_series(n, kind=kind, irregular=irregular))
+        asts = build_all_implemented_base_asts()
+
+        def _run() -> int:
+            np.random.seed(_SEED)
+            for _ in evaluate_asts(x, y, deepcopy(asts)):
+                pass
+            return len(asts)
+
+        return _run
+    return _setup
+
+
+def _benchmark_discover(n: int, kind: str, irregular: bool) -> Benchmark:
+    def _setup(args: argparse.Namespace) -> Callable[[], int]:
+        x, y = make_series(n, kind=kind, irregular=irregular)
+
+        def _run() -> int:
+            np.random.seed(_SEED)
+            clear_expansion_cache()
+            discover(x, y, search_depth=args.search_depth)
+            return n
+
+        return _run
+    return _setup
+
+
+def _make_benchmarks(args: argparse.Namespace) -> Dict[str, Benchmark]:
+    """Make all benchmarks, keyed by their name.
+
+    Benchmarks of preprocessing, evaluation and discovery run on each kind of series of `SERIES_KINDS`, sampled
+    regularly and irregularly, named e.g. `discover/mixture/irregular/n=100`.
+
+    """
+    series = [(kind, sampling, irregular) for kind in SERIES_KINDS for sampling, irregular in _SAMPLINGS.items()]
+    benchmarks: Dict[str, Benchmark] = {f'preprocess/{kind}/{sampling}/n={n}': _benchmark_preprocess(n, kind, irregular)
+                                        for kind, sampling, irregular in series for n in _PREPROCESS_SIZES}
+    benchmarks.update({
+        'expand_asts/cold': _benchmark_expand_asts(warm=False),
+        'expand_asts/warm': _benchmark_expand_asts(warm=True),
+        'simplify': _benchmark_simplify,
+        'ast_to_text': _benchmark_ast_to_text,
+    })
+    benchmarks.update({f'evaluate_asts/{kind}/{sampling}/n={n}': _benchmark_evaluate_asts(n, kind, irregular)
+                       for kind, sampling, irregular in series for n in args.sizes})
+    benchmarks.update({f'discover/{kind}/{sampling}/n={n}': _benchmark_discover(n, kind, irregular)
+                       for kind, sampling, irregular in series for n in args.sizes})
+    return benchmarks
+
+
+def run_benchmark(setup: Benchmark, args: argparse.Namespace) -> Dict[str, float]:
+    """Run a single benchmark and record its latency, throughput and peak memory.
+
+    Parameters
+    ----------
+    setup: Benchmark
+        Benchmark to run.
+
+    args: argparse.Namespace
+        Parsed command line arguments.
+
+    Returns
+    -------
+    result: Dict[str, float]
+        Statistics of the benchmark.
+
+    """
+    run = setup(args)
+    for _ in range(args.warmup):
+        run()
+
+    peak_rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = []
+    items = 0
+    for _ in range(args.repetitions):
+        start = time.perf_counter()
+        items += run()
+        latencies.append(time.perf_counter() - start)
+    peak_rss_delta = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_rss_before
+
+    tracemalloc.start()
+    run()
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'repetitions': len(latencies),
+        'mean_s': statistics.mean(latencies),
+        'median_s': statistics.median(latencies),
+        'p95_s': float(np.percentile(latencies, 95)),
+        'min_s': min(latencies),
+        'throughput_per_s': items / sum(latencies),
+        'peak_traced_kb': peak_traced // 1024,
+        # `ru_maxrss` is measured in bytes on mac, but in kilobytes on linux.
+        'peak_rss_delta_kb': peak_rss_delta // 1024 if sys.platform == 'darwin' else peak_rss_delta,
+    }
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Compare median latencies of results to a baseline.
+
+    Parameters
+    ----------
+    results: Dict[str, Dict[str, float]]
+        Results of the current run, keyed by benchmark name.
+
+    baseline: Dict[str, Dict[str, float]]
+        Results of the baseline run, keyed by benchmark name.
+
+    threshold: float
+        Maximum allowed relative increase of median latency, e.g., `0.2` for 20 %.
+
+    Returns
+    -------
+    regressions: List[str]
+        Description of each benchmark whose median latency regressed by more than `threshold`.
+
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        relative_change = result['median_s'] / baseline[name]['median_s'] - 1
+        _LOGGER.info(f'`{name}`: median `{result["median_s"]:.6f}s`, baseline `{baseline[name]["median_s"]:.6f}s`, '
+                     f'change `{relative_change * 100:+.1f}%`.')
+        if relative_change > threshold:
+            regressions.append(f'`{name}` regressed by `{relative_change * 100:.1f}%`.')
+    return regressions
+
+
+def _parse_args(argv: Optional[List[str]]=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Run kerndisc benchmarks.')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this string.')
+    parser.add_argument('--sizes', default=[100, 300], type=lambda sizes: [int(n) for n in sizes.split(',')],
+                        help='Comma separated series sizes for `evaluate_asts` and `discover` benchmarks.')
+    parser.add_argument('--repetitions', default=5, type=int, help='Timed repetitions per benchmark.')
+    parser.add_argument('--warmup', default=1, type=int, help='Untimed repetitions per benchmark.')
+    parser.add_argument('--ast-count', default=20, type=int, help='Number of random ASTs for expansion and description benchmarks.')
+    parser.add_argument('--ast-depth', default=3, type=int, help='Number of random expansions applied to each random AST.')
+    parser.add_argument('--search-depth', default=2, type=int, help='Search depth of `discover` benchmarks.')
+    parser.add_argument('--output', help='Write results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare results to the results stored in this file.')
+    parser.add_argument('--threshold', default=0.2, type=float, help='Allowed relative regression of median latency.')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    """Run benchmarks, store their results and compare them to a baseline.
+
+    Returns
+    -------
+    exit_code: int
+        `1` if any benchmark regressed compared to the baseline, `0` otherwise.
+
+    """
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(levelname)-8s [%(asctime)s] %(name)-12s » %(message)s')
+    logging.getLogger('kerndisc').setLevel(logging.WARNING)
+
+    results = {}
+    for name, setup in _make_benchmarks(args).items():
+        if args.filter not in name:
+            continue
+        _LOGGER.info(f'Running `{name}`.')
+        results[name] = run_benchmark(setup, args)
+        _LOGGER.info(f'`{name}`: {results[name]}')
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'numpy': np.__version__,
+                    'platform': platform.platform(),
+                    'timestamp': time.time(),
+                    'arguments': {key: value for key, value in vars(args).items() if key not in ['output', 'baseline']},
+                },
+                'results': results,
+            }, output_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_to_baseline(results, json.load(baseline_file)['results'], args.threshold)
+        for regression in regressions:
+            _LOGGER.error(regression)
+        return int(bool(regressions))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,18 @@
 This package provides the modules necessary to execute a univariate structured kernel discovery. It
 provides two main methods:
     * `discover`, the actual search and main entry point of this library,
-    * `preprocess`, which is the preprocessing `discover` applies before executing search.
+    * `preprocess`, which is the preprocessing `discover` applies before executing search,
+    * `preprocess_stream`, which applies the same preprocessing to series too large for memory, chunk by chunk,
+    * `reduce_data` and `reduce_stream`, which reduce series to fewer points before discovery,
+    * `Predictor`, which predicts using a discovered kernel,
+    * `save_results` and `load_results`, which store results of `discover` in a versioned format,
+    * `results_to_json`, which converts results of `discover` to valid JSON values,
+    * `BayesianSearch`, a search strategy for `discover` evaluating only the most promising expansions,
+    * `StructurePrior`, a prior learned from previous discoveries, ordering and pruning expansions of `discover`.
+
+Importing `kerndisc` does not import tensorflow or gpflow, they are imported once `discover` or `Predictor`
+are first accessed, or a model is instantiated. The same holds for `kerndisc.description`, so that kernels can be
+transformed to text and described cheaply. Logging is not configured on import, use `configure_logging` to do so.
 
 Example
 -------
@@ -21,22 +32,85 @@ To preprocess values in the same way as `discover` does, run:
     > X, Y = preprocess(X, Y, find_n_best=5)
 ```
 
+To preprocess a series too large for memory, e.g., stored using `np.save`, run:
+```
+    > from kerndisc import chunk_arrays, preprocess_stream
+    > chunks = chunk_arrays(np.load('x.npy', mmap_mode='r'), np.load('y.npy', mmap_mode='r'))
+    > for x_chunk, y_chunk in preprocess_stream(chunks):
+    >     ...
+```
+
+To predict using the best discovered kernel, run:
+```
+    > from kerndisc import Predictor
+    > mean, variance = Predictor.from_discovery(x, y, k).predict(x_new)
+```
+
 TODO: Finish this once `kerndisc` is done.
 
 """
+import importlib
 import logging
 from os import environ
+from typing import Any, List, Optional
 
-from ._discover import discover
-from ._preprocessing import preprocess
+from ._config import Config
+from ._preprocessing import chunk_arrays, preprocess, preprocess_stream, reduce_data, reduce_stream, stream_statistics
+from ._prior import StructurePrior
+from ._search import BayesianSearch
+from ._serialization import load_results, results_to_json, save_results
 
 
-logging.basicConfig(level=environ.get('LOG_LEVEL', 'INFO'),
-                    format='%(levelname)-8s [%(asctime)s] %(name)-12s » %(message)s')
-logging.getLogger('flake8').setLevel(logging.ERROR)
-logging.getLogger('tensorflow').setLevel(logging.ERROR)
+# Attributes whose modules depend on tensorflow, they are imported on first access.
+_LAZY_ATTRIBUTES = {
+    'discover': '._discover',
+    'Predictor': '._predict',
+}
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __all__ = [
+    'BayesianSearch',
+    'chunk_arrays',
+    'Config',
+    'configure_logging',
     'discover',
+    'load_results',
+    'Predictor',
     'preprocess',
+    'preprocess_stream',
+    'reduce_data',
+    'reduce_stream',
+    'results_to_json',
+    'save_results',
+    'stream_statistics',
+    'StructurePrior',
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module `{__name__}` has no attribute `{name}`')
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
+
+
+def configure_logging(level: Optional[str]=None) -> None:
+    """Configure logging for applications using `kerndisc`, `kerndisc` itself never configures logging on import.
+
+    Parameters
+    ----------
+    level: Optional[str]
+        Level to log at, defaults to environment variable `LOG_LEVEL` or `INFO`.
+
+    """
+    logging.basicConfig(level=level or environ.get('LOG_LEVEL', 'INFO'),
+                        format='%(levelname)-8s [%(asctime)s] %(name)-12s » %(message)s')
+    logging.getLogger('flake8').setLevel(logging.ERROR)
+    logging.getLogger('tensorflow').setLevel(logging.ERROR)
@@ -0,0 +1,41 @@
+"""Module to configure kernel discovery at runtime."""
+import os
+from typing import NamedTuple
+
+
+_STANDARD_METRIC = 'bayesian_information_criterion'
+_STANDARD_GRAMMAR = 'duvenaud'
+
+
+class Config(NamedTuple):
+    """Configuration of a kernel discovery.
+
+    Configurations are immutable and picklable, such that they can be passed to other processes as is.
+    Pass a configuration to `discover`, `expand_asts`, `evaluate_asts` or `score_model` to run discoveries
+    with different metrics or grammars in the same process.
+
+    Attributes
+    ----------
+    metric: str
+        Name of the metric used to score kernels, see `kerndisc.evaluation.scoring`.
+
+    grammar: str
+        Name of the grammar used to expand kernels, see `kerndisc.expansion.grammars`.
+
+    cores: int
+        Number of CPU cores available to evaluate kernels.
+
+    """
+
+    metric: str = _STANDARD_METRIC
+    grammar: str = _STANDARD_GRAMMAR
+    cores: int = 1
+
+    @classmethod
+    def from_environment(cls) -> 'Config':
+        """Make a configuration from the environment variables `METRIC`, `GRAMMAR` and `CORES`, falling back to defaults."""
+        return cls(
+            metric=os.environ.get('METRIC', _STANDARD_METRIC),
+            grammar=os.environ.get('GRAMMAR', _STANDARD_GRAMMAR),
+            cores=int(os.environ.get('CORES', 1)),
+        )
@@ -1,25 +1,39 @@
 """Module to run kernel discovery."""
+from functools import partial
 import logging
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from anytree import Node
 import gpflow
 import numpy as np
 
-from ._preprocessing import preprocess
-from ._util import build_all_implemented_base_asts, calculate_relative_improvement, n_best_scored_kernels
+from ._config import Config
+from ._preprocessing import preprocess, reduce_data
+from ._prior import StructurePrior
+from ._profiling import add_evaluation_timings, format_depth_timings, keep_slowest_candidate, summarize_profile, timed
+from ._search import BayesianSearch
+from ._util import build_all_implemented_base_asts, calculate_relative_improvement, Leaderboard
 from .description import ast_to_text, kernel_to_ast
-from .evaluation import evaluate_asts
+from .evaluation import evaluate_asts, Executor
 from .expansion import expand_asts
-from .expansion.grammars import IMPLEMENTED_BASE_KERNEL_NAMES
+from .expansion.grammars import get_implemented_base_kernel_names
 
 
 _LOGGER = logging.getLogger(__package__)
+_PROFILE = os.environ.get('PROFILE', '').lower() in ['1', 'true']
 _START_AST = kernel_to_ast(gpflow.kernels.White(1))
 
 
 def discover(x: np.ndarray, y: np.ndarray, search_depth: int=10, rescale_x_to_upper_bound: Optional[float]=None,
              max_kernels_per_depth: Optional[int]=1, find_n_best: int=1, full_initial_base_kernel_expansion: bool=False,
-             early_stopping_min_rel_delta: Optional[float]=None, grammar_kwargs: Optional[Dict[str, Any]]=None) -> Dict[str, Dict[str, Any]]:
+             early_stopping_min_rel_delta: Optional[float]=None, grammar_kwargs: Optional[Dict[str, Any]]=None,
+             optimizer_kwargs: Optional[Union[Dict[str, Any], Callable[[int], Dict[str, Any]]]]=None,
+             evaluation_hook: Optional[Callable[[Dict[str, Any]], None]]=None, profile: bool=_PROFILE,
+             profile_slowest_n: int=0, config: Optional[Config]=None,
+             reduction_kwargs: Optional[Dict[str, Any]]=None, precision: str='float64',
+             batch_size: Optional[int]=None, executor: Optional[Executor]=None,
+             search_strategy: Optional[BayesianSearch]=None, structure_prior: Optional[StructurePrior]=None) -> Dict[str, Dict[str, Any]]:
     """Discover kernel structure in a univariate time series.
 
     Parameters
@@ -58,6 +72,58 @@ def discover(x: np.ndarray, y: np.ndarray, search_depth: int=10, rescale_x_to_up
         Options to be passed to grammars to allow different configurations for manually implemented
         grammars.
 
+    optimizer_kwargs: Optional[Union[Dict[str, Any], Callable[[int], Dict[str, Any]]]]
+        Configuration of the optimizer used to train each kernel, e.g., `method`, `maxiter`, `gtol` or `ftol`.
+        Can also be a callable that takes the current depth and returns a configuration, allowing per depth
+        schedules, see `kerndisc.evaluation.make_tolerance_schedule`.
+
+    evaluation_hook: Optional[Callable[[Dict[str, Any]], None]]
+        Called with a record of `kernel` (its text), `depth`, `score` and all evaluation information for each
+        evaluated kernel. See `kerndisc.evaluation.make_json_lines_hook` and `kerndisc.evaluation.make_prometheus_textfile_hook`.
+
+    profile: bool
+        Whether to profile the search. If set, time spent in each phase of the search, e.g., expansion,
+        optimization or selection, is logged and returned per depth as `profile`, see `kerndisc._profiling`.
+        Defaults to the environment variable `PROFILE`.
+
+    profile_slowest_n: int
+        If profiling, additionally profile each kernels evaluation using `cProfile` and return the
+        stats of the `profile_slowest_n` slowest evaluations.
+
+    config: Optional[Config]
+        Configuration of metric, grammar and cores, see `kerndisc.Config`. Read from the environment variables
+        `METRIC`, `GRAMMAR` and `CORES` if `None`.
+
+    reduction_kwargs: Optional[Dict[str, Any]]
+        If set, data is reduced before preprocessing, passing these options, e.g., `n_points` or `resolution`,
+        to `kerndisc.reduce_data`. Models are then fitted with noise weighted by the number of observations
+        each reduced point represents. Predict using the same reduced data and weights.
+
+    precision: str
+        Float type to evaluate kernels at during search, `float32` or `float64`. At `float32` evaluation is faster
+        and takes less memory, kernels whose Cholesky decomposition fails are evaluated again at `float64`. After
+        search, the `find_n_best` kernels are always evaluated again at `float64`, so returned scores and parameters
+        are exact. See `kerndisc.evaluation.evaluate_asts`.
+
+    batch_size: Optional[int]
+        Number of kernels of a depth to optimize jointly, with stacked Gram matrices and batched Cholesky decompositions.
+        Speeds up search on small series, see `kerndisc.evaluation.evaluate_asts`. Read from the environment variable
+        `EVALUATION_BATCH_SIZE` if `None`, by default kernels are optimized one by one.
+
+    executor: Optional[Executor]
+        Executor to evaluate the kernels of each depth with, e.g., `ProcessExecutor(config.cores)` to use all cores
+        or `RemoteExecutor` to use workers on other hosts, see `kerndisc.evaluation`. The executor is not shut down
+        after search, so it can be reused. Kernels are evaluated in this process if `None`.
+
+    search_strategy: Optional[BayesianSearch]
+        If set, only the expansions it selects are evaluated at each depth, e.g., by `kerndisc.BayesianSearch` the most
+        promising few under a surrogate of scores, until its evaluation budget is exhausted. All expansions are
+        evaluated if `None`.
+
+    structure_prior: Optional[StructurePrior]
+        Prior learned from previous discoveries, e.g., of the same series, see `kerndisc.StructurePrior`. If set, expansions
+        are evaluated in order of their probability to win under it and expansions that historically never win are dropped.
+
     Returns
     -------
     best_scored_kernels: Dict[str, Dict[str, Any]]
@@ -71,37 +137,51 @@ def discover(x: np.ndarray, y: np.ndarray, search_depth: int=10, rescale_x_to_up
                     'params': {
                         'param_name_one': param_value_one,
                         ...
+                    },
+                    'evaluation': {
+                        'method': optimizer_method,
+                        'iterations': iterations_used,
+                        'function_evaluations': function_evaluations_used,
+                        'build_time': seconds_to_build_model,
+                        'optimization_time': seconds_to_optimize_model,
+                        ...
                     }
                 },
                 ...
             }
         ```
         The AST is generated using `anytree`. For ways to manipulate and transform it,
-        see `kerndisc.description` package.
+        see `kerndisc.description` package. For all evaluation information see `kerndisc.evaluation.evaluate_asts`.
+        Additionally `highscore_progression` and `termination_reason` are returned, as well as `profile`
+        if profiling.
 
     """
-    x, y = preprocess(x, y, rescale_x_to_upper_bound=rescale_x_to_upper_bound)
+    x, y, noise_weights = _reduce_and_preprocess(x, y, rescale_x_to_upper_bound, reduction_kwargs)
+    config = config or Config.from_environment()
     termination_reason = f'Depth `{search_depth - 1}`: Maximum search depth reached.'
-    highscore_progression: List[float] = []
+    leaderboard = Leaderboard()
+    highscore_progression = leaderboard.highscore_progression
+    depth_timings: List[Dict[str, float]] = []
+    slowest_candidates: List[Any] = []
     scored_kernels = {
         ast_to_text(_START_AST): {
             'ast': _START_AST,
             'params': {},
             'score': np.Inf,
             'depth': 0,
+            'evaluation': {},
         },
     }
+    leaderboard.update(ast_to_text(_START_AST), np.Inf)
 
-    _LOGGER.info(f'Depth `0`: Starting kernel structure discovery, using implemented kernels: `{IMPLEMENTED_BASE_KERNEL_NAMES}`. '
+    _LOGGER.info(f'Depth `0`: Starting kernel structure discovery, using implemented kernels: `{get_implemented_base_kernel_names(config)}`. '
                  f'The following grammar kwargs were passed:\n{grammar_kwargs or {}}')
     for depth in range(search_depth):
-        if max_kernels_per_depth is None:
-            best_previous_kernels = list(scored_kernels)
-        else:
-            best_previous_kernels = n_best_scored_kernels(scored_kernels, n=max_kernels_per_depth)
-
-        if best_previous_kernels:
-            highscore_progression.append(scored_kernels[best_previous_kernels[0]]['score'])
+        timings: Dict[str, float] = {}
+        depth_timings.append(timings)
+        with timed(timings, 'selection'):
+            best_previous_scored = leaderboard.snapshot(max_kernels_per_depth)
+            best_previous_kernels = [kernel_name for kernel_name, _ in best_previous_scored]
 
         if early_stopping_min_rel_delta and len(highscore_progression) > 1:
             improvement = calculate_relative_improvement(highscore_progression)
@@ -112,35 +192,121 @@ def discover(x: np.ndarray, y: np.ndarray, search_depth: int=10, rescale_x_to_up
 
         _LOGGER.info(f'Depth `{depth}`: Kernel discovery with limit of `{max_kernels_per_depth}` best performing kernels '
                      f'of last iteration: `{best_previous_kernels}`, '
-                     f'with scores: `{[scored_kernels[kernel_name]["score"] for kernel_name in best_previous_kernels]}`.')
+                     f'with scores: `{[score for _, score in best_previous_scored]}`.')
 
-        new_asts = expand_asts([scored_kernels[kernel_name]['ast'] for kernel_name in best_previous_kernels], grammar_kwargs=grammar_kwargs)
+        parents: Dict[str, str] = {}
+        with timed(timings, 'expansion'):
+            new_asts = expand_asts([scored_kernels[kernel_name]['ast'] for kernel_name in best_previous_kernels],
+                                   grammar_kwargs=grammar_kwargs, timings=timings, config=config, parents=parents,
+                                   structure_prior=structure_prior)
 
-        if depth == 0 and full_initial_base_kernel_expansion:
-            _LOGGER.info(f'Depth `{depth}`: Doing a full initial expansion of all implemented base kernels.')
-            new_asts.extend(expand_asts(build_all_implemented_base_asts(), grammar_kwargs=grammar_kwargs))
+            if depth == 0 and full_initial_base_kernel_expansion:
+                _LOGGER.info(f'Depth `{depth}`: Doing a full initial expansion of all implemented base kernels.')
+                new_asts.extend(expand_asts(build_all_implemented_base_asts(config), grammar_kwargs=grammar_kwargs, timings=timings, config=config,
+                                            structure_prior=structure_prior))
 
         _LOGGER.info(f'Depth `{depth}`: Deduplicating and constructing search space.')
 
-        unscored_asts = [ast for ast in new_asts if ast_to_text(ast) not in scored_kernels]
+        with timed(timings, 'deduplication'):
+            unscored_asts = [ast for ast in new_asts if ast_to_text(ast) not in scored_kernels]
+        unscored_asts, empty_reason = _select_unscored_asts(unscored_asts, scored_kernels, depth, search_strategy, timings)
         if not unscored_asts:
-            termination_reason = f'Depth `{depth}`: Empty search space, no new asts found.'
+            termination_reason = empty_reason
             break
 
-        _LOGGER.info(f'Depth `{depth}`: Scoring unscored kernels.')
+        depth_optimizer_kwargs = optimizer_kwargs(depth) if callable(optimizer_kwargs) else optimizer_kwargs
+        _LOGGER.info(f'Depth `{depth}`: Scoring unscored kernels, using optimizer options: `{depth_optimizer_kwargs or {}}`.')
 
-        for ast, optimized_params, score in evaluate_asts(x, y, unscored_asts):
-            scored_kernels[ast_to_text(ast)] = {
-                'ast': ast,
-                'depth': depth,
-                'params': optimized_params,
-                'score': score,
-            }
+        parent_params = {kernel_name: scored_kernels[parent]['params'] for kernel_name, parent in parents.items()}
+        evaluations = evaluate_asts(x, y, unscored_asts, optimizer_kwargs=depth_optimizer_kwargs,
+                                    profile_candidates=profile and profile_slowest_n > 0, config=config, noise_weights=noise_weights,
+                                    precision=precision, parent_params=parent_params, batch_size=batch_size, executor=executor)
+        for ast, optimized_params, score, evaluation_info in evaluations:
+            kernel_name = ast_to_text(ast)
+            add_evaluation_timings(timings, evaluation_info)
+            keep_slowest_candidate(slowest_candidates, profile_slowest_n, kernel_name, depth, evaluation_info)
+            _store_evaluation(scored_kernels, leaderboard, kernel_name, ast, depth, optimized_params, score, evaluation_info, evaluation_hook)
 
     _LOGGER.info(f'Done with search, termination reason was:\n\n\t{termination_reason}\n')
 
-    return {
-        **{kernel_name: scored_kernels[kernel_name] for kernel_name in n_best_scored_kernels(scored_kernels, n=find_n_best)},
+    final_optimizer_kwargs = optimizer_kwargs(search_depth - 1) if callable(optimizer_kwargs) else optimizer_kwargs
+    _evaluate_finalists_at_float64(scored_kernels, leaderboard, find_n_best, precision,
+                                   partial(evaluate_asts, x, y, optimizer_kwargs=final_optimizer_kwargs, config=config,
+                                           noise_weights=noise_weights, precision='float64', executor=executor))
+
+    best_scored_kernels = {
+        **{kernel_name: scored_kernels[kernel_name] for kernel_name in leaderboard.top(find_n_best)},
         'highscore_progression': highscore_progression,
         'termination_reason': termination_reason,
     }
+    if profile:
+        best_scored_kernels['profile'] = summarize_profile(depth_timings, slowest_candidates)
+        _LOGGER.info(f'Seconds spent in each phase of search:\n{format_depth_timings(best_scored_kernels["profile"])}')
+    return best_scored_kernels
+
+
+def _reduce_and_preprocess(x: np.ndarray, y: np.ndarray, rescale_x_to_upper_bound: Optional[float],
+                           reduction_kwargs: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Reduce data, if requested, then preprocess it. Returns noise weights of reduced points, `None` if not reduced."""
+    noise_weights = None
+    if reduction_kwargs is not None:
+        x, y, noise_weights = reduce_data(x, y, **reduction_kwargs)
+        _LOGGER.info(f'Reduced data to `{x.shape[0]}` points, using reduction options: `{reduction_kwargs}`.')
+
+    x, y = preprocess(x, y, rescale_x_to_upper_bound=rescale_x_to_upper_bound)
+    return x, y, noise_weights
+
+
+def _select_unscored_asts(unscored_asts: List[Node], scored_kernels: Dict[str, Dict[str, Any]], depth: int,
+                          search_strategy: Optional[BayesianSearch], timings: Dict[str, float]) -> Tuple[List[Node], str]:
+    """Select the unscored kernels to evaluate using `search_strategy`, if set, along with the termination reason if none are left."""
+    if not unscored_asts:
+        return [], f'Depth `{depth}`: Empty search space, no new asts found.'
+    if search_strategy is None:
+        return unscored_asts, ''
+
+    with timed(timings, 'selection'):
+        selected_asts = search_strategy.select(unscored_asts, scored_kernels)
+    if not selected_asts:
+        return [], f'Depth `{depth}`: Evaluation budget of `{search_strategy.evaluation_budget}` kernels exhausted.'
+
+    _LOGGER.info(f'Depth `{depth}`: Search strategy selected `{len(selected_asts)}` of `{len(unscored_asts)}` unscored kernels: '
+                 f'`{[ast_to_text(ast) for ast in selected_asts]}`.')
+    return selected_asts, ''
+
+
+def _evaluate_finalists_at_float64(scored_kernels: Dict[str, Dict[str, Any]], leaderboard: Leaderboard, find_n_best: int, precision: str,
+                                   evaluate: Callable[[List[Node]], Iterable[Tuple[Node, Dict[str, Any], float, Dict[str, Any]]]]) -> None:
+    """Evaluate the `find_n_best` kernels again at `float64`, if search was done at a lower `precision`.
+
+    Scores of kernels change when evaluated again, so others may become the best ones. Thus this is repeated until all of
+    the best kernels were evaluated at `float64`. As each round evaluates at least one kernel, which is never evaluated
+    again, this terminates.
+
+    """
+    while precision != 'float64':
+        finalists = [kernel_name for kernel_name in leaderboard.top(find_n_best)
+                     if scored_kernels[kernel_name]['evaluation'].get('precision', 'float64') != 'float64']
+        if not finalists:
+            return
+
+        _LOGGER.info(f'Evaluating best kernels again at precision `float64`: `{finalists}`.')
+        for ast, optimized_params, score, evaluation_info in evaluate([scored_kernels[kernel_name]['ast'] for kernel_name in finalists]):
+            scored_kernels[ast_to_text(ast)].update(params=optimized_params, score=score, evaluation=evaluation_info)
+            leaderboard.update(ast_to_text(ast), score)
+
+
+def _store_evaluation(scored_kernels: Dict[str, Dict[str, Any]], leaderboard: Leaderboard, kernel_name: str, ast: Node, depth: int,
+                      params: Dict[str, Any], score: float, evaluation_info: Dict[str, Any],
+                      evaluation_hook: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+    """Add an evaluated kernel to `scored_kernels` and `leaderboard`, and pass its record to `evaluation_hook`, if set."""
+    scored_kernels[kernel_name] = {
+        'ast': ast,
+        'depth': depth,
+        'params': params,
+        'score': score,
+        'evaluation': evaluation_info,
+    }
+    leaderboard.update(kernel_name, score)
+    if evaluation_hook is not None:
+        evaluation_hook({'kernel': kernel_name, 'depth': depth, 'score': score, **evaluation_info})
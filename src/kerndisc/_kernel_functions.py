@@ -0,0 +1,142 @@
+"""Module to evaluate gpflow kernels using numpy only.
+
+Kernels are compiled once from built gpflow kernels, reading their current parameters. Compiled kernels
+follow the semantics of gpflow 1.x kernels, i.e., `K(x, x2)` and `Kdiag(x)`, but don't need a
+tensorflow session to be evaluated. This makes them cheap to evaluate repeatedly, e.g., for predictions.
+
+"""
+from functools import reduce
+from typing import Any, Callable, Dict, Optional
+
+import gpflow
+import numpy as np
+
+
+# Jitter gpflow uses for euclidean distances and for `ArcCosine`.
+_EUCLID_JITTER = 1e-12
+_ARCCOSINE_JITTER = 1e-15
+_KERNEL_ATTRIBUTES = ['degree', 'order']
+
+KernelFunction = Callable[..., np.ndarray]
+
+
+def compile_kernel(kernel: gpflow.kernels.Kernel) -> KernelFunction:
+    """Compile a gpflow kernel to a numpy function, using its current parameters.
+
+    Parameters
+    ----------
+    kernel: gpflow.kernels.Kernel
+        Built kernel, usually of a trained model. Only kernels of `kerndisc._kernels` are supported.
+
+    Returns
+    -------
+    _kernel_function: KernelFunction
+        Function `(x, x2=None, diag=False) -> np.ndarray`, with `x` of shape `(n, 1)` and `x2` of shape
+        `(m, 1)`. Returns:
+            * `K(x, x)` of shape `(n, n)` if `x2` is `None`,
+            * `K(x, x2)` of shape `(n, m)` otherwise,
+            * the diagonal of `K(x, x)` of shape `(n,)` if `diag` is set.
+
+    Raises
+    ------
+    ValueError
+        If `kernel` or any of its subkernels is not supported.
+
+    """
+    if isinstance(kernel, (gpflow.kernels.Sum, gpflow.kernels.Product)):
+        combine = np.add if isinstance(kernel, gpflow.kernels.Sum) else np.multiply
+        children = [compile_kernel(child) for child in kernel.children.values() if isinstance(child, gpflow.kernels.Kernel)]
+
+        def _combination(x: np.ndarray, x2: Optional[np.ndarray]=None, diag: bool=False) -> np.ndarray:
+            return reduce(combine, (child(x, x2, diag=diag) for child in children))
+
+        return _combination
+
+    if type(kernel) not in _BASE_KERNEL_FUNCTIONS:
+        raise ValueError(f'Kernel `{type(kernel).__name__}` can not be compiled.')
+
+    params = {name: np.squeeze(param.read_value()) for name, param in kernel.children.items() if isinstance(param, gpflow.Param)}
+    params.update({name: getattr(kernel, name) for name in _KERNEL_ATTRIBUTES if hasattr(kernel, name)})
+    base_kernel_function = _BASE_KERNEL_FUNCTIONS[type(kernel)]
+
+    def _base_kernel(x: np.ndarray, x2: Optional[np.ndarray]=None, diag: bool=False) -> np.ndarray:
+        if diag:
+            return np.broadcast_to(base_kernel_function(params, x[:, 0], x[:, 0], 'diag'), (x.shape[0],))
+        if x2 is None:
+            return base_kernel_function(params, x[:, [0]], x[:, 0], 'symmetric')
+        return base_kernel_function(params, x[:, [0]], x2[:, 0], 'cross')
+
+    return _base_kernel
+
+
+def _scaled_distance(params: Dict[str, Any], a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sqrt(((a - b) / params['lengthscales']) ** 2 + _EUCLID_JITTER)
+
+
+def _stationary(correlation: Callable[[Dict[str, Any], np.ndarray], np.ndarray]) -> KernelFunction:
+    """Make kernel function of a stationary kernel, whose diagonal is its variance."""
+    def _kernel_function(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+        if mode == 'diag':
+            return params['variance']
+        return params['variance'] * correlation(params, _scaled_distance(params, a, b))
+    return _kernel_function
+
+
+def _periodic(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+    if mode == 'diag':
+        return params['variance']
+    r = np.square(np.sin(np.pi * (a - b) / params['period']) / params['lengthscales'])
+    return params['variance'] * np.exp(-0.5 * r)
+
+
+def _linear(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+    return params['variance'] * a * b
+
+
+def _polynomial(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+    return (_linear(params, a, b, mode) + params['offset']) ** params['degree']
+
+
+def _arccosine(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+    a_norm = np.sqrt(params['weight_variances'] * a ** 2 + params['bias_variance'])
+    b_norm = np.sqrt(params['weight_variances'] * b ** 2 + params['bias_variance'])
+    cos_theta = (params['weight_variances'] * a * b + params['bias_variance']) / a_norm / b_norm
+    theta = np.arccos(_ARCCOSINE_JITTER + (1 - 2 * _ARCCOSINE_JITTER) * cos_theta)
+
+    order = params['order']
+    if order == 0:
+        j = np.pi - theta
+    elif order == 1:
+        j = np.sin(theta) + (np.pi - theta) * np.cos(theta)
+    else:
+        j = 3. * np.sin(theta) * np.cos(theta) + (np.pi - theta) * (1. + 2. * np.cos(theta) ** 2)
+    return params['variance'] / np.pi * j * a_norm ** order * b_norm ** order
+
+
+def _constant(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+    return np.full(np.broadcast(a, b).shape, params['variance'])
+
+
+def _white(params: Dict[str, Any], a: np.ndarray, b: np.ndarray, mode: str) -> np.ndarray:
+    if mode == 'diag':
+        return params['variance']
+    if mode == 'symmetric':
+        return params['variance'] * np.eye(a.shape[0])
+    return np.zeros(np.broadcast(a, b).shape)
+
+
+_BASE_KERNEL_FUNCTIONS: Dict[type, KernelFunction] = {
+    gpflow.kernels.ArcCosine: _arccosine,
+    gpflow.kernels.Constant: _constant,
+    gpflow.kernels.Cosine: _stationary(lambda params, r: np.cos(r)),
+    gpflow.kernels.Exponential: _stationary(lambda params, r: np.exp(-0.5 * r)),
+    gpflow.kernels.Linear: _linear,
+    gpflow.kernels.Matern12: _stationary(lambda params, r: np.exp(-r)),
+    gpflow.kernels.Matern32: _stationary(lambda params, r: (1. + np.sqrt(3.) * r) * np.exp(-np.sqrt(3.) * r)),
+    gpflow.kernels.Matern52: _stationary(lambda params, r: (1. + np.sqrt(5.) * r + 5. / 3. * r ** 2) * np.exp(-np.sqrt(5.) * r)),
+    gpflow.kernels.Periodic: _periodic,
+    gpflow.kernels.Polynomial: _polynomial,
+    gpflow.kernels.RationalQuadratic: _stationary(lambda params, r: (1. + r ** 2 / (2. * params['alpha'])) ** -params['alpha']),
+    gpflow.kernels.RBF: _stationary(lambda params, r: np.exp(-0.5 * r ** 2)),
+    gpflow.kernels.White: _white,
+}
@@ -1,40 +1,54 @@
-"""Module that maintains all kernels that are available for kernel construction."""
-from typing import Dict
-
-import gpflow
-from gpflow.kernels import (ArcCosine,
-                            Constant,
-                            Cosine,
-                            Exponential,
-                            Linear,
-                            Matern12,
-                            Matern32,
-                            Matern52,
-                            Periodic,
-                            Polynomial,
-                            Product,
-                            RationalQuadratic,
-                            RBF,
-                            Sum,
-                            White)
-
-BASE_KERNELS: Dict[str, gpflow.kernels.Kernel] = {
-    'arccosine': ArcCosine,
-    'constant': Constant,
-    'cosine': Cosine,
-    'exponential': Exponential,
-    'linear': Linear,
-    'matern12': Matern12,
-    'matern32': Matern32,
-    'matern52': Matern52,
-    'periodic': Periodic,
-    'polynomial': Polynomial,
-    'rationalquadratic': RationalQuadratic,
-    'rbf': RBF,
-    'white': White,
-}
-
-COMBINATION_KERNELS: Dict[str, gpflow.kernels.Kernel] = {
-    'product': Product,
-    'sum': Sum,
-}
+"""Module that maintains all kernels that are available for kernel construction.
+
+Kernels are classes of `gpflow.kernels`. As importing gpflow, and thereby tensorflow, is slow, gpflow is
+only imported once a kernel class is accessed. Names of kernels are available without importing it.
+
+"""
+import importlib
+from typing import Dict, Iterator, Mapping
+
+
+class _LazyKernels(Mapping):
+    """Mapping of kernel names to kernel classes, that imports `gpflow.kernels` on first access of a class."""
+
+    def __init__(self, class_names: Dict[str, str]) -> None:
+        self._class_names = class_names
+
+    def __getitem__(self, kernel_name: str) -> type:
+        return getattr(importlib.import_module('gpflow.kernels'), self._class_names[kernel_name])
+
+    def __contains__(self, kernel_name: object) -> bool:
+        return kernel_name in self._class_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._class_names)
+
+    def __len__(self) -> int:
+        return len(self._class_names)
+
+
+BASE_KERNELS: Mapping[str, type] = _LazyKernels({
+    'arccosine': 'ArcCosine',
+    'constant': 'Constant',
+    'cosine': 'Cosine',
+    'exponential': 'Exponential',
+    'linear': 'Linear',
+    'matern12': 'Matern12',
+    'matern32': 'Matern32',
+    'matern52': 'Matern52',
+    'periodic': 'Periodic',
+    'polynomial': 'Polynomial',
+    'rationalquadratic': 'RationalQuadratic',
+    'rbf': 'RBF',
+    'white': 'White',
+})
+
+COMBINATION_KERNELS: Mapping[str, type] = _LazyKernels({
+    'product': 'Product',
+    'sum': 'Sum',
+})
+
+
+def kernel_name(kernel_class: type) -> str:
+    """Get name of a kernel class, as used as key in `BASE_KERNELS` and `COMBINATION_KERNELS`."""
+    return kernel_class.__name__.lower()
@@ -0,0 +1,207 @@
+"""Module to predict using discovered kernels."""
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from anytree import Node
+import gpflow
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+
+from ._kernel_functions import compile_kernel
+from ._preprocessing import preprocess
+from .description import ast_to_text, get_noise_variances, instantiate_model_from_ast, kernel_to_ast
+
+
+_LOGGER = logging.getLogger(__package__)
+_PREDICTION_CHUNK_SIZE = int(os.environ.get('PREDICTION_CHUNK_SIZE', 4096))
+
+
+class Predictor:
+    """Predict using a discovered kernel, factorizing its covariance matrix only once.
+
+    On construction a model is built once to read its parameters, then the covariance matrix of the
+    training data is factorized and `alpha = (K + s^2 * I)^-1 * y` is cached. Predictions only use numpy,
+    i.e., no tensorflow graph is built and no further factorization is done, however often `predict` is called.
+
+    If the kernel is a sum, e.g., of products as after `simplify`, the posterior of each summand can be predicted
+    using `predict_components`, which decomposes the prediction additively using the same factorization.
+
+    Data is preprocessed the same way `discover` does it, predictions are returned in the scale of the original `y`.
+
+    Example
+    -------
+    ```
+        > from kerndisc import discover, Predictor
+        > kernels = discover(x, y)
+        > predictor = Predictor.from_discovery(x, y, kernels)
+        > mean, variance = predictor.predict(x_new)
+    ```
+
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, ast: Node, params: Dict[str, np.ndarray],
+                 rescale_x_to_upper_bound: Optional[float]=None, chunk_size: int=_PREDICTION_CHUNK_SIZE,
+                 noise_weights: Optional[np.ndarray]=None) -> None:
+        """Build model once and factorize its covariance matrix.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            Time points `x_1, ..., x_n` at which `y_1, .., y_n` were measured, as passed to `discover`.
+
+        y: np.ndarray
+            Values `y_1, ..., y_n` measured at time points `x_1, ..., x_n`, as passed to `discover`.
+
+        ast: Node
+            AST of discovered kernel.
+
+        params: Dict[str, np.ndarray]
+            Optimized parameters of discovered kernel.
+
+        rescale_x_to_upper_bound: Optional[float]
+            Same as passed to `discover`.
+
+        chunk_size: int
+            Maximum number of points predicted at once, bounding memory used by `predict` to `O(chunk_size * n)`.
+            Defaults to environment variable `PREDICTION_CHUNK_SIZE`.
+
+        noise_weights: Optional[np.ndarray]
+            Weights of the noise variance of each point, if `x` and `y` were reduced using `kerndisc.reduce_data`.
+
+        Raises
+        ------
+        np.linalg.LinAlgError
+            If the covariance matrix of the model is not positive definite.
+
+        """
+        raw_x, raw_y = x.reshape(-1, 1).astype(float), y.reshape(-1, 1).astype(float)
+        self._x_scale = 1. if rescale_x_to_upper_bound is None else rescale_x_to_upper_bound / raw_x.max()
+        self._y_mean = raw_y.mean()
+        self._y_std = raw_y.std() if not np.isclose(raw_y.std(), 0) else 1.
+        self._chunk_size = chunk_size
+
+        self._x, y = preprocess(x, y, rescale_x_to_upper_bound=rescale_x_to_upper_bound)
+        model = instantiate_model_from_ast(self._x, y, ast, params=params, noise_weights=noise_weights)
+        self._kernel = compile_kernel(model.kern)
+        summands = list(model.kern.children.values()) if isinstance(model.kern, gpflow.kernels.Sum) else [model.kern]
+        self._components = [(ast_to_text(kernel_to_ast(summand)), compile_kernel(summand)) for summand in summands]
+        self._noise_variance = float(model.likelihood.variance.read_value())
+
+        covariance = self._kernel(self._x) + np.diag(get_noise_variances(model))
+        self._cholesky, _ = cho_factor(covariance, lower=True)
+        self._alpha = cho_solve((self._cholesky, True), y)
+
+    @classmethod
+    def from_discovery(cls, x: np.ndarray, y: np.ndarray, discovery: Dict[str, Any], kernel_name: Optional[str]=None,
+                       **kwargs: Any) -> 'Predictor':
+        """Make a predictor from the result of `discover`.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            Time points, as passed to `discover`.
+
+        y: np.ndarray
+            Values, as passed to `discover`.
+
+        discovery: Dict[str, Any]
+            Result of `discover`.
+
+        kernel_name: Optional[str]
+            Kernel of `discovery` to predict with, the best scoring one if `None`.
+
+        kwargs: Any
+            Passed to `Predictor`, e.g., `rescale_x_to_upper_bound`, which must be the same as passed to `discover`.
+
+        Returns
+        -------
+        predictor: Predictor
+            Predictor using the selected kernel.
+
+        Raises
+        ------
+        ValueError
+            If `kernel_name` is not part of `discovery`.
+
+        """
+        kernels = {name: kernel for name, kernel in discovery.items() if isinstance(kernel, dict) and 'ast' in kernel}
+        if kernel_name is None:
+            kernel_name = min(kernels, key=lambda name: kernels[name]['score'])
+        if kernel_name not in kernels:
+            _LOGGER.exception(f'Kernel `{kernel_name}` was not found in discovered kernels: `{list(kernels)}`.')
+            raise ValueError(f'Kernel `{kernel_name}` was not found in discovered kernels.')
+
+        return cls(x, y, kernels[kernel_name]['ast'], kernels[kernel_name]['params'], **kwargs)
+
+    def predict(self, x: np.ndarray, include_noise: bool=False) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict mean and variance of the latent function at new points.
+
+        Points are predicted in chunks of at most `chunk_size`.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            New time points, in the same scale as the `x` passed on construction.
+
+        include_noise: bool
+            Whether to add the variance of the likelihood, i.e., predict new observations instead of the latent function.
+
+        Returns
+        -------
+        mean, variance: Tuple[np.ndarray, np.ndarray]
+            Both of shape `(m, 1)`, in the scale of the `y` passed on construction.
+
+        """
+        x = x.reshape(-1, 1).astype(float) * self._x_scale
+        mean, variance = np.empty((x.shape[0], 1)), np.empty((x.shape[0], 1))
+
+        for start in range(0, x.shape[0], self._chunk_size):
+            chunk = slice(start, start + self._chunk_size)
+            cross_covariance = self._kernel(x[chunk], self._x)
+            mean[chunk, 0] = cross_covariance @ self._alpha[:, 0]
+            v = solve_triangular(self._cholesky, cross_covariance.T, lower=True)
+            variance[chunk, 0] = self._kernel(x[chunk], diag=True) - np.sum(v ** 2, axis=0)
+
+        if include_noise:
+            variance += self._noise_variance
+
+        return mean * self._y_std + self._y_mean, variance * self._y_std ** 2
+
+    def predict_components(self, x: np.ndarray) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+        """Predict mean and variance of each additive component of the latent function at new points.
+
+        For a kernel `k = k_1 + ... + k_c` the posterior of component `f_i` has mean `K_i(x, X) * alpha` and
+        variance `K_i(x, x) - K_i(x, X) * (K + s^2 * I)^-1 * K_i(X, x)`. The cross covariances of all components
+        are solved against the cached Cholesky factor at once, so decomposition costs about as much as a single prediction.
+
+        Parameters
+        ----------
+        x: np.ndarray
+            New time points, in the same scale as the `x` passed on construction, usually a grid.
+
+        Returns
+        -------
+        components: List[Tuple[str, np.ndarray, np.ndarray]]
+            For each summand of the kernel its text, mean and variance, both of shape `(m, 1)`. Means and variances
+            are in the scale of the `y` passed on construction, the mean of `y` is not attributed to any component,
+            i.e., means of all components plus the mean of `y` add up to the mean returned by `predict`.
+
+        """
+        x = x.reshape(-1, 1).astype(float) * self._x_scale
+        n_components = len(self._components)
+        means, variances = np.empty((n_components, x.shape[0])), np.empty((n_components, x.shape[0]))
+
+        chunk_size = max(self._chunk_size // n_components, 1)
+        for start in range(0, x.shape[0], chunk_size):
+            chunk = slice(start, start + chunk_size)
+            cross_covariances = np.stack([kernel(x[chunk], self._x) for _, kernel in self._components])
+            means[:, chunk] = cross_covariances @ self._alpha[:, 0]
+
+            # Solve all components at once, using their cross covariances as columns of a single right hand side.
+            right_hand_side = cross_covariances.reshape(-1, self._x.shape[0]).T
+            v = solve_triangular(self._cholesky, right_hand_side, lower=True).T.reshape(cross_covariances.shape)
+            variances[:, chunk] = np.stack([kernel(x[chunk], diag=True) for _, kernel in self._components]) - np.sum(v ** 2, axis=2)
+
+        return [(name, means[i].reshape(-1, 1) * self._y_std, variances[i].reshape(-1, 1) * self._y_std ** 2)
+                for i, (name, _) in enumerate(self._components)]
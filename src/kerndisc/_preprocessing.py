@@ -1,11 +1,48 @@
-"""Module to preprocess time series data."""
+"""Module to preprocess time series data.
+
+Data that does not fit into memory, e.g., memory-mapped arrays or series read from files in parts, can be
+preprocessed in chunks using `preprocess_stream`. It computes all statistics in a single pass over the chunks
+and then normalizes chunk by chunk, so no copy of the full series is ever made.
+
+Series with more points than a GP can handle, or with repeated time points, can be reduced before discovery
+using `reduce_data`, or `reduce_stream` for series given in chunks. Reduction returns a weight per point, the
+number of observations it represents, to be passed as noise weights to models.
+
+"""
 import logging
-from typing import Optional, Tuple
+import os
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
 
 _LOGGER = logging.getLogger(__package__)
+_CHUNK_SIZE = int(os.environ.get('PREPROCESSING_CHUNK_SIZE', 1048576))
+
+
+class SeriesStatistics(NamedTuple):
+    """Statistics of a series required to preprocess it.
+
+    Attributes
+    ----------
+    count: int
+        Number of points.
+
+    y_mean: float
+        Mean of `y`.
+
+    y_std: float
+        Standard deviation of `y`, with zero degrees of freedom like `np.std`.
+
+    x_max: float
+        Maximum of `x`.
+
+    """
+
+    count: int
+    y_mean: float
+    y_std: float
+    x_max: float
 
 
 def preprocess(x: np.ndarray, y: np.ndarray, rescale_x_to_upper_bound: Optional[float]=None) -> Tuple[np.ndarray, np.ndarray]:
@@ -57,7 +94,308 @@ def preprocess(x: np.ndarray, y: np.ndarray, rescale_x_to_upper_bound: Optional[
     return x, y
 
 
-def _rescale_x(x: np.ndarray, rescale_x_to_upper_bound: Optional[float]=None) -> np.ndarray:
+def chunk_arrays(x: np.ndarray, y: np.ndarray, chunk_size: int=_CHUNK_SIZE) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Split `x` and `y` into chunks, that can be passed to `preprocess_stream`.
+
+    Chunks are views, so memory-mapped arrays, e.g., as loaded by `np.load(path, mmap_mode='r')`,
+    are only read once a chunk is processed.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        Some vector, assumed to be time points, of values `x_1, ..., x_n`.
+
+    y: np.ndarray
+        Some vector, assumed to be observations, of values `y_1, ..., y_n`.
+
+    chunk_size: int
+        Maximum number of points per chunk. Defaults to environment variable `PREPROCESSING_CHUNK_SIZE`.
+
+    Returns
+    -------
+    chunks: List[Tuple[np.ndarray, np.ndarray]]
+        Pairs of chunks of `x` and `y`.
+
+    Raises
+    ------
+    ValueError
+        If `x` and `y` are not of same size.
+
+    """
+    if x.size != y.size:
+        _LOGGER.exception(f'Sizes of x and y do not match! Size of x is {x.size}, size of y is {y.size}.')
+        raise ValueError('Shapes of x and y do not match!')
+
+    x, y = x.reshape(-1), y.reshape(-1)
+    return [(x[start:start + chunk_size], y[start:start + chunk_size]) for start in range(0, x.shape[0], chunk_size)]
+
+
+def stream_statistics(chunks: Iterable[Tuple[np.ndarray, np.ndarray]]) -> SeriesStatistics:
+    """Compute statistics of a series in a single pass over its chunks.
+
+    Mean and standard deviation of `y` are merged chunk by chunk using the parallel variant of
+    Welford's algorithm, which is numerically stable for long series, unlike summing squares.
+
+    Parameters
+    ----------
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+        Pairs of chunks of `x` and `y`, e.g., as returned by `chunk_arrays`.
+
+    Returns
+    -------
+    statistics: SeriesStatistics
+        Statistics of the whole series.
+
+    Raises
+    ------
+    ValueError
+        If chunks of `x` and `y` are not of same size, or if there are no points at all.
+
+    """
+    count, mean, squared_deviations, x_max = 0, 0., 0., -np.inf
+    for x_chunk, y_chunk in chunks:
+        _check_chunk(x_chunk, y_chunk)
+        if y_chunk.size == 0:
+            continue
+
+        y_chunk = y_chunk.astype(float, copy=False)
+        chunk_mean = y_chunk.mean()
+        chunk_squared_deviations = np.sum((y_chunk - chunk_mean) ** 2)
+
+        delta = chunk_mean - mean
+        merged_count = count + y_chunk.size
+        mean += delta * y_chunk.size / merged_count
+        squared_deviations += chunk_squared_deviations + delta ** 2 * count * y_chunk.size / merged_count
+        count = merged_count
+        x_max = max(x_max, float(x_chunk.max()))
+
+    if count == 0:
+        _LOGGER.exception('Can not compute statistics of an empty series.')
+        raise ValueError('Can not compute statistics of an empty series.')
+
+    return SeriesStatistics(count=count, y_mean=float(mean), y_std=float(np.sqrt(squared_deviations / count)), x_max=x_max)
+
+
+def preprocess_stream(chunks: Iterable[Tuple[np.ndarray, np.ndarray]], rescale_x_to_upper_bound: Optional[float]=None,
+                      statistics: Optional[SeriesStatistics]=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Apply the preprocessing steps of `preprocess` to a series given in chunks.
+
+    Statistics are computed in a first pass over `chunks`, unless passed as `statistics`. Chunks are
+    then normalized lazily, i.e., only one preprocessed chunk is held in memory at a time. Concatenating
+    all preprocessed chunks gives the same result as `preprocess`, up to floating point errors.
+
+    Parameters
+    ----------
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+        Pairs of chunks of `x` and `y`, e.g., as returned by `chunk_arrays`. Must be iterable twice,
+        e.g., a list of memory-mapped views, unless `statistics` are passed.
+
+    rescale_x_to_upper_bound: Optional[float]
+        Rescale `x` to the range `[x.min() / x.max(), 1] * rescale_x_to_upper_bound`.
+
+    statistics: Optional[SeriesStatistics]
+        Statistics of the series, e.g., as computed by `stream_statistics` while the series was written.
+
+    Returns
+    -------
+    chunks: Iterator[Tuple[np.ndarray, np.ndarray]]
+        Preprocessed chunks of `x` and `y`, both of shape `(-1, 1)` and type `float`.
+
+    Raises
+    ------
+    ValueError
+        If `chunks` can only be iterated once and no `statistics` were passed, if chunks of `x` and `y`
+        are not of same size, or if `x` can not be rescaled.
+
+    """
+    if statistics is None:
+        if iter(chunks) is chunks:
+            _LOGGER.exception('Chunks can only be iterated once, but are required twice to compute statistics first.')
+            raise ValueError('Chunks must be iterable twice, if no statistics are passed.')
+        statistics = stream_statistics(chunks)
+
+    _check_rescale(rescale_x_to_upper_bound, statistics.x_max)
+    return _normalize_chunks(chunks, rescale_x_to_upper_bound, statistics)
+
+
+def reduce_data(x: np.ndarray, y: np.ndarray, noise_weights: Optional[np.ndarray]=None, duplicate_tolerance: float=0.,
+                resolution: Optional[float]=None, n_points: Optional[int]=None,
+                preserve_extrema: bool=False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce a series to fewer points, keeping track of how many observations each point represents.
+
+    Points are sorted by `x`, then the following steps are applied:
+        * Merge points whose `x` differ by at most `duplicate_tolerance` from their predecessor,
+        * merge points within the same interval `[k * resolution, (k + 1) * resolution)`, if `resolution` is set,
+        * reduce to at most `n_points`, if set, using equally wide intervals spanning all of `x`.
+
+    Merged points are weighted averages of their `x` and `y`, their weight is the sum of the weights merged,
+    i.e., the number of observations averaged if no `noise_weights` were passed. Observation noise of an average
+    of `w` observations has variance `s^2 / w`, which is why weights are to be used as noise weights of models.
+
+    As all intervals are equally wide in `x`, reduced series remain regularly sampled, so periodic structure is kept.
+    Averaging smooths extrema though, to keep them set `preserve_extrema`: Then `n_points / 2` intervals are made
+    and only the points with minimal and maximal `y` of each interval are kept, each with its own weight.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        Some vector, assumed to be time points, of values `x_1, ..., x_n`.
+
+    y: np.ndarray
+        Some vector, assumed to be observations, of values `y_1, ..., y_n`.
+
+    noise_weights: Optional[np.ndarray]
+        Positive weights `w_1, ..., w_n` of points, e.g., from a previous reduction. All `1` if `None`.
+
+    duplicate_tolerance: float
+        Maximum distance in `x` of points to be considered duplicates.
+
+    resolution: Optional[float]
+        Width of intervals in `x` to merge points in.
+
+    n_points: Optional[int]
+        Maximum number of points to reduce to.
+
+    preserve_extrema: bool
+        Whether to keep minima and maxima when reducing to `n_points`, instead of averaging.
+
+    Returns
+    -------
+    x, y, noise_weights: Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Reduced series sorted by `x` and weights of its points, all of shape `(-1,)` and type `float`.
+
+    Raises
+    ------
+    ValueError
+        If `x`, `y` and `noise_weights` are not of same size, weights are not positive, or `resolution` or `n_points`
+        is not positive.
+
+    """
+    x, y = x.reshape(-1).astype(float), y.reshape(-1).astype(float)
+    noise_weights = np.ones_like(x) if noise_weights is None else noise_weights.reshape(-1).astype(float)
+    _check_reduction(x, y, noise_weights, resolution, n_points)
+
+    order = np.argsort(x, kind='stable')
+    x, y, noise_weights = x[order], y[order], noise_weights[order]
+
+    x, y, noise_weights = _merge(x, y, noise_weights, np.diff(x) > duplicate_tolerance)
+    if resolution is not None:
+        x, y, noise_weights = _merge(x, y, noise_weights, np.diff(np.floor(x / resolution)) > 0)
+
+    if n_points is not None and x.shape[0] > n_points:
+        if preserve_extrema:
+            return _keep_extrema(x, y, noise_weights, max(n_points // 2, 1))
+        x, y, noise_weights = _merge(x, y, noise_weights, np.diff(_interval_indices(x, n_points)) > 0)
+
+    return x, y, noise_weights
+
+
+def reduce_stream(chunks: Iterable[Tuple[np.ndarray, np.ndarray]], **reduction_kwargs: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce a series given in chunks, without holding more than one of its chunks in memory.
+
+    Each chunk is reduced by merging duplicates and points within the same interval of width `resolution`.
+    As intervals are aligned at `0`, points of an interval split across chunks are merged again when all reduced
+    chunks are reduced together, which gives the same result as reducing the whole series at once. `n_points`
+    is only applied to all reduced chunks together.
+
+    Parameters
+    ----------
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]]
+        Pairs of chunks of `x` and `y`, e.g., as returned by `chunk_arrays`. Iterated once.
+
+    reduction_kwargs: Any
+        Passed to `reduce_data`. `resolution` should be set, otherwise chunks are only reduced by merging duplicates.
+
+    Returns
+    -------
+    x, y, noise_weights: Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Reduced series and weights of its points, see `reduce_data`.
+
+    Raises
+    ------
+    ValueError
+        If chunks of `x` and `y` are not of same size, or `reduction_kwargs` are invalid, see `reduce_data`.
+
+    """
+    chunk_reduction_kwargs = {key: reduction_kwargs[key] for key in ['duplicate_tolerance', 'resolution'] if key in reduction_kwargs}
+    reduced_chunks = [reduce_data(x_chunk, y_chunk, **chunk_reduction_kwargs) for x_chunk, y_chunk in chunks]
+    if not reduced_chunks:
+        _LOGGER.exception('Can not reduce an empty series.')
+        raise ValueError('Can not reduce an empty series.')
+
+    x, y, noise_weights = (np.concatenate(arrays) for arrays in zip(*reduced_chunks))
+    return reduce_data(x, y, noise_weights=noise_weights, **reduction_kwargs)
+
+
+def _check_reduction(x: np.ndarray, y: np.ndarray, noise_weights: np.ndarray, resolution: Optional[float], n_points: Optional[int]) -> None:
+    if not x.shape == y.shape == noise_weights.shape:
+        _LOGGER.exception(f'Sizes of x, y and noise weights do not match! Sizes are {x.size}, {y.size} and {noise_weights.size}.')
+        raise ValueError('Shapes of x, y and noise weights do not match!')
+    if np.any(noise_weights <= 0):
+        _LOGGER.exception('Noise weights must be positive.')
+        raise ValueError('Noise weights must be positive.')
+    if (resolution is not None and resolution <= 0) or (n_points is not None and n_points < 1):
+        _LOGGER.exception(f'Bad resolution `{resolution}` or number of points `{n_points}` to reduce to.')
+        raise ValueError('Resolution and number of points to reduce to must be positive.')
+
+
+def _merge(x: np.ndarray, y: np.ndarray, noise_weights: np.ndarray, is_new_group: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge consecutive points into weighted averages, a new group starting wherever `is_new_group` of its predecessor is set."""
+    if is_new_group.all():
+        return x, y, noise_weights
+
+    group_starts = np.flatnonzero(np.concatenate([[True], is_new_group]))
+    merged_weights = np.add.reduceat(noise_weights, group_starts)
+    merged_x = np.add.reduceat(noise_weights * x, group_starts) / merged_weights
+    merged_y = np.add.reduceat(noise_weights * y, group_starts) / merged_weights
+    return merged_x, merged_y, merged_weights
+
+
+def _interval_indices(x: np.ndarray, n_intervals: int) -> np.ndarray:
+    """Get index of the equally wide interval spanning sorted `x` each point lies in."""
+    width = (x[-1] - x[0]) / n_intervals
+    if width == 0:
+        return np.zeros(x.shape[0], dtype=int)
+    return np.minimum(((x - x[0]) / width).astype(int), n_intervals - 1)
+
+
+def _keep_extrema(x: np.ndarray, y: np.ndarray, noise_weights: np.ndarray, n_intervals: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Keep points with minimal and maximal `y` of each equally wide interval of sorted `x`."""
+    intervals = _interval_indices(x, n_intervals)
+    order = np.lexsort((y, intervals))
+    interval_starts = np.flatnonzero(np.concatenate([[True], np.diff(intervals[order]) > 0]))
+    interval_ends = np.concatenate([interval_starts[1:], [x.shape[0]]]) - 1
+
+    keep = np.unique(np.concatenate([order[interval_starts], order[interval_ends]]))
+    return x[keep], y[keep], noise_weights[keep]
+
+
+def _normalize_chunks(chunks: Iterable[Tuple[np.ndarray, np.ndarray]], rescale_x_to_upper_bound: Optional[float],
+                      statistics: SeriesStatistics) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    y_std = statistics.y_std if not np.isclose(statistics.y_std, 0) else 1.
+    for x_chunk, y_chunk in chunks:
+        _check_chunk(x_chunk, y_chunk)
+        x_chunk, y_chunk = x_chunk.reshape(-1, 1).astype(float), y_chunk.reshape(-1, 1).astype(float)
+
+        y_chunk -= statistics.y_mean
+        y_chunk /= y_std
+
+        yield _rescale_x(x_chunk, rescale_x_to_upper_bound, x_max=statistics.x_max), y_chunk
+
+
+def _check_chunk(x_chunk: np.ndarray, y_chunk: np.ndarray) -> None:
+    if x_chunk.size != y_chunk.size:
+        _LOGGER.exception(f'Sizes of chunks of x and y do not match! Size of x is {x_chunk.size}, size of y is {y_chunk.size}.')
+        raise ValueError('Shapes of x and y do not match!')
+
+
+def _check_rescale(rescale_x_to_upper_bound: Optional[float], x_max: float) -> None:
+    if rescale_x_to_upper_bound is not None and (rescale_x_to_upper_bound <= 0 or x_max == 0):
+        _LOGGER.exception(f'Bad upper bound specified for `x`: `{rescale_x_to_upper_bound}`, or bad maximum of `x` to rescale: `{x_max}`.')
+        raise ValueError('Bad upper bound passed for to rescale `x` or bad maximum found for `x`.')
+
+
+def _rescale_x(x: np.ndarray, rescale_x_to_upper_bound: Optional[float]=None, x_max: Optional[float]=None) -> np.ndarray:
     """Rescale `x` to a certain interval.
 
     `x` is rescaled to some interval keeping the relative distance `c_i` between input
@@ -82,6 +420,9 @@ def _rescale_x(x: np.ndarray, rescale_x_to_upper_bound: Optional[float]=None) ->
     rescale_x_to_upper_bound: Optional[float]
         Rescale `x` to the range `[x.min() / x.max(), 1] * rescale_x_to_upper_bound`.
 
+    x_max: Optional[float]
+        Maximum to rescale by instead of `x.max()`, e.g., if `x` is only a chunk of all time points.
+
     Returns
     -------
     rescaled_x: np.ndarray
@@ -96,8 +437,7 @@ def _rescale_x(x: np.ndarray, rescale_x_to_upper_bound: Optional[float]=None) ->
     if rescale_x_to_upper_bound is None:
         return x
 
-    if rescale_x_to_upper_bound <= 0 or x.max() == 0:
-        _LOGGER.exception(f'Bad upper bound specified for `x`: `{rescale_x_to_upper_bound}`, or bad maximum of `x` to rescale: `{x.max()}`.')
-        raise ValueError('Bad upper bound passed for to rescale `x` or bad maximum found for `x`.')
+    x_max = x.max() if x_max is None else x_max
+    _check_rescale(rescale_x_to_upper_bound, x_max)
 
-    return rescale_x_to_upper_bound * x / x.max()
+    return rescale_x_to_upper_bound * x / x_max
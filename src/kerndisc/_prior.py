@@ -0,0 +1,179 @@
+"""Module to learn a prior over kernel structures from previous discoveries, ordering and pruning expansions.
+
+Each expansion of a parent into a child kernel applies a rule, seen here as the edit of terms between their canonical
+texts, i.e., the terms of the parent that are replaced and the terms of the child that replace them. E.g., expanding
+`rbf` into `periodic * rbf` applies `rbf -> periodic * rbf`, expanding `linear` into `linear + periodic` applies
+` -> periodic`, as simplified kernels are sums of products of base kernels.
+
+A `StructurePrior` counts how often each rule was applied in previous discoveries and how often it won, i.e., its
+child became the new best kernel. Passed to `expand_asts` or `discover`, expansions are ordered by their probability
+to win, such that likely winners are evaluated first, and expansions whose rule historically never wins are dropped.
+
+"""
+from collections import Counter, defaultdict
+import logging
+from typing import Any, DefaultDict, Dict, Iterable, List, Mapping, Tuple
+
+from anytree import Node
+import numpy as np
+
+from ._serialization import is_kernel
+from .description import ast_to_text
+
+
+_LOGGER = logging.getLogger(__package__)
+# Text of the kernel `discover` starts searching from.
+_START_KERNEL = 'white'
+
+
+class StructurePrior:
+    """Prior over kernel structures, estimating the probability of each expansion rule to win from previous discoveries.
+
+    The probability of a rule to win is estimated as `(wins + 1) / (applications + 2)`, such that unseen rules have a
+    probability of `0.5` and are never dropped, while rules need many applications without a win to be dropped.
+
+    Parameters
+    ----------
+    risk_threshold: float
+        Expansions whose rule wins with a probability below this are dropped, `0` keeps all expansions. At least the
+        most probable expansion is always kept.
+
+    Example
+    -------
+    ```
+        > prior = StructurePrior.from_results(load_results('previous_results'))
+        > discover(x, y, structure_prior=prior)
+    ```
+
+    """
+
+    def __init__(self, risk_threshold: float=0.01) -> None:
+        self.risk_threshold = risk_threshold
+        self.applications: Counter = Counter()
+        self.wins: Counter = Counter()
+
+    @classmethod
+    def from_results(cls, results: Iterable[Mapping[str, Any]], risk_threshold: float=0.01) -> 'StructurePrior':
+        """Learn a prior from results of `discover`, e.g., loaded using `load_results`.
+
+        Results only hold the `find_n_best` best kernels of a discovery, so rules are only counted as applied if their
+        child is amongst them. Pass a large `find_n_best` or use `from_records` to learn from all evaluated kernels.
+
+        Parameters
+        ----------
+        results: Iterable[Mapping[str, Any]]
+            Results of discoveries, one per discovery.
+
+        risk_threshold: float
+            See `StructurePrior`.
+
+        Returns
+        -------
+        prior: StructurePrior
+            Prior learned from `results`.
+
+        """
+        prior = cls(risk_threshold)
+        for result in results:
+            prior.add_discovery((kernel, value['depth'], value['score']) for kernel, value in result.items() if is_kernel(value))
+        return prior
+
+    @classmethod
+    def from_records(cls, discoveries: Iterable[Iterable[Mapping[str, Any]]], risk_threshold: float=0.01) -> 'StructurePrior':
+        """Learn a prior from records of all evaluated kernels, as passed to the `evaluation_hook` of `discover`.
+
+        Parameters
+        ----------
+        discoveries: Iterable[Iterable[Mapping[str, Any]]]
+            Records of discoveries, one iterable of records holding `kernel`, `depth` and `score` per discovery. E.g.,
+            the lines of files written by `kerndisc.evaluation.make_json_lines_hook`, one file per discovery.
+
+        risk_threshold: float
+            See `StructurePrior`.
+
+        Returns
+        -------
+        prior: StructurePrior
+            Prior learned from `discoveries`.
+
+        """
+        prior = cls(risk_threshold)
+        for records in discoveries:
+            prior.add_discovery((record['kernel'], record['depth'], record['score']) for record in records)
+        return prior
+
+    def add_discovery(self, kernels: Iterable[Tuple[str, int, float]]) -> None:
+        """Count rules applied and won in a discovery, given the canonical text, depth and score of its kernels.
+
+        Kernels of each depth are assumed to be expanded from the best kernel of all previous depths, which holds
+        for greedy searches, i.e., `max_kernels_per_depth=1`. A rule wins if its child is the best kernel of its depth
+        and improves the score of its parent.
+
+        """
+        kernels_by_depth: DefaultDict[int, List[Tuple[float, str]]] = defaultdict(list)
+        for kernel, depth, score in kernels:
+            if np.isfinite(score):
+                kernels_by_depth[depth].append((score, kernel))
+
+        leader, leader_score = _START_KERNEL, np.Inf
+        for depth in sorted(kernels_by_depth):
+            self.applications.update(expansion_rule(leader, kernel) for _, kernel in kernels_by_depth[depth])
+            best_score, best_kernel = min(kernels_by_depth[depth])
+            if best_score < leader_score:
+                self.wins[expansion_rule(leader, best_kernel)] += 1
+                leader, leader_score = best_kernel, best_score
+
+    def win_probability(self, parent: str, child: str) -> float:
+        """Estimated probability of an expansion of `parent` into `child`, both as canonical text, to win."""
+        rule = expansion_rule(parent, child)
+        return (self.wins[rule] + 1) / (self.applications[rule] + 2)
+
+    def rank(self, asts: List[Node], parents: Dict[str, str]) -> List[Node]:
+        """Order expanded kernels by their probability to win, dropping those below `risk_threshold`.
+
+        Parameters
+        ----------
+        asts: List[Node]
+            Expanded kernels.
+
+        parents: Dict[str, str]
+            Canonical text of the kernel each of `asts` was expanded from, by its canonical text.
+
+        Returns
+        -------
+        ranked_asts: List[Node]
+            Kept kernels, most probable winners first. Kernels of equal probability keep their order.
+
+        """
+        probabilities = [self.win_probability(parents.get(ast_to_text(ast), _START_KERNEL), ast_to_text(ast)) for ast in asts]
+        order = sorted(range(len(asts)), key=lambda i: -probabilities[i])
+        kept = order[:1] + [i for i in order[1:] if probabilities[i] >= self.risk_threshold]
+        if len(kept) < len(asts):
+            _LOGGER.info(f'Structure prior dropped `{len(asts) - len(kept)}` of `{len(asts)}` expansions, '
+                         f'winning with a probability below `{self.risk_threshold}`.')
+        return [asts[i] for i in kept]
+
+
+def expansion_rule(parent: str, child: str) -> str:
+    """Rule applied by expanding a kernel into another, as edit of terms between their canonical texts.
+
+    Parameters
+    ----------
+    parent: str
+        Canonical text of the expanded kernel, see `kerndisc.description.ast_to_text`.
+
+    child: str
+        Canonical text of the expansion.
+
+    Returns
+    -------
+    rule: str
+        Terms of `parent` replaced by terms of `child`, e.g., `rbf -> periodic * rbf`.
+
+    """
+    parent_terms, child_terms = _terms(parent), _terms(child)
+    return f'{" + ".join(sorted((parent_terms - child_terms).elements()))} -> {" + ".join(sorted((child_terms - parent_terms).elements()))}'
+
+
+def _terms(kernel: str) -> Counter:
+    return Counter(' * '.join(sorted(term.split(' * '))) for term in kernel.split(' + '))
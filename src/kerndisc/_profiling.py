@@ -0,0 +1,179 @@
+"""Module to profile kernel discovery.
+
+Time spent by `discover` is attributed to the following phases per depth:
+    * `expansion`: Expanding ASTs using the selected grammar, excluding their simplification,
+    * `simplification`: Simplifying expanded ASTs,
+    * `deduplication`: Removing already scored ASTs from the search space,
+    * `build`: Building models, i.e., constructing their tensorflow graphs,
+    * `optimization`: Optimizing models,
+    * `scoring`: Scoring optimized models,
+    * `selection`: Selecting the best kernels to expand next.
+
+Additionally each candidates evaluation can be profiled using `cProfile`, keeping the profiles
+of the slowest candidates only.
+
+"""
+import contextlib
+import cProfile
+import heapq
+import io
+import itertools
+import pstats
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+PHASES = ['expansion', 'simplification', 'deduplication', 'build', 'optimization', 'scoring', 'selection']
+_STATS_LIMIT = 30
+_TIE_BREAKER = itertools.count()
+
+
+@contextlib.contextmanager
+def timed(timings: Optional[Dict[str, float]], phase: str) -> Iterator[None]:
+    """Add time spent in a `with` block to `timings[phase]`.
+
+    Parameters
+    ----------
+    timings: Optional[Dict[str, float]]
+        Timings to add to, nothing is timed if `None`.
+
+    phase: str
+        Phase to attribute time to.
+
+    """
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.) + time.perf_counter() - start
+
+
+def add_evaluation_timings(timings: Dict[str, float], evaluation_info: Dict[str, Any]) -> None:
+    """Attribute time spent evaluating a single kernel to `build`, `optimization` and `scoring` phases.
+
+    Parameters
+    ----------
+    timings: Dict[str, float]
+        Timings to add to.
+
+    evaluation_info: Dict[str, Any]
+        Information about a kernels evaluation, as yielded by `evaluate_asts`.
+
+    """
+    for phase in ['build', 'optimization', 'scoring']:
+        timings[phase] = timings.get(phase, 0.) + evaluation_info.get(f'{phase}_time', 0.)
+
+
+def keep_slowest_candidate(slowest_candidates: List[Tuple[float, int, str, int, cProfile.Profile]], n: int,
+                           kernel_name: str, depth: int, evaluation_info: Dict[str, Any]) -> None:
+    """Keep the profile of a candidate, if it is amongst the `n` slowest candidates.
+
+    The profile is removed from `evaluation_info` in any case, as profiles are large.
+
+    Parameters
+    ----------
+    slowest_candidates: List[Tuple[float, int, str, int, cProfile.Profile]]
+        Heap of the slowest candidates so far, as `(evaluation_time, tie_breaker, kernel_name, depth, profile)`.
+
+    n: int
+        Number of slowest candidates to keep.
+
+    kernel_name: str
+        Textual representation of the candidates kernel.
+
+    depth: int
+        Depth the candidate was evaluated at.
+
+    evaluation_info: Dict[str, Any]
+        Information about the candidates evaluation, as yielded by `evaluate_asts`.
+
+    """
+    profile = evaluation_info.pop('profile', None)
+    if profile is None or n < 1:
+        return
+
+    evaluation_time = sum(evaluation_info.get(f'{phase}_time', 0.) for phase in ['build', 'optimization', 'scoring'])
+    candidate = (evaluation_time, next(_TIE_BREAKER), kernel_name, depth, profile)
+    if len(slowest_candidates) < n:
+        heapq.heappush(slowest_candidates, candidate)
+    else:
+        heapq.heappushpop(slowest_candidates, candidate)
+
+
+def summarize_profile(depth_timings: List[Dict[str, float]],
+                      slowest_candidates: List[Tuple[float, int, str, int, cProfile.Profile]]) -> Dict[str, Any]:
+    """Summarize the profile of a discovery.
+
+    Parameters
+    ----------
+    depth_timings: List[Dict[str, float]]
+        Time spent in each phase, for each depth.
+
+    slowest_candidates: List[Tuple[float, int, str, int, cProfile.Profile]]
+        Heap of the slowest candidates, see `keep_slowest_candidate`.
+
+    Returns
+    -------
+    profile: Dict[str, Any]
+        Summary of the following form:
+        ```
+            {
+                'depths': [
+                    {'expansion': seconds, 'simplification': seconds, ..., 'selection': seconds},
+                    ...
+                ],
+                'slowest_candidates': [
+                    {'kernel': kernel_name, 'depth': depth, 'evaluation_time': seconds, 'stats': cprofile_stats},
+                    ...
+                ],
+            }
+        ```
+        Depths are ordered by depth, candidates by descending evaluation time.
+
+    """
+    depths = []
+    for timings in depth_timings:
+        timings = {phase: timings.get(phase, 0.) for phase in PHASES}
+        # Simplification happens during expansion, but is reported separately.
+        timings['expansion'] = max(timings['expansion'] - timings['simplification'], 0.)
+        depths.append(timings)
+
+    return {
+        'depths': depths,
+        'slowest_candidates': [{
+            'kernel': kernel_name,
+            'depth': depth,
+            'evaluation_time': evaluation_time,
+            'stats': _format_stats(profile),
+        } for evaluation_time, _, kernel_name, depth, profile in sorted(slowest_candidates, reverse=True)],
+    }
+
+
+def _format_stats(profile: cProfile.Profile) -> str:
+    """Format the most expensive calls of a profile, by cumulative time, as text."""
+    stream = io.StringIO()
+    pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(_STATS_LIMIT)
+    return stream.getvalue()
+
+
+def format_depth_timings(profile: Dict[str, Any]) -> str:
+    """Format time spent in each phase per depth as a table.
+
+    Parameters
+    ----------
+    profile: Dict[str, Any]
+        Summary of a profile, as returned by `summarize_profile`.
+
+    Returns
+    -------
+    table: str
+        One row per depth, one column per phase, in seconds.
+
+    """
+    rows = ['depth ' + ' '.join(f'{phase:>14}' for phase in PHASES)]
+    rows.extend(f'{depth:>5} ' + ' '.join(f'{timings[phase]:>14.3f}' for phase in PHASES) for depth, timings in enumerate(profile['depths']))
+    return '\n'.join(rows)
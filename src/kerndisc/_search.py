@@ -0,0 +1,203 @@
+"""Module of search strategies, which select the expanded kernels `discover` evaluates at each depth.
+
+By default `discover` evaluates all expansions of the best kernels of the previous depth. `BayesianSearch` instead
+evaluates only the most promising few of them, following Malkomes et al., "Bayesian optimization for automated model
+selection" (2016): A Gaussian process over kernel structures, the surrogate, is fitted to the scores of all kernels
+evaluated so far and expansions are selected by their expected improvement of the best score.
+
+The surrogate compares kernels by `structure_distance`, a distance between their `simplify`-canonical forms. Malkomes
+et al. compare kernels by the Hellinger distance of the Gaussian process priors they induce on the data, which needs
+their optimized parameters and is thus not available for unevaluated expansions.
+
+"""
+from collections import Counter
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from anytree import Node
+import numpy as np
+from scipy.linalg import cho_solve, solve_triangular
+from scipy.stats import norm
+
+from ._kernels import kernel_name
+from .description import ast_to_text, simplify
+
+
+_LOGGER = logging.getLogger(__package__)
+
+
+class BayesianSearch:
+    """Search strategy selecting the expansions to evaluate by expected improvement, under a surrogate of scores.
+
+    Expansions are selected one after another, each time assuming the previously selected one scores as predicted,
+    such that selections of a depth are diverse. Once `evaluation_budget` kernels were selected, none are selected
+    anymore and `discover` terminates. Pass `max_kernels_per_depth=None` to `discover` to select from the expansions
+    of all evaluated kernels, rather than of the best ones only.
+
+    Parameters
+    ----------
+    n_per_depth: int
+        Number of expansions to evaluate at each depth.
+
+    evaluation_budget: Optional[int]
+        Total number of kernels to evaluate, unlimited if `None`.
+
+    length_scale: Optional[float]
+        Length scale of the surrogate in units of `structure_distance`, defaults to the median distance of all kernels.
+
+    noise_variance: float
+        Noise variance of the surrogate, relative to the variance of scores.
+
+    exploration: float
+        Improvement, in standard deviations of scores, below which improvements are not rewarded. Larger values favour
+        expansions the surrogate is uncertain about.
+
+    Example
+    -------
+    ```
+        > discover(x, y, max_kernels_per_depth=None, search_strategy=BayesianSearch(n_per_depth=3, evaluation_budget=30))
+    ```
+
+    """
+
+    def __init__(self, n_per_depth: int=3, evaluation_budget: Optional[int]=30, length_scale: Optional[float]=None,
+                 noise_variance: float=0.1, exploration: float=0.01) -> None:
+        self.n_per_depth = n_per_depth
+        self.evaluation_budget = evaluation_budget
+        self.length_scale = length_scale
+        self.noise_variance = noise_variance
+        self.exploration = exploration
+        self.n_selected = 0
+        self._features: Dict[str, Counter] = {}
+
+    def select(self, candidates: List[Node], scored_kernels: Dict[str, Dict[str, Any]]) -> List[Node]:
+        """Select the candidates to evaluate, by expected improvement under a surrogate fitted to `scored_kernels`.
+
+        Parameters
+        ----------
+        candidates: List[Node]
+            ASTs of unscored kernels to select from.
+
+        scored_kernels: Dict[str, Dict[str, Any]]
+            Kernels evaluated so far, as built by `discover`. Kernels with an infinite score are ignored.
+
+        Returns
+        -------
+        selected: List[Node]
+            Selected candidates, at most `n_per_depth`, none if the budget is exhausted.
+
+        """
+        n = self.n_per_depth if self.evaluation_budget is None else min(self.n_per_depth, self.evaluation_budget - self.n_selected)
+        observed = [kernel for kernel in scored_kernels.values() if np.isfinite(kernel['score'])]
+        if n <= 0 or not candidates:
+            return []
+        if not observed:
+            selected = candidates[:n]
+        else:
+            selected = self._select_by_expected_improvement(candidates, observed, n)
+
+        self.n_selected += len(selected)
+        return selected
+
+    def _select_by_expected_improvement(self, candidates: List[Node], observed: List[Dict[str, Any]], n: int) -> List[Node]:
+        """Select `n` candidates one after another, assuming each selected candidate scores as predicted by the surrogate."""
+        features = [self._structure_features(kernel['ast']) for kernel in observed]
+        candidate_features = [self._structure_features(ast) for ast in candidates]
+        vocabulary = sorted(set().union(*features, *candidate_features))
+        observed_matrix = np.array([[feature[key] for key in vocabulary] for feature in features], dtype=float)
+        candidate_matrix = np.array([[feature[key] for key in vocabulary] for feature in candidate_features], dtype=float)
+
+        scores = np.array([kernel['score'] for kernel in observed], dtype=float)
+        scores = (scores - scores.mean()) / (scores.std() or 1.)
+        length_scale = self.length_scale or _median_distance(np.vstack([observed_matrix, candidate_matrix]))
+
+        remaining = list(range(len(candidates)))
+        selected: List[int] = []
+        while remaining and len(selected) < n:
+            mean, std = _posterior(observed_matrix, scores, candidate_matrix[remaining], length_scale, self.noise_variance)
+            improvement = scores.min() - mean - self.exploration
+            expected_improvement = improvement * norm.cdf(improvement / std) + std * norm.pdf(improvement / std)
+            best = int(np.argmax(expected_improvement))
+            _LOGGER.debug(f'Selected `{ast_to_text(candidates[remaining[best]])}` with expected improvement `{expected_improvement[best]:.4f}`.')
+
+            selected.append(remaining.pop(best))
+            observed_matrix = np.vstack([observed_matrix, candidate_matrix[selected[-1]]])
+            scores = np.append(scores, mean[best])
+        return [candidates[i] for i in selected]
+
+    def _structure_features(self, ast: Node) -> Counter:
+        key = ast_to_text(ast)
+        if key not in self._features:
+            self._features[key] = structure_features(ast)
+        return self._features[key]
+
+
+def structure_features(ast: Node) -> Counter:
+    """Count the base kernels and the product terms of the `simplify`-canonical form of a kernel.
+
+    Simplified kernels are sums of products of base kernels. E.g., `linear * rbf + periodic` has the base kernels
+    `linear`, `rbf` and `periodic`, each once, and the terms `linear * rbf` and `periodic`.
+
+    Parameters
+    ----------
+    ast: Node
+        AST of a kernel.
+
+    Returns
+    -------
+    features: Counter
+        Counts of base kernels, keyed `base:<name>`, and of terms, keyed `term:<text of term>`.
+
+    """
+    simplified = simplify(ast)
+    terms = simplified.children if kernel_name(simplified.name) == 'sum' else (simplified,)
+
+    features: Counter = Counter()
+    for term in terms:
+        base_kernel_names = sorted(kernel_name(leaf.name) for leaf in term.leaves)
+        features.update(f'base:{name}' for name in base_kernel_names)
+        features[f'term:{" * ".join(base_kernel_names)}'] += 1
+    return features
+
+
+def structure_distance(ast_a: Node, ast_b: Node) -> float:
+    """Euclidean distance of the `structure_features` of two kernels, `0` for kernels of the same canonical form.
+
+    Parameters
+    ----------
+    ast_a: Node
+        AST of a kernel.
+
+    ast_b: Node
+        AST of another kernel.
+
+    Returns
+    -------
+    distance: float
+        Distance of the kernels.
+
+    """
+    features_a, features_b = structure_features(ast_a), structure_features(ast_b)
+    return float(np.sqrt(sum((features_a[key] - features_b[key]) ** 2 for key in {*features_a, *features_b})))
+
+
+def _squared_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.square(a[:, None, :] - b[None, :, :]).sum(axis=-1)
+
+
+def _median_distance(features: np.ndarray) -> float:
+    distances = np.sqrt(_squared_distances(features, features))
+    distances = distances[distances > 0]
+    return float(np.median(distances)) if distances.size else 1.
+
+
+def _posterior(observed: np.ndarray, scores: np.ndarray, candidates: np.ndarray, length_scale: float,
+               noise_variance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Posterior mean and standard deviation of the surrogate at candidates, given observed standardized scores."""
+    gram = np.exp(-_squared_distances(observed, observed) / (2 * length_scale ** 2)) + noise_variance * np.eye(len(observed))
+    cross = np.exp(-_squared_distances(candidates, observed) / (2 * length_scale ** 2))
+    cholesky = np.linalg.cholesky(gram)
+    alpha = cho_solve((cholesky, True), scores)
+    projection = solve_triangular(cholesky, cross.T, lower=True)
+    variance = np.clip(1. - np.square(projection).sum(axis=0), 1e-12, None)
+    return cross @ alpha, np.sqrt(variance)
@@ -0,0 +1,182 @@
+"""Module to save and load results of `discover`.
+
+Results are stored in a directory made of two files:
+    * `index.json`: Versioned index of all results. Each kernel is stored with its structured AST (see
+      `kerndisc.description.ast_to_dict`), score, depth and evaluation information. Each of its parameters
+      is stored as offset and shape into the parameter buffer. Everything else, e.g., `highscore_progression`
+      and `termination_reason`, is stored as is.
+    * `params.f64`: All parameters of all results, as a single contiguous buffer of little-endian float64 values.
+
+Loading maps the parameter buffer into memory using `np.memmap`, so parameters of loaded results are
+read-only views into it, that are only read from disk when accessed.
+
+To pass results on as JSON, e.g., in responses of `kerndisc.service`, use `results_to_json`.
+
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .description import ast_to_dict, dict_to_ast
+
+
+FORMAT_VERSION = 1
+_INDEX_FILE = 'index.json'
+_PARAMS_FILE = 'params.f64'
+_PARAMS_DTYPE = np.dtype('<f8')
+_LOGGER = logging.getLogger(__package__)
+
+
+def save_results(path: str, results: List[Dict[str, Any]]) -> None:
+    """Save results of `discover`.
+
+    Parameters
+    ----------
+    path: str
+        Directory to save results to, it is created if it does not exist. Existing results in it are overwritten.
+
+    results: List[Dict[str, Any]]
+        Results, as returned by `discover`.
+
+    """
+    os.makedirs(path, exist_ok=True)
+
+    buffers: List[np.ndarray] = []
+    offset = 0
+    stored_results = []
+    for result in results:
+        stored_result: Dict[str, Any] = {'kernels': {}}
+        for key, value in result.items():
+            if not is_kernel(value):
+                stored_result[key] = value
+                continue
+
+            stored_params = {}
+            for param_name, param_value in value['params'].items():
+                param_value = np.asarray(param_value, dtype=_PARAMS_DTYPE)
+                stored_params[param_name] = [offset, list(param_value.shape)]
+                buffers.append(param_value.ravel())
+                offset += param_value.size
+
+            stored_result['kernels'][key] = {
+                **{name: entry for name, entry in value.items() if name not in ['ast', 'params']},
+                'ast': ast_to_dict(value['ast']),
+                'params': stored_params,
+            }
+        stored_results.append(stored_result)
+
+    params = np.concatenate(buffers) if buffers else np.empty(0, dtype=_PARAMS_DTYPE)
+    params.tofile(os.path.join(path, _PARAMS_FILE))
+    with open(os.path.join(path, _INDEX_FILE), 'w') as index_file:
+        json.dump({'format_version': FORMAT_VERSION, 'results': stored_results}, index_file, default=_to_json)
+
+
+def load_results(path: str, mmap: bool=True) -> List[Dict[str, Any]]:
+    """Load results saved by `save_results`.
+
+    Parameters
+    ----------
+    path: str
+        Directory results were saved to.
+
+    mmap: bool
+        Whether to map parameters into memory, instead of reading them at once.
+
+    Returns
+    -------
+    results: List[Dict[str, Any]]
+        Results, in the same form as returned by `discover`. Parameters are read-only arrays.
+
+    Raises
+    ------
+    ValueError
+        If results were saved in an unsupported format version.
+
+    """
+    with open(os.path.join(path, _INDEX_FILE)) as index_file:
+        index = json.load(index_file)
+
+    if index.get('format_version') != FORMAT_VERSION:
+        _LOGGER.exception(f'Unsupported format version `{index.get("format_version")}` of results at `{path}`, supported is `{FORMAT_VERSION}`.')
+        raise ValueError(f'Unsupported format version `{index.get("format_version")}`.')
+
+    params = _read_params(os.path.join(path, _PARAMS_FILE), mmap)
+
+    results = []
+    for stored_result in index['results']:
+        result = {key: value for key, value in stored_result.items() if key != 'kernels'}
+        for kernel_name, stored_kernel in stored_result['kernels'].items():
+            result[kernel_name] = {
+                **stored_kernel,
+                'ast': dict_to_ast(stored_kernel['ast']),
+                'params': {param_name: _view(params, offset, shape) for param_name, (offset, shape) in stored_kernel['params'].items()},
+            }
+        results.append(result)
+
+    return results
+
+
+def results_to_json(results: Any) -> Any:
+    """Convert results of `discover`, or lists of scored kernels, to JSON serializable values.
+
+    ASTs of scored kernels are converted using `kerndisc.description.ast_to_dict` and parameters to nested lists.
+    Non-finite numbers, e.g., the infinite score of a kernel that failed to evaluate, are converted to `None`, such
+    that the converted results are valid JSON.
+
+    Parameters
+    ----------
+    results: Any
+        Results, as returned by `discover`.
+
+    Returns
+    -------
+    converted_results: Any
+        Results made of dicts, lists, strings, finite numbers, booleans and `None` only.
+
+    """
+    if is_kernel(results):
+        return {
+            **{key: results_to_json(value) for key, value in results.items() if key not in ['ast', 'params']},
+            'ast': ast_to_dict(results['ast']),
+            'params': {name: results_to_json(np.asarray(value)) for name, value in results['params'].items()},
+        }
+    if isinstance(results, dict):
+        return {key: results_to_json(value) for key, value in results.items()}
+    if isinstance(results, (list, tuple)):
+        return [results_to_json(value) for value in results]
+    if isinstance(results, (np.generic, np.ndarray)):
+        return results_to_json(results.tolist())
+    if isinstance(results, float) and not np.isfinite(results):
+        return None
+    if results is None or isinstance(results, (bool, int, float, str)):
+        return results
+    return str(results)
+
+
+def is_kernel(value: Any) -> bool:
+    """Check whether a value of results of `discover` is a scored kernel, rather than information about the search."""
+    return isinstance(value, dict) and 'ast' in value and 'params' in value
+
+
+def _read_params(path: str, mmap: bool) -> np.ndarray:
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=_PARAMS_DTYPE)
+    if mmap:
+        return np.memmap(path, dtype=_PARAMS_DTYPE, mode='r')
+    params = np.fromfile(path, dtype=_PARAMS_DTYPE)
+    params.flags.writeable = False
+    return params
+
+
+def _view(params: np.ndarray, offset: int, shape: Tuple[int, ...]) -> np.ndarray:
+    return params[offset:offset + int(np.prod(shape))].reshape(shape)
+
+
+def _to_json(value: Any) -> Any:
+    """Convert numpy values, which `json` can't serialize, to python values."""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return str(value)
@@ -1,12 +1,16 @@
 """Module for kerndisc utility functions."""
-from typing import Any, Dict, List
+import bisect
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Tuple
 
 from anytree import Node
 import gpflow
 
+from ._config import Config
 from ._kernels import BASE_KERNELS
 from .description import kernel_to_ast
-from .expansion.grammars import IMPLEMENTED_BASE_KERNEL_NAMES
+from .expansion.grammars import get_implemented_base_kernel_names
 
 
 def n_best_scored_kernels(scored_kernels: Dict[str, Dict[str, Any]], n: int=1) -> List[str]:
@@ -43,7 +47,86 @@ def n_best_scored_kernels(scored_kernels: Dict[str, Dict[str, Any]], n: int=1) -
          `n` best performing kernels in descending order.
 
     """
-    return sorted(scored_kernels, key=lambda kernel: scored_kernels[kernel]['score'])[:n]
+    return heapq.nsmallest(n, scored_kernels, key=lambda kernel: scored_kernels[kernel]['score'])
+
+
+class Leaderboard:
+    """Kernels ordered by score, kept sorted as kernels are scored, such that the best `n` are available in `O(n)`.
+
+    Use this instead of `n_best_scored_kernels` if the best kernels are needed repeatedly while kernels are scored,
+    e.g., at each depth of a search. Kernels of equal score are ordered by when they were first added, as
+    `n_best_scored_kernels` does for kernels added to a dict in order. `NaN` scores are ordered as `inf`.
+
+    Attributes
+    ----------
+    highscore_progression: List[float]
+        Best score at each snapshot, see `snapshot`.
+
+    leader_progression: List[str]
+        Best kernel at each snapshot.
+
+    """
+
+    def __init__(self) -> None:
+        self.highscore_progression: List[float] = []
+        self.leader_progression: List[str] = []
+        self._entries: List[Tuple[float, int, str]] = []
+        self._entries_by_kernel: Dict[str, Tuple[float, int, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, kernel_name: object) -> bool:
+        return kernel_name in self._entries_by_kernel
+
+    def update(self, kernel_name: str, score: float) -> None:
+        """Add a scored kernel, or update the score of a kernel already added.
+
+        Its position is found by bisection in `O(log(n))` comparisons, but inserting it into the sorted list shifts
+        the entries after it, so an update takes `O(n)` time, which is negligible next to evaluating a kernel.
+
+        Parameters
+        ----------
+        kernel_name: str
+            Text of the kernel.
+
+        score: float
+            Score of the kernel, lower is better.
+
+        """
+        entry = self._entries_by_kernel.get(kernel_name)
+        if entry is not None:
+            del self._entries[bisect.bisect_left(self._entries, entry)]
+
+        order = len(self._entries_by_kernel) if entry is None else entry[1]
+        entry = (math.inf if math.isnan(score) else score, order, kernel_name)
+        bisect.insort(self._entries, entry)
+        self._entries_by_kernel[kernel_name] = entry
+
+    def top(self, n: Optional[int]=1) -> List[str]:
+        """Get the `n` best kernels, best first, all kernels if `n` is `None`."""
+        return [kernel_name for _, _, kernel_name in self._entries[:n]]
+
+    def snapshot(self, n: Optional[int]=1) -> List[Tuple[str, float]]:
+        """Get the `n` best kernels along with their scores, recording the best one, e.g., at the start of each depth of a search.
+
+        Parameters
+        ----------
+        n: Optional[int]
+            Number of kernels to get, all kernels if `None`.
+
+        Returns
+        -------
+        best_scored: List[Tuple[str, float]]
+            `n` best kernels and their scores, best first. The first one is appended to `leader_progression`
+            and its score to `highscore_progression`, if there is one.
+
+        """
+        best_scored = [(kernel_name, score) for score, _, kernel_name in self._entries[:n]]
+        if best_scored:
+            self.leader_progression.append(best_scored[0][0])
+            self.highscore_progression.append(best_scored[0][1])
+        return best_scored
 
 
 def calculate_relative_improvement(highscore_progression: List[float]) -> float:
@@ -82,16 +165,21 @@ def calculate_relative_improvement(highscore_progression: List[float]) -> float:
 
 
 @gpflow.defer_build()
-def build_all_implemented_base_asts() -> List[Node]:
-    """Build ASTs of all base kernels that are implemented in the current grammar.
+def build_all_implemented_base_asts(config: Optional[Config]=None) -> List[Node]:
+    """Build ASTs of all base kernels that are implemented in the configured grammar.
 
     Helper function that gets the currently implemented kernel names and creates an AST having
     only a root node for each of them.
 
+    Parameters
+    ----------
+    config: Optional[Config]
+        Configuration selecting the grammar, read from the environment if `None`.
+
     Returns
     -------
     base_asts: List[Node]
         ASTs of current base kernels.
 
     """
-    return [kernel_to_ast(BASE_KERNELS[kernel_name](1)) for kernel_name in IMPLEMENTED_BASE_KERNEL_NAMES]
+    return [kernel_to_ast(BASE_KERNELS[kernel_name](1)) for kernel_name in get_implemented_base_kernel_names(config)]
@@ -58,18 +58,21 @@ module.
 
 """
 from ._describe import describe
-from ._instantiate import instantiate_model_from_ast, instantiate_model_from_kernel
+from ._instantiate import get_noise_variances, instantiate_model_from_ast, instantiate_model_from_kernel
 from ._simplify import simplify
-from ._transform import ast_to_kernel, ast_to_text, kernel_to_ast
+from ._transform import ast_to_dict, ast_to_kernel, ast_to_text, dict_to_ast, kernel_to_ast
 from ._util import pretty_ast
 
 
 __all__ = [
+    'ast_to_dict',
     'ast_to_text',
     'ast_to_kernel',
     'instantiate_model_from_ast',
     'instantiate_model_from_kernel',
     'describe',
+    'dict_to_ast',
+    'get_noise_variances',
     'kernel_to_ast',
     'pretty_ast',
     'simplify',
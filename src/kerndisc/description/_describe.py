@@ -2,9 +2,9 @@
 import logging
 
 from anytree import Node
-import gpflow
 
 from ._simplify import simplify
+from .._kernels import BASE_KERNELS, kernel_name
 
 
 _LOGGER = logging.getLogger(__package__)
@@ -91,27 +91,27 @@ def _describe(node: Node) -> str:
     if node.is_leaf:
         return _NOUN_PRASHES[node.full_name.lower()] + ';'
 
-    if node.name is gpflow.kernels.Product:
+    if kernel_name(node.name) == 'product':
         children = list(node.children[:])
-        linear_child_count = [child.name for child in children].count(gpflow.kernels.Linear)
+        linear_child_count = [kernel_name(child.name) for child in children].count('linear')
         # Merge linear children into a polynomial child, for descriptions sake.
         if linear_child_count > 1:
-            children = [child for child in children if child.name is not gpflow.kernels.Linear]
-            children.append(Node(gpflow.kernels.Polynomial, full_name='Polynomial', degree=linear_child_count))
+            children = [child for child in children if kernel_name(child.name) != 'linear']
+            children.append(Node(BASE_KERNELS['polynomial'], full_name='Polynomial', degree=linear_child_count))
 
         kernels_by_precedence = sorted(children, key=lambda child: _NOUN_PRECEDENCE[child.full_name.lower()])
         noun, *post_modifiers = kernels_by_precedence
 
-        if noun.name is not gpflow.kernels.Polynomial:
+        if kernel_name(noun.name) != 'polynomial':
             noun_phrase = _NOUN_PRASHES[noun.full_name.lower()]
         else:
             noun_phrase = _NOUN_PRASHES[noun.full_name.lower()].format(degree=noun.degree)
 
         post_modifier_phrases = []
         for post_modifier in post_modifiers:
-            if post_modifier.name is gpflow.kernels.Constant:  # The constant kernel only adds a bias/an offset.
+            if kernel_name(post_modifier.name) == 'constant':  # The constant kernel only adds a bias/an offset.
                 continue
-            if post_modifier.name is not gpflow.kernels.Polynomial:
+            if kernel_name(post_modifier.name) != 'polynomial':
                 post_modifier_phrases.append(_POST_MODIFIERS[post_modifier.full_name.lower()])
             else:
                 post_modifier_phrases.append(_POST_MODIFIERS[post_modifier.full_name.lower()].format(degree=post_modifier.degree))
@@ -1,15 +1,29 @@
-"""Module to instantiate models using either ASTs or kernels."""
-from typing import Dict, Optional
+"""Module to instantiate models using either ASTs or kernels.
+
+gpflow is imported lazily, the first time a model is instantiated.
+
+Models are `gpflow.models.GPR` models, unless per point noise weights are passed, e.g., as returned by
+`kerndisc.reduce_data` for points merged from several observations. The noise variance of point `i` is then
+`s^2 / w_i`, i.e., averages of many observations are trusted more, while `s^2` is still a single parameter.
+The same holds if a fixed jitter is passed, which is added to the diagonal of the covariance matrix to keep it
+positive definite.
+
+"""
+from functools import lru_cache
+from typing import Dict, Optional, TYPE_CHECKING
 
 from anytree import Node
-import gpflow
 import numpy as np
 
 from ._transform import ast_to_kernel
 
+if TYPE_CHECKING:  # pragma: no cover
+    import gpflow
+
 
-def instantiate_model_from_kernel(x: np.ndarray, y: np.ndarray, kernel: gpflow.kernels.Kernel,
-                                  params: Optional[Dict[str, np.ndarray]]=None) -> gpflow.models.GPR:
+def instantiate_model_from_kernel(x: np.ndarray, y: np.ndarray, kernel: 'gpflow.kernels.Kernel',
+                                  params: Optional[Dict[str, np.ndarray]]=None,
+                                  noise_weights: Optional[np.ndarray]=None, jitter: float=0.) -> 'gpflow.models.GPR':
     """Instantiate a model from a kernel.
 
     Parameters
@@ -27,13 +41,24 @@ def instantiate_model_from_kernel(x: np.ndarray, y: np.ndarray, kernel: gpflow.k
         Parameters that can be supplied to initialize the models parameters with non-standard
         values.
 
+    noise_weights: Optional[np.ndarray]
+        Positive weights `w_1, ..., w_n` of the noise variance of each point, homoscedastic noise if `None`.
+
+    jitter: float
+        Fixed variance added to the noise variance of each point.
+
     Returns
     -------
     model: gpflow.models.GPR
         Instantiated model.
 
     """
-    model = gpflow.models.GPR(x, y, kern=kernel)
+    import gpflow
+
+    if noise_weights is None and not jitter:
+        model = gpflow.models.GPR(x, y, kern=kernel)
+    else:
+        model = _weighted_gpr_class()(x, y, kern=kernel, noise_weights=noise_weights, jitter=jitter)
     if params:
         model.assign(params)
 
@@ -41,7 +66,8 @@ def instantiate_model_from_kernel(x: np.ndarray, y: np.ndarray, kernel: gpflow.k
 
 
 def instantiate_model_from_ast(x: np.ndarray, y: np.ndarray, ast: Node,
-                               params: Optional[Dict[str, np.ndarray]]=None) -> gpflow.models.GPR:
+                               params: Optional[Dict[str, np.ndarray]]=None,
+                               noise_weights: Optional[np.ndarray]=None, jitter: float=0.) -> 'gpflow.models.GPR':
     """Build a kernel from an AST and instantiate a model from it.
 
     Thin wrapper around `instantiate_model_from_kernel` that first transforms
@@ -63,6 +89,12 @@ def instantiate_model_from_ast(x: np.ndarray, y: np.ndarray, ast: Node,
         Parameters that can be supplied to initialize the models parameters with non-standard
         values.
 
+    noise_weights: Optional[np.ndarray]
+        Positive weights `w_1, ..., w_n` of the noise variance of each point, homoscedastic noise if `None`.
+
+    jitter: float
+        Fixed variance added to the noise variance of each point.
+
     Returns
     -------
     model: gpflow.models.GPR
@@ -71,4 +103,77 @@ def instantiate_model_from_ast(x: np.ndarray, y: np.ndarray, ast: Node,
     """
     kernel = ast_to_kernel(ast, build=True)
 
-    return instantiate_model_from_kernel(x, y, kernel, params=params)
+    return instantiate_model_from_kernel(x, y, kernel, params=params, noise_weights=noise_weights, jitter=jitter)
+
+
+def get_noise_variances(model: 'gpflow.models.GPR') -> np.ndarray:
+    """Get noise variance of each training point of a model, at its current parameters.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        Model as instantiated by `instantiate_model_from_kernel`, with or without noise weights and jitter.
+
+    Returns
+    -------
+    noise_variances: np.ndarray
+        Noise variances of shape `(n,)`, i.e., `s^2 / w_i + jitter` for each point.
+
+    """
+    noise_weights = getattr(model, 'noise_weights', np.ones(model.X.shape[0]))
+    return float(model.likelihood.variance.read_value()) / noise_weights + getattr(model, 'jitter', 0.)
+
+
+@lru_cache(maxsize=None)
+def _weighted_gpr_class() -> type:
+    """Define a GPR model with heteroscedastic noise, deferred to first use to import gpflow lazily.
+
+    Likelihood and prediction are those of `gpflow.models.GPR`, with `s^2 * I` replaced by `s^2 * diag(1 / w) + jitter * I`.
+
+    """
+    import gpflow
+    import tensorflow as tf
+
+    class WeightedGPR(gpflow.models.GPR):
+
+        def __init__(self, x: np.ndarray, y: np.ndarray, kern: 'gpflow.kernels.Kernel', noise_weights: Optional[np.ndarray]=None,
+                     jitter: float=0., **kwargs) -> None:
+            noise_weights = np.ones(x.shape[0]) if noise_weights is None else noise_weights
+            self._noise_weights = np.asarray(noise_weights, dtype=gpflow.settings.float_type).reshape(-1)
+            self._jitter = jitter
+            # Named like `GPR`, such that parameters of both models have the same names.
+            super().__init__(x, y, kern, **{'name': 'GPR', **kwargs})
+
+        @property
+        def noise_weights(self) -> np.ndarray:
+            return self._noise_weights
+
+        @property
+        def jitter(self) -> float:
+            return self._jitter
+
+        def _noisy_covariance(self) -> tf.Tensor:
+            return self.kern.K(self.X) + tf.matrix_diag(self.likelihood.variance / self.noise_weights + self.jitter)
+
+        @gpflow.name_scope('likelihood')
+        @gpflow.params_as_tensors
+        def _build_likelihood(self) -> tf.Tensor:
+            cholesky = tf.cholesky(self._noisy_covariance())
+            z = tf.matrix_triangular_solve(cholesky, self.Y - self.mean_function(self.X), lower=True)
+            n = tf.cast(tf.shape(self.X)[0], gpflow.settings.float_type)
+            return -0.5 * (tf.reduce_sum(tf.square(z)) + 2 * tf.reduce_sum(tf.log(tf.matrix_diag_part(cholesky))) + n * np.log(2 * np.pi))
+
+        @gpflow.name_scope('predict')
+        @gpflow.params_as_tensors
+        def _build_predict(self, x_new: tf.Tensor, full_cov: bool=False) -> tf.Tensor:
+            cholesky = tf.cholesky(self._noisy_covariance())
+            a = tf.matrix_triangular_solve(cholesky, self.kern.K(self.X, x_new), lower=True)
+            z = tf.matrix_triangular_solve(cholesky, self.Y - self.mean_function(self.X), lower=True)
+            mean = tf.matmul(a, z, transpose_a=True) + self.mean_function(x_new)
+            if full_cov:
+                variance = (self.kern.K(x_new) - tf.matmul(a, a, transpose_a=True))[:, :, None]
+            else:
+                variance = (self.kern.Kdiag(x_new) - tf.reduce_sum(tf.square(a), 0))[:, None]
+            return mean, variance
+
+    return WeightedGPR
@@ -1,36 +1,59 @@
 """Module to rank kernel subkernel."""
-from typing import Any, Dict, List, Tuple
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 from anytree import Node
 import gpflow
 import numpy as np
+from scipy.linalg import solve_triangular
 
-from . import instantiate_model_from_ast, instantiate_model_from_kernel, kernel_to_ast, simplify
-from ..evaluation import evaluate_asts
-from ..evaluation.scoring import score_model
+from ._instantiate import get_noise_variances, instantiate_model_from_ast
+from ._transform import kernel_to_ast
+from .._kernel_functions import compile_kernel
 
 
-def rank(ast: Node, model_score: float, x: np.ndarray, y: np.ndarray, params: Dict[str, Any]) -> Tuple[float, List[Tuple[str, int]]]:
+# Maximum number of bytes of covariance matrices decomposed in a single batched Cholesky decomposition.
+_RANK_BATCH_BYTES = int(os.environ.get('RANK_BATCH_BYTES', 256 * 2 ** 20))
+
+
+def rank(ast: Node, model_score: float, x: np.ndarray, y: np.ndarray, params: Dict[str, Any],
+         noise_weights: Optional[np.ndarray]=None) -> Tuple[float, List[Tuple[float, List[str]]]]:
     """Describe a kernels subkernels according to their score importance.
 
     Score importance describes how much of a difference a subkernel of a simplified
     kernel makes. Subkernels that have a large impact on the score are more important
     than others. This can be determined for any kernel with any data.
 
+    The impact of a subkernel is measured as the absolute change of the negative log likelihood when
+    leaving it out, keeping all other parameters at their fitted values. The Gram matrix of each subkernel is
+    computed once, the Gram matrices of the leave-one-out sums are formed by subtracting it from the full Gram
+    matrix and they are factorized in batched Cholesky decompositions, of at most `RANK_BATCH_BYTES` (default
+    256 MiB) of covariance matrices each.
+
     Parameters
     ----------
     ast: Node
         Kernel that will be simplified and split into subkernels. These are then ranked.
 
+    model_score: float
+        Score of the model using `ast`, returned as is.
+
     x: np.ndarray
         (Usually) Time points `x_1, ..., x_n` at which `y_1, .., y_n` were measured.
 
     y: np.ndarray
         Values `y_1, ..., y_n` measured at (time points) `x_1, ..., x_n`.
 
+    params: Dict[str, Any]
+        Fitted parameters of the model using `ast`.
+
+    noise_weights: Optional[np.ndarray]
+        Positive weights `w_1, ..., w_n` of the noise variance of each point, the model using `ast` was fitted with,
+        homoscedastic noise if `None`.
+
     Returns
     -------
-    model_score, ranked_subexpressions: Tuple[float, List[Tuple[str, int]]]
+    model_score, ranked_subexpressions: Tuple[float, List[Tuple[float, List[str]]]]
         A ranking of the form:
         ```
             [
@@ -42,24 +65,67 @@ def rank(ast: Node, model_score: float, x: np.ndarray, y: np.ndarray, params: Di
         With `sub_k_1` having the largest absolute impact of `score_difference_1` on the
         GP models score.
 
+    Raises
+    ------
+    RuntimeError
+        If `ast` is not a combination of at least two subkernels.
+
+    np.linalg.LinAlgError
+        If any of the covariance matrices is not positive definite.
+
     """
     if len(ast.children) < 2:
-        raise RuntimeError
+        raise RuntimeError('Only kernels made of at least two subkernels can be ranked.')
+
+    model = instantiate_model_from_ast(x, y, ast, params=params, noise_weights=noise_weights)
+    sub_kernels = [child for child in model.kern.children.values() if isinstance(child, gpflow.kernels.Kernel)]
 
-    model = instantiate_model_from_ast(x, y, ast, params=params)
-    sub_kernels = list(model.kern.children.values())
+    x, y = model.X.read_value(), model.Y.read_value()
+    grams = [compile_kernel(sub_kernel)(x) for sub_kernel in sub_kernels]
+    covariance = sum(grams) + np.diag(get_noise_variances(model))
+
+    # The first covariance is the one of the full model, followed by one for each left out subkernel. They are only
+    # formed batch by batch, such that at most `batch_size` of them are held in memory.
+    n_covariances, batch_size = len(grams) + 1, max(1, _RANK_BATCH_BYTES // covariance.nbytes)
+    negative_log_likelihoods = np.concatenate([
+        _batched_negative_log_likelihood(np.stack([covariance - grams[j - 1] if j else covariance for j in range(i, min(i + batch_size, n_covariances))]), y)
+        for i in range(0, n_covariances, batch_size)
+    ])
 
     ranked_subexpressions = []
-    for i in range(len(sub_kernels)):
-        kernel = gpflow.kernels.Sum(sub_kernels[:i] + sub_kernels[i + 1:])
-        model = instantiate_model_from_kernel(x, y, kernel)
-        score_impact = abs(model_score - score_model(model))
-
-        cur_subkernel = sub_kernels[i]
-        if isinstance(cur_subkernel, (gpflow.kernels.Product, gpflow.kernels.Sum)):
-            sub_kernel_names = [child.full_name for child in kernel_to_ast(sub_kernels[i]).children]
+    for i, sub_kernel in enumerate(sub_kernels):
+        score_impact = abs(negative_log_likelihoods[0] - negative_log_likelihoods[i + 1])
+
+        if isinstance(sub_kernel, (gpflow.kernels.Product, gpflow.kernels.Sum)):
+            sub_kernel_names = [child.full_name for child in kernel_to_ast(sub_kernel).children]
         else:
-            sub_kernel_names = [kernel_to_ast(sub_kernels[i]).full_name]
+            sub_kernel_names = [kernel_to_ast(sub_kernel).full_name]
         ranked_subexpressions += [(score_impact, sorted(sub_kernel_names))]
 
     return model_score, sorted(ranked_subexpressions, reverse=True)
+
+
+def _batched_negative_log_likelihood(covariances: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Calculate the negative log likelihood of `y` under zero mean normal distributions, in a batched Cholesky decomposition.
+
+    Parameters
+    ----------
+    covariances: np.ndarray
+        Covariance matrices of shape `(b, n, n)`.
+
+    y: np.ndarray
+        Observations of shape `(n, 1)`.
+
+    Returns
+    -------
+    negative_log_likelihoods: np.ndarray
+        Negative log likelihood of `y` under each covariance matrix, of shape `(b,)`.
+
+    """
+    lower_choleskies = np.linalg.cholesky(covariances)
+    negative_log_likelihoods = np.empty(covariances.shape[0])
+    for i, lower_cholesky in enumerate(lower_choleskies):
+        z = solve_triangular(lower_cholesky, y, lower=True)
+        log_determinant = 2 * np.sum(np.log(np.diag(lower_cholesky)))
+        negative_log_likelihoods[i] = 0.5 * (np.sum(z ** 2) + log_determinant + y.shape[0] * np.log(2 * np.pi))
+    return negative_log_likelihoods
@@ -2,9 +2,8 @@
 from copy import deepcopy
 
 from anytree import Node
-import gpflow
 
-from ._transform import ast_to_kernel, kernel_to_ast
+from .._kernels import COMBINATION_KERNELS, kernel_name
 
 
 def simplify(node: Node) -> Node:
@@ -48,7 +47,8 @@ def distribute(node: Node) -> Node:
     """
     copied_node = deepcopy(node)
     _distribute(copied_node)
-    return kernel_to_ast(ast_to_kernel(copied_node))
+    _flatten(copied_node)
+    return copied_node
 
 
 def _distribute(node: Node) -> None:
@@ -68,22 +68,22 @@ def _distribute(node: Node) -> None:
     if node.is_leaf:
         return
 
-    if node.name is gpflow.kernels.Product:
+    if kernel_name(node.name) == 'product':
         # Search on own level (only `node`) and on children, frist result will be distributed.
-        sum_to_distribute = [child for child in node.children if child.name is gpflow.kernels.Sum]
+        sum_to_distribute = [child for child in node.children if kernel_name(child.name) == 'sum']
         if sum_to_distribute:
             sum_to_distr = sum_to_distribute[0]
             children_to_distribute_to = [child for child in node.children if child is not sum_to_distr]
 
-            node.name = gpflow.kernels.Sum
+            node.name = COMBINATION_KERNELS['sum']
             node.full_name = 'Sum'
             node.children = []
 
             for child in sum_to_distr.children:
-                new_prod = Node(gpflow.kernels.Product, full_name='Product', parent=node)
+                new_prod = Node(COMBINATION_KERNELS['product'], full_name='Product', parent=node)
 
                 new_kids = [deepcopy(child) for child in children_to_distribute_to]
-                if child.name is gpflow.kernels.Product:
+                if kernel_name(child.name) == 'product':
                     # Child to distribute to is a `Product`, doing nothing would lead to two nested products.
                     new_kids.extend([deepcopy(child) for child in child.children])
                 else:
@@ -95,6 +95,29 @@ def _distribute(node: Node) -> None:
         _distribute(child)
 
 
+def _flatten(node: Node) -> None:
+    """Flatten sums of sums and products of products, as gpflow does when combining kernels.
+
+    Works inplace on provided node. Nodes without a `full_name` are named after their kernel class.
+
+    Parameters
+    ----------
+    node: Node
+        Node of the AST of a kernel that potentially contains nested sums or products.
+
+    """
+    if not hasattr(node, 'full_name'):
+        node.full_name = node.name.__name__
+
+    for child in node.children:
+        _flatten(child)
+
+    if not node.is_leaf:
+        node.children = [grandchild
+                         for child in node.children
+                         for grandchild in (child.children if child.name is node.name else [child])]
+
+
 def merge_rbfs(node: Node) -> Node:
     """Merge RBFs that are part of one product.
 
@@ -128,9 +151,9 @@ def _merge_rbfs(node: Node) -> None:
     if node.is_leaf:
         return
 
-    if node.name is gpflow.kernels.Product:
-        rbf_children = [child for child in node.children if child.name is gpflow.kernels.RBF]
-        other_children = [child for child in node.children if child.name is not gpflow.kernels.RBF]
+    if kernel_name(node.name) == 'product':
+        rbf_children = [child for child in node.children if kernel_name(child.name) == 'rbf']
+        other_children = [child for child in node.children if kernel_name(child.name) != 'rbf']
 
         new_kids = other_children + rbf_children[:1]
         if len(new_kids) == 1:
@@ -194,12 +217,12 @@ def _replace_white_products(node: Node) -> None:
     if node.is_leaf:
         return
 
-    if node.name is gpflow.kernels.Product:
-        white_children = [child for child in node.children if child.name is gpflow.kernels.White]
+    if kernel_name(node.name) == 'product':
+        white_children = [child for child in node.children if kernel_name(child.name) == 'white']
         if white_children:
             non_stationary_children = [child
                                        for child in node.children
-                                       if child.name in [gpflow.kernels.Linear, gpflow.kernels.Polynomial]]
+                                       if kernel_name(child.name) in ['linear', 'polynomial']]
             new_kids = [white_children[0]] + non_stationary_children
             if len(new_kids) == 1:
                 if node.is_root:
@@ -1,17 +1,42 @@
-"""Module to transform a kernel from one representation to another."""
+"""Module to transform a kernel from one representation to another.
+
+Only transformations from and to gpflow kernels need gpflow, it is imported lazily by them. ASTs restored by
+`dict_to_ast` resolve their kernel classes on first access, such that loading and printing them does not import it.
+
+"""
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, TYPE_CHECKING, Union
 
 from anytree import Node
-import gpflow
 
-from .._kernels import BASE_KERNELS, COMBINATION_KERNELS
+from .._kernels import BASE_KERNELS, COMBINATION_KERNELS, kernel_name
+
+if TYPE_CHECKING:  # pragma: no cover
+    import gpflow
 
 
 _LOGGER = logging.getLogger(__package__)
 
 
-def kernel_to_ast(kernel: gpflow.kernels.Kernel, parent: Optional[Node]=None) -> Node:
+class _LazyKernelNode(Node):
+    """Node of an AST, holding the name of its kernel until its kernel class is accessed as `name`."""
+
+    @property
+    def name(self) -> type:
+        if self._kernel_class is None:
+            kernels = BASE_KERNELS if self._kernel_name in BASE_KERNELS else COMBINATION_KERNELS
+            self._kernel_class = kernels[self._kernel_name]
+        return self._kernel_class
+
+    @name.setter
+    def name(self, kernel: Union[str, type]) -> None:
+        if isinstance(kernel, str):
+            self._kernel_name, self._kernel_class = kernel, None
+        else:
+            self._kernel_name, self._kernel_class = kernel_name(kernel), kernel
+
+
+def kernel_to_ast(kernel: 'gpflow.kernels.Kernel', parent: Optional[Node]=None) -> Node:
     """Generate an AST (abstract syntax tree) of a kernel.
 
     This method can be useful to generate an AST of a kernel,
@@ -45,7 +70,7 @@ def kernel_to_ast(kernel: gpflow.kernels.Kernel, parent: Optional[Node]=None) ->
     return n
 
 
-def ast_to_kernel(node: Node, build=False) -> gpflow.kernels.Kernel:
+def ast_to_kernel(node: Node, build=False) -> 'gpflow.kernels.Kernel':
     """Generate a kernel from an AST.
 
     The AST must be generated by `kernel_to_ast`.
@@ -64,6 +89,8 @@ def ast_to_kernel(node: Node, build=False) -> gpflow.kernels.Kernel:
         A kernel generated by executing the passed AST.
 
     """
+    import gpflow
+
     if node.is_leaf:
         if build:
             return node.name(1)
@@ -89,14 +116,84 @@ def ast_to_text(node: Node) -> str:
         String representation of passed kernel.
 
     """
-    if node.name is gpflow.kernels.Sum:
+    if _node_kernel_name(node) == 'sum':
         sum_str = ' + '.join(sorted(ast_to_text(child) for child in node.children))
-        if node.parent is not None and node.parent.name is gpflow.kernels.Product:
+        if node.parent is not None and _node_kernel_name(node.parent) == 'product':
             # Parent is a product, so we need brackets.
             return f'({sum_str})'
         return sum_str
 
-    if node.name is gpflow.kernels.Product:
+    if _node_kernel_name(node) == 'product':
         return ' * '.join(sorted(ast_to_text(child) for child in node.children))
 
-    return node.name.__name__.lower()
+    return _node_kernel_name(node)
+
+
+def ast_to_dict(node: Node) -> Dict[str, Any]:
+    """Generate a structured, JSON serializable representation of an AST.
+
+    Unlike `ast_to_text`, this representation keeps the exact structure of the AST, i.e., order and nesting
+    of children, as well as the `full_name` of each node, so that `dict_to_ast` can restore it exactly.
+
+    Parameters
+    ----------
+    node: Node
+        Node of AST. Representation will be generated from this node down.
+
+    Returns
+    -------
+    representation: Dict[str, Any]
+        Representation of the form `{'kernel': kernel_name, 'full_name': full_name, 'children': [...]}`,
+        with `kernel_name` being a key of `BASE_KERNELS` or `COMBINATION_KERNELS`.
+
+    """
+    return {
+        'kernel': _node_kernel_name(node),
+        'full_name': getattr(node, 'full_name', None),
+        'children': [ast_to_dict(child) for child in node.children],
+    }
+
+
+def dict_to_ast(representation: Dict[str, Any], parent: Optional[Node]=None) -> Node:
+    """Generate an AST from its structured representation, as generated by `ast_to_dict`.
+
+    Kernel classes of the nodes are only resolved, thereby importing gpflow, once they are accessed.
+
+    Parameters
+    ----------
+    representation: Dict[str, Any]
+        Structured representation of an AST.
+
+    parent: Optional[Node]
+        Parent the nodes should be attached to.
+
+    Returns
+    -------
+    root: Node
+        Root of generated AST.
+
+    Raises
+    ------
+    ValueError
+        If the representation contains unknown kernels.
+
+    """
+    if representation['kernel'] not in BASE_KERNELS and representation['kernel'] not in COMBINATION_KERNELS:
+        _LOGGER.exception(f'Unknown kernel `{representation["kernel"]}`, available are `{[*BASE_KERNELS, *COMBINATION_KERNELS]}`.')
+        raise ValueError(f'Unknown kernel `{representation["kernel"]}`.')
+
+    node = _LazyKernelNode(representation['kernel'], parent=parent)
+    if representation.get('full_name') is not None:
+        node.full_name = representation['full_name']
+
+    for child in representation.get('children', []):
+        dict_to_ast(child, parent=node)
+
+    return node
+
+
+def _node_kernel_name(node: Node) -> str:
+    """Get name of the kernel of a node, without resolving the kernel class of nodes restored by `dict_to_ast`."""
+    if isinstance(node, _LazyKernelNode):
+        return node._kernel_name
+    return kernel_name(node.name)
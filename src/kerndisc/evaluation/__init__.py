@@ -1,7 +1,13 @@
 r"""Package to evaluate performance of kernels.
 
 This package provides:
-    * The `evaluate_asts` method, which builds kernels from ASTs, then trains and scores them.
+    * The `evaluate_asts` method, which builds kernels from ASTs, then trains and scores them,
+    * the `make_tolerance_schedule` method, which creates per depth optimizer options for `discover`,
+    * executors, which evaluate kernels serially (`SerialExecutor`), in processes (`ProcessExecutor`), on workers on
+      other hosts (`RemoteExecutor`, served by `serve_evaluation_worker`) or in threads (`ThreadExecutor`), which
+      is not safe as threads share global settings of gpflow,
+    * the `make_json_lines_hook` and `make_prometheus_textfile_hook` methods, which create hooks for `discover`
+      that export information about each kernels evaluation, e.g., timings and optimizer iterations.
 
 Example
 -------
@@ -9,10 +15,21 @@ To evaluate ASTs run:
 ```
     > from kerndisc.description import pretty_ast
     > from kerndisc.evaluation import evaluate_asts
-    > for ast, model_params, score in evaluate_asts(X, Y, asts):
+    > for ast, model_params, score, evaluation_info in evaluate_asts(X, Y, asts):
     >     print(f'Ast\n`{pretty_ast(ast)}`\nhas scored `{score:.2f}`.')
 ```
 
+The optimizer can be configured via `optimizer_kwargs`, e.g., to trade accuracy for throughput:
+```
+    > evaluate_asts(X, Y, asts, optimizer_kwargs={'method': 'L-BFGS-B', 'maxiter': 100, 'gtol': 1e-3})
+```
+
+To evaluate ASTs on workers on other hosts, each started by `serve_evaluation_worker(('0.0.0.0', 6000))`, run:
+```
+    > with RemoteExecutor([('host-1', 6000), ('host-2', 6000)]) as executor:
+    >     evaluate_asts(X, Y, asts, executor=executor)
+```
+
 The models/kernels performance is then scored by the selected metric, which can be set via the environment
 variable `METRIC`. See the `scoring` package for more on this. Default metric is an altered version of
 the bayesian information criterion.
@@ -20,7 +37,20 @@ the bayesian information criterion.
 """
 
 from ._evaluate import evaluate_asts
+from ._executors import Executor, ProcessExecutor, SerialExecutor, ThreadExecutor
+from ._hooks import make_json_lines_hook, make_prometheus_textfile_hook
+from ._optimize import make_tolerance_schedule
+from ._remote import RemoteExecutor, serve_evaluation_worker
 
 __all__ = [
     'evaluate_asts',
+    'Executor',
+    'make_json_lines_hook',
+    'make_prometheus_textfile_hook',
+    'make_tolerance_schedule',
+    'ProcessExecutor',
+    'RemoteExecutor',
+    'SerialExecutor',
+    'serve_evaluation_worker',
+    'ThreadExecutor',
 ]
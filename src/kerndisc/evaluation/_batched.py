@@ -0,0 +1,146 @@
+"""Module to optimize many GPR models on the same data jointly, as a single batched model.
+
+Candidate kernels of a depth share `x` and `y` and only differ by structure. For small series the cost of
+optimizing each of them is dominated by per model overhead, i.e., one tensorflow graph and one `session.run`
+per step of each optimization, not by the `O(n^3)` Cholesky decompositions. `BatchedGPR` stacks the Gram
+matrices of all candidates into a `(b, n, n)` tensor, such that Cholesky decompositions and solves of all of
+them run as single batched operations, and sums their log likelihoods into a single objective.
+
+The likelihoods of the candidates share no parameters, so the gradient of the summed objective with respect to
+the parameters of a candidate is the gradient of its own likelihood. Optimizing the summed objective therefore
+optimizes all candidates at once, albeit with a common stopping criterion.
+
+"""
+from typing import List, Optional
+
+from anytree import Node
+import gpflow
+import numpy as np
+import tensorflow as tf
+
+from ..description import ast_to_kernel
+
+
+class BatchedGPR(gpflow.models.Model):
+    """Independent GPR models with the same data, whose log likelihood is the sum of their log likelihoods.
+
+    Each model has its own kernel and likelihood variance. Noise weights are shared by all of them, see
+    `kerndisc.description.instantiate_model_from_kernel`.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        Function input values `x_1, ..., x_n`, usually time points.
+
+    y: np.ndarray
+        Observed function values `y_1, ..., y_n`.
+
+    kernels: List[gpflow.kernels.Kernel]
+        Kernel of each model.
+
+    noise_weights: Optional[np.ndarray]
+        Weights of the noise variance of each point, homoscedastic noise if `None`.
+
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, kernels: List[gpflow.kernels.Kernel], noise_weights: Optional[np.ndarray]=None,
+                 **kwargs) -> None:
+        super().__init__(**kwargs)
+        noise_weights = np.ones(x.shape[0]) if noise_weights is None else noise_weights
+        self.X = gpflow.params.DataHolder(x)
+        self.Y = gpflow.params.DataHolder(y)
+        self.kerns = gpflow.params.ParamList(kernels)
+        self.variances = gpflow.Param(np.ones(len(kernels)), transform=gpflow.transforms.positive)
+        self._noise_weights = np.asarray(noise_weights, dtype=gpflow.settings.float_type).reshape(-1)
+
+    @property
+    def batch_size(self) -> int:
+        return len(self.kerns)
+
+    @gpflow.params_as_tensors
+    def _build_candidate_likelihoods(self) -> tf.Tensor:
+        grams = tf.stack([kern.K(self.X) for kern in self.kerns])
+        noise = self.variances[:, None] / self._noise_weights[None, :]
+        choleskys = tf.cholesky(grams + tf.matrix_diag(noise))
+        z = tf.matrix_triangular_solve(choleskys, tf.tile(self.Y[None], [self.batch_size, 1, 1]), lower=True)
+        n = tf.cast(tf.shape(self.X)[0], gpflow.settings.float_type)
+        log_determinants = 2 * tf.reduce_sum(tf.log(tf.matrix_diag_part(choleskys)), axis=1)
+        return -0.5 * (tf.reduce_sum(tf.square(z), axis=[1, 2]) + log_determinants + n * np.log(2 * np.pi))
+
+    @gpflow.name_scope('likelihood')
+    def _build_likelihood(self) -> tf.Tensor:
+        return tf.reduce_sum(self._build_candidate_likelihoods())
+
+    @gpflow.autoflow()
+    def compute_candidate_log_likelihoods(self) -> tf.Tensor:
+        """Compute the log likelihood of each model, at the current parameters, as array of shape `(b,)`."""
+        return self._build_candidate_likelihoods()
+
+
+def build_batched_model(asts: List[Node], models: List[gpflow.models.GPR], noise_weights: Optional[np.ndarray]=None,
+                        noise_floor: Optional[float]=None) -> BatchedGPR:
+    """Build a batched model of GPR models with the same data, starting from their current parameters.
+
+    Parameters
+    ----------
+    asts: List[Node]
+        AST of the kernel of each model.
+
+    models: List[gpflow.models.GPR]
+        Models, e.g., as built by `kerndisc.evaluation._util.build_model` from `asts`.
+
+    noise_weights: Optional[np.ndarray]
+        Weights of the noise variance of each point, the ones `models` were built with.
+
+    noise_floor: Optional[float]
+        Lower bound of the likelihood variance of each model, see `build_model`.
+
+    Returns
+    -------
+    batched_model: BatchedGPR
+        Compiled batched model.
+
+    """
+    with gpflow.defer_build():
+        # Kernels can only belong to a single model, so the batched model gets kernels of its own.
+        kernels = [ast_to_kernel(ast) for ast in asts]
+        batched_model = BatchedGPR(models[0].X.read_value(), models[0].Y.read_value(), kernels, noise_weights=noise_weights)
+
+    if noise_floor is not None:
+        batched_model.variances.transform = gpflow.transforms.Log1pe(lower=noise_floor)
+    batched_model.compile()
+
+    copy_params(models, batched_model, to_batched=True)
+    return batched_model
+
+
+def copy_params(models: List[gpflow.models.GPR], batched_model: BatchedGPR, to_batched: bool) -> None:
+    """Copy parameters between GPR models and a batched model of them, matching kernel parameters by position.
+
+    Parameters
+    ----------
+    models: List[gpflow.models.GPR]
+        Models the batched model was built from.
+
+    batched_model: BatchedGPR
+        Batched model of `models`.
+
+    to_batched: bool
+        Whether to copy parameters of `models` to `batched_model`, otherwise the other way around.
+
+    """
+    variances = np.array(batched_model.variances.read_value())
+    batched_params = {}
+    for i, (model, batched_kernel) in enumerate(zip(models, batched_model.kerns)):
+        pairs = list(zip(model.kern.parameters, batched_kernel.parameters))
+        if to_batched:
+            batched_params.update({batched_param.pathname: param.read_value() for param, batched_param in pairs})
+            variances[i] = model.likelihood.variance.read_value()
+        else:
+            model.assign({
+                **{param.pathname: batched_param.read_value() for param, batched_param in pairs},
+                model.likelihood.variance.pathname: variances[i],
+            })
+
+    if to_batched:
+        batched_model.assign({**batched_params, batched_model.variances.pathname: variances})
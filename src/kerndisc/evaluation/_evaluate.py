@@ -1,24 +1,50 @@
 """Module to evaluate performance of a kernel expression."""
+import cProfile
 import logging
 import os
-from typing import Callable, Dict, Generator, List, Tuple
+import time
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
 from anytree import Node
 import gpflow
 import numpy as np
 import tensorflow as tf
 
-from ._util import add_jitter_to_model
-from .scoring import score_model, SELECTED_METRIC_NAME
-from ..description import ast_to_kernel, pretty_ast
-
-
-_CORES = int(os.environ.get('CORES', 1))
+from ._batched import build_batched_model, copy_params
+from ._gram_cache import cache_grams, choose_initial_params
+from ._optimize import make_optimizer
+from ._tasks import EvaluationData, EvaluationResult, EvaluationTask
+from ._util import add_jitter_to_model, build_model, get_peak_rss_kb
+from .scoring import get_parameter_count_ast, score_model
+from .._config import Config
+from ..description import ast_to_dict, ast_to_text, pretty_ast
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._executors import Executor
+
+
+_BATCH_SIZE = int(os.environ.get('EVALUATION_BATCH_SIZE', 1))
+_FLOAT32 = 'float32'
+_FLOAT64 = 'float64'
+_FLOAT_TYPES = {
+    _FLOAT32: np.float32,
+    _FLOAT64: np.float64,
+}
+_FLOAT32_NOISE_FLOOR = float(os.environ.get('FLOAT32_NOISE_FLOOR', 1e-4))
+_JITTER_LADDER = [1e-6, 1e-4, 1e-2]
+_MAX_BATCHED_POINTS = int(os.environ.get('MAX_BATCHED_POINTS', 1000))
+_MAX_CHOLESKY_RETRIES = int(os.environ.get('MAX_CHOLESKY_RETRIES', 5))
+_RETRY_NOISE_FLOOR = 1e-2
 _LOGGER = logging.getLogger(__package__)
 
 
-def evaluate_asts(x: np.ndarray, y: np.ndarray, asts: List[Node],
-                  add_jitter: bool=True) -> Generator[Tuple[Node, Dict[str, np.ndarray], float], None, None]:
+def evaluate_asts(x: np.ndarray, y: np.ndarray, asts: List[Node], add_jitter: bool=True,
+                  optimizer_kwargs: Optional[Dict[str, Any]]=None, profile_candidates: bool=False,
+                  config: Optional[Config]=None, noise_weights: Optional[np.ndarray]=None, precision: str='float64',
+                  parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]=None,
+                  max_cholesky_retries: int=_MAX_CHOLESKY_RETRIES,
+                  batch_size: Optional[int]=None,
+                  executor: Optional['Executor']=None) -> Generator[Tuple[Node, Dict[str, np.ndarray], float, Dict[str, Any]], None, None]:
     """Score kernels, represented as ASTs, on data.
 
     It does so by:
@@ -42,21 +68,122 @@ def evaluate_asts(x: np.ndarray, y: np.ndarray, asts: List[Node],
     add_jitter: bool
         Whether to add jitter (small randomness) to each models parameters after building it.
 
+    optimizer_kwargs: Optional[Dict[str, Any]]
+        Configuration of the optimizer, e.g., `method`, `maxiter`, `gtol` and `ftol`. See `make_optimizer` of
+        the `_optimize` module for all options. Default is `L-BFGS-B` optimizing until convergence.
+
+    profile_candidates: bool
+        Whether to profile the evaluation of each kernel using `cProfile`. If set, the `cProfile.Profile`
+        of each evaluation is added to its `evaluation_info` as `profile`.
+
+    config: Optional[Config]
+        Configuration selecting the metric, read from the environment if `None`.
+
+    noise_weights: Optional[np.ndarray]
+        Weights of the noise variance of each point, e.g., as returned by `kerndisc.reduce_data`.
+        Homoscedastic noise if `None`.
+
+    precision: str
+        Float type to evaluate kernels at. At `float32` Gram matrices and Cholesky decompositions take half the
+        memory and are faster, a floor on the likelihood variance is added as jitter. Kernels whose Cholesky
+        decomposition fails at `float32` are evaluated again at `float64`.
+
+    parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]
+        Optimized parameters of the parent of each kernel, by text of the kernel, e.g., the kernel it was expanded from.
+        Optimization of a kernel starts from the parameters of its parent, if they are more likely than the initial ones.
+        Likelihoods of both are computed from Gram matrices cached when the parent was evaluated, see `_gram_cache`.
+
+    max_cholesky_retries: int
+        Maximum number of retries at `float64` for kernels whose Cholesky decomposition fails, instead of scoring them
+        `np.Inf` right away. Kernels are retried with increasing jitter on the diagonal of their covariance matrix, then
+        starting from the parameters of their parent in `parent_params`, then with a floor on their likelihood variance.
+        Defaults to environment variable `MAX_CHOLESKY_RETRIES`.
+
+    batch_size: Optional[int]
+        Number of kernels to optimize jointly, as a single model whose Gram matrices are stacked, such that Cholesky
+        decompositions and solves of all of them run batched, see `_batched`. This saves per kernel overhead, which
+        dominates for small series, so batching is only done for at most `MAX_BATCHED_POINTS` (default `1000`) points.
+        If Cholesky decomposition fails for a batch, its kernels are evaluated one by one. Batching is not done while
+        profiling candidates. Read from the environment variable `EVALUATION_BATCH_SIZE` if `None`, `1` (default)
+        evaluates kernels one by one.
+
+    executor: Optional[Executor]
+        Executor to evaluate kernels with, e.g., in other processes or on other hosts, see `_executors` and `_remote`.
+        Kernels are then yielded in order of completion, neither batched nor profiled. Evaluated in this process if `None`.
+
     Returns
     -------
-    score_generator: Generator[Tuple[Node, Dict[str, np.ndarray], float], None, None]
-        Yield `ast, model_params, score` for each AST initially passed to `evaluate_asts`.
+    score_generator: Generator[Tuple[Node, Dict[str, np.ndarray], float, Dict[str, Any]], None, None]
+        Yield `ast, model_params, score, evaluation_info` for each AST initially passed to `evaluate_asts`.
+        `evaluation_info` contains:
+            * `method`, `iterations` and `function_evaluations` of the optimizer,
+            * `build_time`, `optimization_time` and `scoring_time` in seconds,
+            * `cholesky_failed`, whether optimization failed due to a failing Cholesky decomposition, after all retries,
+            * `cholesky_retries` and `retry_strategy`, the number of retries and the strategy of the last one, if any,
+            * `warm_started`, whether optimization started from the parameters of the kernels parent,
+            * `precision`, the float type the kernel was evaluated at, and `precision_fallback`, whether
+              it had to be evaluated again at `float64`,
+            * `peak_rss_delta_kb`, by how much evaluation raised the peak resident set size of the process,
+            * `worker_id`, the process id of the process that evaluated the kernel,
+            * `batch_size`, the number of kernels optimized jointly with it, if it was optimized in a batch.
+              Timings are then its share of the timings of the batch, optimizer information is that of the batch.
 
     """
-    evaluate_ast = _make_evaluator(x, y, add_jitter)
-
-    for n_optimized, ast in enumerate(asts):
-        optimized_model, score = evaluate_ast(ast)
-        yield ast, optimized_model.read_values(), score
-        _LOGGER.info(f'`({n_optimized + 1}/{len(asts)})` `{SELECTED_METRIC_NAME}` score was `{score:.3f}` for:\n{pretty_ast(ast)}')
-
-
-def _make_evaluator(x: np.ndarray, y: np.ndarray, add_jitter: bool) -> Callable:
+    config = config or Config.from_environment()
+    evaluate_ast = _make_evaluator(x, y, add_jitter, optimizer_kwargs=optimizer_kwargs, config=config, noise_weights=noise_weights,
+                                   precision=precision, parent_params=parent_params, max_cholesky_retries=max_cholesky_retries)
+
+    batch_size = batch_size or _BATCH_SIZE
+    if executor is not None:
+        options = {'add_jitter': add_jitter, 'optimizer_kwargs': optimizer_kwargs, 'config': config, 'precision': precision,
+                   'max_cholesky_retries': max_cholesky_retries}
+        evaluations = _evaluate_with_executor(executor, EvaluationData(x, y, noise_weights), asts, options, parent_params)
+    elif batch_size > 1 and x.shape[0] <= _MAX_BATCHED_POINTS and not profile_candidates:
+        evaluate_batch = _make_batch_evaluator(x, y, add_jitter, evaluate_ast, optimizer_kwargs=optimizer_kwargs, config=config,
+                                               noise_weights=noise_weights, precision=precision, parent_params=parent_params)
+        evaluations = _read_params(zip(asts, (evaluation for start in range(0, len(asts), batch_size)
+                                              for evaluation in evaluate_batch(asts[start:start + batch_size]))))
+    else:
+        evaluations = _read_params((ast, _evaluate_profiled(evaluate_ast, ast) if profile_candidates else evaluate_ast(ast)) for ast in asts)
+
+    for n_optimized, (ast, (model_params, score, evaluation_info)) in enumerate(evaluations):
+        yield ast, model_params, score, evaluation_info
+        _LOGGER.info(f'`({n_optimized + 1}/{len(asts)})` `{config.metric}` score was `{score:.3f}` after '
+                     f'`{evaluation_info["iterations"]}` iterations in `{evaluation_info["optimization_time"]:.3f}s` for:\n{pretty_ast(ast)}')
+
+
+def _read_params(evaluations: Iterable[Tuple[Node, Tuple[gpflow.models.GPR, float, Dict[str, Any]]]]) -> Iterator[Tuple[Node, EvaluationResult]]:
+    """Replace the optimized model of each evaluation by its parameters."""
+    for ast, (optimized_model, score, evaluation_info) in evaluations:
+        yield ast, (optimized_model.read_values(), score, evaluation_info)
+
+
+def _evaluate_with_executor(executor: 'Executor', data: EvaluationData, asts: List[Node], options: Dict[str, Any],
+                            parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]) -> Iterator[Tuple[Node, EvaluationResult]]:
+    """Evaluate kernels using an executor, yielding each AST with its result in order of completion."""
+    fingerprint = data.fingerprint()
+    tasks = []
+    for ast in asts:
+        kernel_name = ast_to_text(ast)
+        kernel_parent_params = {kernel_name: parent_params[kernel_name]} if parent_params and kernel_name in parent_params else None
+        tasks.append(EvaluationTask(fingerprint, ast_to_dict(ast), {**options, 'parent_params': kernel_parent_params}))
+
+    for i, result in executor.evaluate(data, tasks):
+        yield asts[i], result
+
+
+def _evaluate_profiled(evaluate_ast: Callable, ast: Node) -> Tuple[gpflow.models.GPR, float, Dict[str, Any]]:
+    """Evaluate a kernel using `cProfile`, adding the `cProfile.Profile` of its evaluation to its `evaluation_info` as `profile`."""
+    profile = cProfile.Profile()
+    optimized_model, score, evaluation_info = profile.runcall(evaluate_ast, ast)
+    evaluation_info['profile'] = profile
+    return optimized_model, score, evaluation_info
+
+
+def _make_evaluator(x: np.ndarray, y: np.ndarray, add_jitter: bool, optimizer_kwargs: Optional[Dict[str, Any]]=None,
+                    config: Optional[Config]=None, noise_weights: Optional[np.ndarray]=None, precision: str='float64',
+                    parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]=None,
+                    max_cholesky_retries: int=_MAX_CHOLESKY_RETRIES) -> Callable:
     """Make evaluator that builds, optimizes and scores a single kernel.
 
     Wrapper that makes `x`, `y` available to `_evaluator`, eliminating the need to
@@ -76,15 +203,87 @@ def _make_evaluator(x: np.ndarray, y: np.ndarray, add_jitter: bool) -> Callable:
     add_jitter: bool
         Whether to add a little bit of randomness to each models parameters.
 
+    optimizer_kwargs: Optional[Dict[str, Any]]
+        Configuration of the optimizer, see `make_optimizer`.
+
+    config: Optional[Config]
+        Configuration selecting the metric, read from the environment if `None`.
+
+    noise_weights: Optional[np.ndarray]
+        Weights of the noise variance of each point, homoscedastic noise if `None`.
+
+    precision: str
+        Float type to evaluate kernels at, `float32` or `float64`.
+
+    parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]
+        Parameters of the parent of each kernel, by text of the kernel, to warm start optimization from if they are more
+        likely than the initial ones, and to retry from if Cholesky decomposition fails.
+
+    max_cholesky_retries: int
+        Maximum number of retries at `float64` if Cholesky decomposition fails.
+
     Returns
     -------
     _evaluator: Callable
         Evaluates a kernel AST passed to it.
 
+    Raises
+    ------
+    ValueError
+        If `precision` is unknown.
+
     """
-    optimizer = gpflow.train.ScipyOptimizer()
+    optimize = make_optimizer(optimizer_kwargs)
+    config = config or Config.from_environment()
+    if precision not in _FLOAT_TYPES:
+        _LOGGER.exception(f'Unknown precision `{precision}`, available are: `{list(_FLOAT_TYPES)}`.')
+        raise ValueError(f'Unknown precision `{precision}`.')
+
+    def _evaluate_ast(ast: Node) -> Tuple[gpflow.models.GPR, float, Dict[str, Any]]:
+        """Build, optimize and score a single kernel, retrying with increasingly robust settings if Cholesky decomposition fails.
+
+        Attempts are made in the following order, until one succeeds:
+            * At `precision`,
+            * at `float64`, if `precision` is lower,
+            * with increasing jitter on the diagonal of the covariance matrix, see `_JITTER_LADDER`,
+            * starting from the parameters of the kernels parent, if known, keeping the largest jitter,
+            * with the likelihood variance bounded below by `_RETRY_NOISE_FLOOR`.
+        At most `max_cholesky_retries` attempts are made after evaluating at `float64`.
+
+        Parameters
+        ----------
+        ast: Node
+            AST that represents a kernel to be evaluated.
 
-    def _evaluate_ast(ast: Node) -> float:
+        Returns
+        -------
+        model, score, evaluation_info: Tuple[gpflow.models.gpr.GPR, float, Dict[str, Any]]
+            See `_evaluate_ast_once`, for the last attempt. `evaluation_info` additionally contains `precision_fallback`,
+            whether the kernel was evaluated again at `float64`, `cholesky_retries`, the number of attempts after the first,
+            not counting the fallback to `float64`, and `retry_strategy`, the attempt that succeeded or was made last.
+            `optimization_time` is summed over all attempts.
+
+        """
+        kernel_parent_params = parent_params.get(ast_to_text(ast)) if parent_params else None
+        optimization_time = 0.
+
+        for n_retries, (retry_strategy, attempt) in enumerate(_make_attempts(precision, kernel_parent_params, max_cholesky_retries)):
+            model, score, evaluation_info = _evaluate_ast_once(ast, **attempt)
+            optimization_time += evaluation_info['optimization_time']
+            if not evaluation_info['cholesky_failed']:
+                break
+            _LOGGER.debug(f'Cholesky decomposition failed with retry strategy `{retry_strategy or "none"}`:\n{pretty_ast(ast)}.')
+
+        evaluation_info['optimization_time'] = optimization_time
+        evaluation_info['precision_fallback'] = evaluation_info['precision'] != precision
+        # The evaluation at `float64` after a lower `precision` is a fallback, not a retry.
+        evaluation_info['cholesky_retries'] = n_retries - int(evaluation_info['precision_fallback'])
+        evaluation_info['retry_strategy'] = retry_strategy
+        return model, score, evaluation_info
+
+    def _evaluate_ast_once(ast: Node, precision: str, noise_floor: Optional[float]=None, jitter: float=0.,
+                           params: Optional[Dict[str, np.ndarray]]=None,
+                           warm_start_params: Optional[Dict[str, np.ndarray]]=None) -> Tuple[gpflow.models.GPR, float, Dict[str, Any]]:
         """Build, optimize and score a single kernel.
 
         If Cholesky decomposition for optimization is not successfull,
@@ -95,31 +294,194 @@ def _make_evaluator(x: np.ndarray, y: np.ndarray, add_jitter: bool) -> Callable:
         This results in `tf.all_variables` growing over time, slowing
         down performance immensely.
 
+        If the optimizer reports its final objective value, it is passed on
+        to the metric instead of recomputing the log likelihood. Kernels built
+        from ASTs carry no priors, so the objective equals the negative log
+        likelihood.
+
         Parameters
         ----------
         ast: Node
             AST that represents a kernel to be evaluated. This can be
             any part of the tree, but should usually be its root.
 
+        precision: str
+            Float type to build the model with, `float32` or `float64`.
+
+        noise_floor: Optional[float]
+            Lower bound of the likelihood variance, see `build_model`.
+
+        jitter: float
+            Fixed variance added to the diagonal of the covariance matrix.
+
+        params: Optional[Dict[str, np.ndarray]]
+            Parameters to start optimization from, e.g., of the kernels parent. If passed, no randomness is added.
+
+        warm_start_params: Optional[Dict[str, np.ndarray]]
+            Parameters of the kernels parent, to start optimization from where they are shared with the kernel,
+            see `choose_initial_params`. Whether they were is added to `evaluation_info` as `warm_started`.
+
         Returns
         -------
-        model, score: Tuple[gpflow.models.gpr.GPR, float]
-            Optimized model constructed from `ast` and its score, calculated
-            using the current metric.
+        model, score, evaluation_info: Tuple[gpflow.models.gpr.GPR, float, Dict[str, Any]]
+            Optimized model constructed from `ast`, its score, calculated
+            using the current metric, and information about its optimization.
 
         """
-        with tf.Session(graph=tf.Graph()):
-            model = gpflow.models.GPR(x, y, kern=ast_to_kernel(ast))
-
-            if add_jitter:
+        evaluation_info: Dict[str, Any] = {
+            'cholesky_failed': False,
+            'precision': precision,
+            'scoring_time': 0.,
+            'worker_id': os.getpid(),
+        }
+        peak_rss_before = get_peak_rss_kb()
+
+        settings = gpflow.settings.get_settings()
+        settings.dtypes.float_type = _FLOAT_TYPES[precision]
+
+        with gpflow.settings.temp_settings(settings), tf.Session(graph=tf.Graph()):
+            start = time.perf_counter()
+            model = build_model(x.astype(_FLOAT_TYPES[precision]), y.astype(_FLOAT_TYPES[precision]), ast, noise_weights=noise_weights,
+                                noise_floor=noise_floor, jitter=jitter, params=params)
+
+            if add_jitter and params is None:
                 add_jitter_to_model(model)
+            evaluation_info['warm_started'] = choose_initial_params(model, warm_start_params)
+            evaluation_info['build_time'] = time.perf_counter() - start
 
+            start = time.perf_counter()
             try:
-                optimizer.minimize(model)
+                optimize(model, evaluation_info)
             except tf.errors.InvalidArgumentError:
-                _LOGGER.debug(f'Cholesky decomposition failed for:\n{pretty_ast(ast)}.')
-                return model, np.Inf
+                evaluation_info['cholesky_failed'] = True
+                score = np.Inf
+            evaluation_info['optimization_time'] = time.perf_counter() - start
 
-            return model, score_model(model)
+            if not evaluation_info['cholesky_failed']:
+                start = time.perf_counter()
+                score = float(score_model(model, objective=evaluation_info.get('final_objective'), parameter_count=get_parameter_count_ast(ast),
+                                          config=config))
+                evaluation_info['scoring_time'] = time.perf_counter() - start
+                cache_grams(model)
+
+            evaluation_info['peak_rss_delta_kb'] = get_peak_rss_kb() - peak_rss_before
+            return model, score, evaluation_info
 
     return _evaluate_ast
+
+
+def _make_batch_evaluator(x: np.ndarray, y: np.ndarray, add_jitter: bool, evaluate_ast: Callable,
+                          optimizer_kwargs: Optional[Dict[str, Any]]=None, config: Optional[Config]=None,
+                          noise_weights: Optional[np.ndarray]=None, precision: str='float64',
+                          parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]=None) -> Callable:
+    """Make evaluator that builds, jointly optimizes and scores a batch of kernels.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        Function input values `x_1, ..., x_n`, usually time points.
+
+    y: np.ndarray
+        Observed function values `y_1, ..., y_n`, outputs of function for inputs `x_1, ..., x_n`.
+
+    add_jitter: bool
+        Whether to add a little bit of randomness to each models parameters.
+
+    evaluate_ast: Callable
+        Evaluator of a single kernel, see `_make_evaluator`. Used for kernels of batches whose Cholesky decomposition fails.
+
+    optimizer_kwargs: Optional[Dict[str, Any]]
+        Configuration of the optimizer, see `make_optimizer`.
+
+    config: Optional[Config]
+        Configuration selecting the metric, read from the environment if `None`.
+
+    noise_weights: Optional[np.ndarray]
+        Weights of the noise variance of each point, homoscedastic noise if `None`.
+
+    precision: str
+        Float type to evaluate kernels at, `float32` or `float64`.
+
+    parent_params: Optional[Dict[str, Dict[str, np.ndarray]]]
+        Parameters of the parent of each kernel, by text of the kernel, to warm start optimization from.
+
+    Returns
+    -------
+    _evaluate_batch: Callable
+        Evaluates a list of kernel ASTs passed to it, returning `model, score, evaluation_info` of each, see `_make_evaluator`.
+
+    """
+    optimize = make_optimizer(optimizer_kwargs)
+    config = config or Config.from_environment()
+    noise_floor = _FLOAT32_NOISE_FLOOR if precision == _FLOAT32 else None
+
+    def _evaluate_batch(asts: List[Node]) -> List[Tuple[gpflow.models.GPR, float, Dict[str, Any]]]:
+        evaluation_info: Dict[str, Any] = {
+            'batch_size': len(asts),
+            'cholesky_failed': False,
+            'cholesky_retries': 0,
+            'precision': precision,
+            'precision_fallback': False,
+            'retry_strategy': '',
+            'worker_id': os.getpid(),
+        }
+        peak_rss_before = get_peak_rss_kb()
+
+        settings = gpflow.settings.get_settings()
+        settings.dtypes.float_type = _FLOAT_TYPES[precision]
+
+        with gpflow.settings.temp_settings(settings), tf.Session(graph=tf.Graph()):
+            start = time.perf_counter()
+            models = [build_model(x.astype(_FLOAT_TYPES[precision]), y.astype(_FLOAT_TYPES[precision]), ast, noise_weights=noise_weights,
+                                  noise_floor=noise_floor) for ast in asts]
+            warm_started = []
+            for ast, model in zip(asts, models):
+                if add_jitter:
+                    add_jitter_to_model(model)
+                warm_started.append(choose_initial_params(model, parent_params.get(ast_to_text(ast)) if parent_params else None))
+            batched_model = build_batched_model(asts, models, noise_weights=noise_weights, noise_floor=noise_floor)
+            evaluation_info['build_time'] = (time.perf_counter() - start) / len(asts)
+
+            start = time.perf_counter()
+            try:
+                optimize(batched_model, evaluation_info)
+            except tf.errors.InvalidArgumentError:
+                _LOGGER.debug(f'Cholesky decomposition failed for a batch of `{len(asts)}` kernels, evaluating them one by one.')
+                return [evaluate_ast(ast) for ast in asts]
+            evaluation_info['optimization_time'] = (time.perf_counter() - start) / len(asts)
+            # The final objective of the batch is the sum of those of its kernels.
+            evaluation_info.pop('final_objective', None)
+
+            copy_params(models, batched_model, to_batched=False)
+            objectives = -batched_model.compute_candidate_log_likelihoods()
+
+            evaluations = []
+            for ast, model, objective, model_warm_started in zip(asts, models, objectives, warm_started):
+                start = time.perf_counter()
+                score = float(score_model(model, objective=float(objective), parameter_count=get_parameter_count_ast(ast), config=config))
+                cache_grams(model)
+                evaluations.append((model, score, {
+                    **evaluation_info,
+                    'scoring_time': time.perf_counter() - start,
+                    'warm_started': model_warm_started,
+                    'peak_rss_delta_kb': get_peak_rss_kb() - peak_rss_before,
+                }))
+            return evaluations
+
+    return _evaluate_batch
+
+
+def _make_attempts(precision: str, parent_params: Optional[Dict[str, np.ndarray]],
+                   max_cholesky_retries: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """Make the ladder of attempts to evaluate a kernel, as pairs of the name of its retry strategy and options of `_evaluate_ast_once`."""
+    attempts = [('', {'precision': precision, 'noise_floor': _FLOAT32_NOISE_FLOOR if precision == _FLOAT32 else None,
+                      'warm_start_params': parent_params})]
+    if precision != _FLOAT64:
+        attempts.append((_FLOAT64, {'precision': _FLOAT64}))
+
+    retries = [(f'jitter={jitter}', {'precision': _FLOAT64, 'jitter': jitter}) for jitter in _JITTER_LADDER]
+    if parent_params:
+        retries.append(('parent_params', {'precision': _FLOAT64, 'jitter': _JITTER_LADDER[-1], 'params': parent_params}))
+    retries.append((f'noise_floor={_RETRY_NOISE_FLOOR}', {'precision': _FLOAT64, 'noise_floor': _RETRY_NOISE_FLOOR, 'params': parent_params}))
+
+    return attempts + retries[:max_cholesky_retries]
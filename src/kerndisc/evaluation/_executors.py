@@ -0,0 +1,194 @@
+"""Module of executors, which evaluate kernels serially, in threads, in processes or on remote workers.
+
+All executors share the interface of `Executor`: Given data and tasks, see `_tasks`, they yield the index of each
+task with its result as soon as it completes. Pass an executor to `evaluate_asts` or `discover` to use it.
+
+Executors are reusable and should be shut down after use, e.g., by using them as context manager:
+```
+    > with ProcessExecutor(max_workers=4) as executor:
+    >     discover(x, y, executor=executor)
+```
+
+See `_remote` for the executor evaluating kernels on worker processes on other hosts.
+
+"""
+import abc
+from concurrent.futures import as_completed, Executor as FuturesExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
+from typing import Any, Iterator, List, Optional, Tuple
+
+from ._evaluate import _make_evaluator
+from ._shared import SharedData, SharedEvaluationData
+from ._tasks import EvaluationData, EvaluationResult, EvaluationTask
+from ..description import dict_to_ast
+
+
+_LOGGER = logging.getLogger(__package__)
+# Data of the process, set once per worker process of `ProcessExecutor`.
+_WORKER_DATA: Optional[EvaluationData] = None
+
+
+class Executor(abc.ABC):
+    """Interface of executors, which evaluate tasks and yield their results as they complete."""
+
+    @abc.abstractmethod
+    def evaluate(self, data: EvaluationData, tasks: List[EvaluationTask]) -> Iterator[Tuple[int, EvaluationResult]]:
+        """Evaluate tasks on data.
+
+        Parameters
+        ----------
+        data: EvaluationData
+            Data to evaluate on, its fingerprint is the one of all `tasks`.
+
+        tasks: List[EvaluationTask]
+            Tasks to evaluate.
+
+        Returns
+        -------
+        results: Iterator[Tuple[int, EvaluationResult]]
+            Index of each task in `tasks` along with its result, in order of completion.
+
+        """
+
+    def shutdown(self) -> None:
+        """Release all resources held by the executor, e.g., worker processes."""
+
+    def __enter__(self) -> 'Executor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+
+class SerialExecutor(Executor):
+    """Executor evaluating tasks one after another in the current thread."""
+
+    def evaluate(self, data: EvaluationData, tasks: List[EvaluationTask]) -> Iterator[Tuple[int, EvaluationResult]]:
+        for i, task in enumerate(tasks):
+            yield i, evaluate_task(data, task)
+
+
+class _PoolExecutor(Executor):
+    """Executor evaluating tasks in a `concurrent.futures` pool, created on first use."""
+
+    def __init__(self, max_workers: Optional[int]=None) -> None:
+        self.max_workers = max_workers
+        self._pool: Optional[FuturesExecutor] = None
+
+    def evaluate(self, data: EvaluationData, tasks: List[EvaluationTask]) -> Iterator[Tuple[int, EvaluationResult]]:
+        futures = {self._submit(data, task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @abc.abstractmethod
+    def _submit(self, data: EvaluationData, task: EvaluationTask) -> Any:
+        """Submit a task to the pool, returning its future."""
+
+
+class ThreadExecutor(_PoolExecutor):
+    """Executor evaluating tasks in a pool of threads, which is not safe, use `ProcessExecutor` instead.
+
+    Tensorflow releases the GIL while running graphs, so threads can evaluate kernels in parallel without
+    copying data. However, evaluating a kernel enters `gpflow.settings.temp_settings`, e.g., for its precision,
+    and `gpflow.defer_build`, both of which change process-global state of gpflow rather than state per thread.
+    Threads entering and leaving them interleaved restore each others state, such that kernels may be evaluated
+    at the wrong precision, e.g., when falling back to `float64` during a `float32` search, or built when they
+    should not be. Processes of `ProcessExecutor` do not share any state of gpflow.
+
+    Parameters
+    ----------
+    max_workers: Optional[int]
+        Number of threads, see `concurrent.futures.ThreadPoolExecutor`.
+
+    """
+
+    def __init__(self, max_workers: Optional[int]=None) -> None:
+        super().__init__(max_workers)
+        _LOGGER.warning('`ThreadExecutor` shares global settings of gpflow between threads, use `ProcessExecutor` to evaluate kernels in parallel safely.')
+
+    def _submit(self, data: EvaluationData, task: EvaluationTask) -> Any:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.max_workers)
+        return self._pool.submit(evaluate_task, data, task)
+
+
+class ProcessExecutor(_PoolExecutor):
+    """Executor evaluating tasks in a pool of processes.
+
+    Data is written once to memory-mapped files shared by all processes, see `_shared`, which map it when the
+    pool is started, tasks only carry its fingerprint. The pool is restarted if tasks are evaluated on different
+    data, and the files are removed once the pool is shut down.
+
+    Parameters
+    ----------
+    max_workers: Optional[int]
+        Number of processes, see `concurrent.futures.ProcessPoolExecutor`.
+
+    """
+
+    def __init__(self, max_workers: Optional[int]=None) -> None:
+        super().__init__(max_workers)
+        self._fingerprint: Optional[str] = None
+        self._shared_data: Optional[SharedData] = None
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        if self._shared_data is not None:
+            self._shared_data.close()
+            self._shared_data = None
+        self._fingerprint = None
+
+    def _submit(self, data: EvaluationData, task: EvaluationTask) -> Any:
+        if self._fingerprint != task.fingerprint:
+            self.shutdown()
+            self._shared_data = SharedData(data)
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_set_worker_data, initargs=(self._shared_data.handle,))
+            self._fingerprint = task.fingerprint
+        return self._pool.submit(_evaluate_worker_task, task)
+
+
+def evaluate_task(data: EvaluationData, task: EvaluationTask) -> EvaluationResult:
+    """Evaluate a single task, see `_make_evaluator`.
+
+    Parameters
+    ----------
+    data: EvaluationData
+        Data to evaluate on.
+
+    task: EvaluationTask
+        Task to evaluate.
+
+    Returns
+    -------
+    result: EvaluationResult
+        Optimized parameters, score and evaluation information of the kernel of `task`.
+
+    Raises
+    ------
+    ValueError
+        If `data` is not the data of `task`.
+
+    """
+    if data.fingerprint() != task.fingerprint:
+        _LOGGER.exception(f'Task for data `{task.fingerprint}` can not be evaluated on data `{data.fingerprint()}`.')
+        raise ValueError(f'Task for data `{task.fingerprint}` can not be evaluated on data `{data.fingerprint()}`.')
+
+    evaluate_ast = _make_evaluator(data.x, data.y, noise_weights=data.noise_weights, **task.options)
+    model, score, evaluation_info = evaluate_ast(dict_to_ast(task.ast))
+    return model.read_values(), score, evaluation_info
+
+
+def _set_worker_data(shared_data: SharedEvaluationData) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = shared_data.open()
+
+
+def _evaluate_worker_task(task: EvaluationTask) -> EvaluationResult:
+    return evaluate_task(_WORKER_DATA, task)
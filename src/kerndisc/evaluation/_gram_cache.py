@@ -0,0 +1,268 @@
+"""Module to cache Gram matrices of (sub)kernels at fixed parameters, to reuse them across kernels.
+
+Each kernel expanded by a grammar is a combination of its parent with a base kernel, e.g., `parent + base`
+or `parent * base`, or a subexpression of its parent. At the parents optimized parameters, the Gram matrix
+of a child is therefore an elementwise combination of Gram matrices that were computed when the parent was
+scored. This module caches the Gram matrix of every subtree of a kernel, keyed by the data, the structure of
+the subtree and its parameter values, in an LRU cache bounded by the number of bytes of all cached matrices.
+The budget can be set via the environment variable `GRAM_CACHE_BYTES`, a budget of `0` disables caching.
+
+Gram matrices are computed using numpy, see `kerndisc._kernel_functions`, so no tensorflow graph is involved.
+They are used to pick the starting point of optimization of a kernel, see `choose_initial_params`. Only Gram matrices
+at optimized parameters are cached, see `cache_grams`, and nothing is cached if a single Gram matrix of the data
+exceeds the budget.
+
+"""
+from collections import OrderedDict
+from functools import reduce
+import hashlib
+import logging
+import os
+from typing import Dict, Hashable, Optional, Tuple
+
+import gpflow
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from ._util import transfer_params
+from .._kernel_functions import _KERNEL_ATTRIBUTES, compile_kernel
+from ..description import get_noise_variances
+
+
+_GRAM_CACHE_BYTES = int(os.environ.get('GRAM_CACHE_BYTES', 256 * 2 ** 20))
+_LOGGER = logging.getLogger(__package__)
+
+
+class _GramCache:
+    """LRU cache of Gram matrices, bounded by the number of bytes of all cached matrices."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._grams: 'OrderedDict[Hashable, np.ndarray]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        if key not in self._grams:
+            return None
+        self._grams.move_to_end(key)
+        return self._grams[key]
+
+    def put(self, key: Hashable, gram: np.ndarray) -> None:
+        if key in self._grams or gram.nbytes > self.max_bytes:
+            return
+
+        gram.flags.writeable = False
+        self._grams[key] = gram
+        self.nbytes += gram.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted_gram = self._grams.popitem(last=False)
+            self.nbytes -= evicted_gram.nbytes
+
+    def clear(self) -> None:
+        self._grams.clear()
+        self.nbytes = 0
+
+
+_GRAM_CACHE = _GramCache(_GRAM_CACHE_BYTES)
+
+
+def clear_gram_cache() -> None:
+    """Remove all cached Gram matrices."""
+    _GRAM_CACHE.clear()
+
+
+def gram_matrix(kernel: gpflow.kernels.Kernel, x: np.ndarray, data_key: Optional[str]=None, cache: bool=True) -> np.ndarray:
+    """Compute the Gram matrix `K(x, x)` of a kernel at its current parameters, reusing cached Gram matrices of its subtrees.
+
+    Gram matrices of all subtrees of `kernel` that are not cached yet are computed and, if `cache` is set, cached.
+
+    Parameters
+    ----------
+    kernel: gpflow.kernels.Kernel
+        Built kernel, e.g., of a model.
+
+    x: np.ndarray
+        Inputs of shape `(n, 1)`.
+
+    data_key: Optional[str]
+        Key identifying `x`, computed from it if `None`. Pass it when computing many Gram matrices of the same `x`.
+
+    cache: bool
+        Whether to cache computed Gram matrices. Only cache Gram matrices at parameters other kernels start from,
+        e.g., optimized ones, others would only evict them.
+
+    Returns
+    -------
+    gram: np.ndarray
+        Gram matrix of shape `(n, n)`, read-only if cached.
+
+    Raises
+    ------
+    ValueError
+        If `kernel` or any of its subkernels can not be compiled, see `kerndisc._kernel_functions.compile_kernel`.
+
+    """
+    data_key = data_key or _data_key(x)
+    return _subtree_gram(kernel, x, data_key, cache)[1]
+
+
+def cache_grams(model: gpflow.models.GPR) -> None:
+    """Cache Gram matrices of all subtrees of the kernel of a model at its current parameters, e.g., after optimizing it.
+
+    Nothing is cached, nor computed, if caching is disabled, a single Gram matrix exceeds the budget of the cache
+    or the kernel can not be compiled.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        Model, usually optimized, whose kernel may become the parent of other kernels.
+
+    """
+    x = model.X.read_value().astype(float)
+    if _exceeds_budget(x):
+        return
+
+    try:
+        gram_matrix(model.kern, x)
+    except ValueError:
+        _LOGGER.debug('Kernel can not be compiled, its Gram matrices are not cached.')
+
+
+def initial_negative_log_likelihood(model: gpflow.models.GPR, data_key: Optional[str]=None) -> float:
+    """Compute the negative log likelihood of a model at its current parameters, using cached Gram matrices.
+
+    Gram matrices computed on the way are not cached, as the parameters of `model` are usually not optimized.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        Model as built by `kerndisc.evaluation._util.build_model`.
+
+    data_key: Optional[str]
+        Key identifying the inputs of `model`, see `gram_matrix`.
+
+    Returns
+    -------
+    negative_log_likelihood: float
+        Negative log likelihood, `np.Inf` if the covariance matrix is not positive definite.
+
+    Raises
+    ------
+    ValueError
+        If the kernel of `model` can not be compiled.
+
+    """
+    covariance = _covariance(model, data_key or _data_key(model.X.read_value()))
+    return float(_negative_log_likelihoods(covariance[np.newaxis], model.Y.read_value().astype(float))[0])
+
+
+def choose_initial_params(model: gpflow.models.GPR, parent_params: Optional[Dict[str, np.ndarray]]) -> bool:
+    """Start optimization of a model from the parameters of its parent, if they are more likely than its current ones.
+
+    Parameters of the parent are transferred using `transfer_params`, parameters not shared with the parent keep their
+    current values. Both starting points are compared by their negative log likelihood. At the transferred parameters,
+    Gram matrices of all subtrees shared with the parent are cached, as the parent was scored at exactly these, so only
+    the Gram matrices of new base kernels are computed. Both covariance matrices are decomposed in a single batched
+    Cholesky decomposition. If Gram matrices of the data can not be cached, the parameters of the parent are used
+    without comparing them, as computing all Gram matrices would take more than the warm start saves.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        Built model, whose parameters are replaced inplace if the parents ones are more likely.
+
+    parent_params: Optional[Dict[str, np.ndarray]]
+        Optimized parameters of the parent of the models kernel, `None` if it has no known parent.
+
+    Returns
+    -------
+    warm_started: bool
+        Whether the model starts from the parameters of its parent.
+
+    """
+    if not parent_params:
+        return False
+
+    current_params = model.read_values()
+    transferred_params = transfer_params(parent_params, list(current_params))
+    if not transferred_params:
+        return False
+
+    if _exceeds_budget(model.X.read_value().astype(float)):
+        model.assign(transferred_params)
+        return True
+
+    try:
+        data_key = _data_key(model.X.read_value())
+        current_covariance = _covariance(model, data_key)
+        model.assign(transferred_params)
+        transferred_covariance = _covariance(model, data_key)
+    except ValueError:
+        _LOGGER.debug('Kernel can not be compiled, starting from the parameters of its parent.')
+        model.assign(transferred_params)
+        return True
+
+    current_negative_log_likelihood, transferred_negative_log_likelihood = _negative_log_likelihoods(
+        np.stack([current_covariance, transferred_covariance]), model.Y.read_value().astype(float))
+    if transferred_negative_log_likelihood <= current_negative_log_likelihood:
+        return True
+
+    model.assign(current_params)
+    return False
+
+
+def _covariance(model: gpflow.models.GPR, data_key: str) -> np.ndarray:
+    """Covariance matrix of a model at its current parameters, from cached Gram matrices where available, caching none."""
+    return gram_matrix(model.kern, model.X.read_value().astype(float), data_key=data_key, cache=False) + np.diag(get_noise_variances(model))
+
+
+def _negative_log_likelihoods(covariances: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Negative log likelihoods of `y` under zero mean normal distributions, `np.Inf` where a covariance matrix is not positive definite."""
+    try:
+        choleskies = np.linalg.cholesky(covariances)
+    except np.linalg.LinAlgError:
+        if covariances.shape[0] == 1:
+            return np.array([np.Inf])
+        # Decompose them one by one, to score only the covariance matrices that are not positive definite as `np.Inf`.
+        return np.concatenate([_negative_log_likelihoods(covariance[np.newaxis], y) for covariance in covariances])
+
+    negative_log_likelihoods = np.empty(covariances.shape[0])
+    for i, cholesky in enumerate(choleskies):
+        whitened_y = solve_triangular(cholesky, y, lower=True)
+        log_determinant = 2 * np.sum(np.log(np.diag(cholesky)))
+        negative_log_likelihoods[i] = 0.5 * (np.sum(whitened_y ** 2) + log_determinant + y.shape[0] * np.log(2 * np.pi))
+    return negative_log_likelihoods
+
+
+def _subtree_gram(kernel: gpflow.kernels.Kernel, x: np.ndarray, data_key: str, cache: bool) -> Tuple[Hashable, np.ndarray]:
+    """Get key and Gram matrix of a subtree, computing it if it isn't cached and caching it if `cache` is set."""
+    if isinstance(kernel, (gpflow.kernels.Sum, gpflow.kernels.Product)):
+        children = [_subtree_gram(child, x, data_key, cache) for child in kernel.children.values() if isinstance(child, gpflow.kernels.Kernel)]
+        key: Hashable = (data_key, type(kernel).__name__, tuple(child_key for child_key, _ in children))
+        gram = _GRAM_CACHE.get(key)
+        if gram is None:
+            gram = reduce(np.add if isinstance(kernel, gpflow.kernels.Sum) else np.multiply, (child_gram for _, child_gram in children))
+    else:
+        params = tuple((name, np.asarray(param.read_value(), dtype=float).tobytes()) for name, param in kernel.children.items()
+                       if isinstance(param, gpflow.Param))
+        attributes = tuple((name, getattr(kernel, name)) for name in _KERNEL_ATTRIBUTES if hasattr(kernel, name))
+        key = (data_key, type(kernel).__name__, params, attributes)
+        gram = _GRAM_CACHE.get(key)
+        if gram is None:
+            gram = compile_kernel(kernel)(x)
+
+    if cache:
+        _GRAM_CACHE.put(key, gram)
+    return key, gram
+
+
+def _exceeds_budget(x: np.ndarray) -> bool:
+    """Whether a single Gram matrix of `x` exceeds the budget of the cache, such that none can be cached."""
+    return x.shape[0] ** 2 * x.itemsize > _GRAM_CACHE.max_bytes
+
+
+def _data_key(x: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(x, dtype=float).tobytes()).hexdigest()
@@ -0,0 +1,95 @@
+"""Module to emit per kernel evaluation information to external consumers.
+
+A hook is any callable taking a single record of the form:
+```
+    {
+        'kernel': text_of_kernel,
+        'depth': depth_kernel_constructed_at,
+        'score': some_float_score,
+        **evaluation_info,
+    }
+```
+where `evaluation_info` is the information yielded by `evaluate_asts`. Hooks are passed to `discover` via `evaluation_hook`.
+
+"""
+from collections import defaultdict
+import json
+import os
+import re
+from typing import Any, Callable, DefaultDict, Dict
+
+
+_KERNEL_NAME_PATTERN = re.compile(r'[a-z0-9]+')
+_PROMETHEUS_METRICS = [
+    ('kerndisc_evaluated_kernels_total', 'counter', 'Number of evaluated kernels.', lambda record: 1),
+    ('kerndisc_cholesky_failures_total', 'counter', 'Number of kernels whose optimization failed due to a failing Cholesky decomposition.',
+     lambda record: int(record.get('cholesky_failed', False))),
+    ('kerndisc_cholesky_retries_total', 'counter', 'Number of retries of kernels whose Cholesky decomposition failed.',
+     lambda record: record.get('cholesky_retries', 0)),
+    ('kerndisc_build_seconds_total', 'counter', 'Time spent building models.', lambda record: record.get('build_time', 0.)),
+    ('kerndisc_optimization_seconds_total', 'counter', 'Time spent optimizing models.', lambda record: record.get('optimization_time', 0.)),
+    ('kerndisc_scoring_seconds_total', 'counter', 'Time spent scoring models.', lambda record: record.get('scoring_time', 0.)),
+    ('kerndisc_optimizer_iterations_total', 'counter', 'Iterations used by the optimizer.', lambda record: record.get('iterations', 0)),
+    ('kerndisc_optimizer_function_evaluations_total', 'counter', 'Function evaluations used by the optimizer.',
+     lambda record: record.get('function_evaluations', 0)),
+]
+
+
+def make_json_lines_hook(path: str) -> Callable[[Dict[str, Any]], None]:
+    """Make a hook that appends each record as a JSON line to a file.
+
+    Parameters
+    ----------
+    path: str
+        File records are appended to, it is created if it does not exist.
+
+    Returns
+    -------
+    _hook: Callable[[Dict[str, Any]], None]
+        Hook writing records to `path`.
+
+    """
+    def _hook(record: Dict[str, Any]) -> None:
+        with open(path, 'a') as json_lines_file:
+            json_lines_file.write(json.dumps(record, default=str) + '\n')
+
+    return _hook
+
+
+def make_prometheus_textfile_hook(path: str) -> Callable[[Dict[str, Any]], None]:
+    """Make a hook that maintains aggregated counters in the Prometheus text format.
+
+    Counters are labelled by kernel family, i.e., the sorted set of base kernels a kernel is made
+    out of, such as `periodic,rbf`. This keeps label cardinality low, while still showing which
+    kinds of kernels are slow to evaluate. The file is rewritten atomically after each record, such
+    that it can be picked up by the textfile collector of the Prometheus node exporter at any time.
+
+    Parameters
+    ----------
+    path: str
+        File counters are written to.
+
+    Returns
+    -------
+    _hook: Callable[[Dict[str, Any]], None]
+        Hook updating counters in `path`.
+
+    """
+    counters: DefaultDict[str, DefaultDict[str, float]] = defaultdict(lambda: defaultdict(int))
+
+    def _hook(record: Dict[str, Any]) -> None:
+        family = ','.join(sorted(set(_KERNEL_NAME_PATTERN.findall(record.get('kernel', '')))))
+        for name, _, _, get_value in _PROMETHEUS_METRICS:
+            counters[name][family] += get_value(record)
+
+        lines = []
+        for name, metric_type, description, _ in _PROMETHEUS_METRICS:
+            lines.extend([f'# HELP {name} {description}', f'# TYPE {name} {metric_type}'])
+            lines.extend(f'{name}{{kernel_family="{family}"}} {value}' for family, value in sorted(counters[name].items()))
+
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as textfile:
+            textfile.write('\n'.join(lines) + '\n')
+        os.replace(temporary_path, path)
+
+    return _hook
@@ -0,0 +1,197 @@
+"""Module to configure and run optimization of models."""
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import gpflow
+
+
+_ADAM = 'adam'
+_DEFAULT_LEARNING_RATE = 0.01
+_DEFAULT_MAXITER = 1000
+_DEFAULT_METHOD = 'L-BFGS-B'
+# Methods whose final parameters are always the ones evaluated last before their last step, see `_make_scipy_optimizer`.
+_EXACT_FINAL_OBJECTIVE_METHODS = {'l-bfgs-b'}
+_LOGGER = logging.getLogger(__package__)
+_OPTIMIZER_KWARGS = {'method', 'maxiter', 'gtol', 'ftol', 'tol', 'options', 'learning_rate'}
+
+
+def make_optimizer(optimizer_kwargs: Optional[Dict[str, Any]]=None) -> Callable[[gpflow.models.Model, Dict[str, Any]], None]:
+    """Make a callable that optimizes a model according to `optimizer_kwargs`.
+
+    The following options can be passed via `optimizer_kwargs`:
+        * `method`: Any method of `scipy.optimize.minimize`, e.g., `L-BFGS-B` (default), `BFGS` or gradient-free
+          methods like `Nelder-Mead` and `Powell`. Alternatively `adam` selects gpflows Adam optimizer,
+          which can be preferable for noisy kernels.
+        * `maxiter`: Maximum number of iterations, defaults to `1000`. For `adam` this is the exact number of steps.
+        * `gtol`, `ftol`: Gradient and function value tolerance of scipy methods supporting them, e.g., `L-BFGS-B`.
+        * `tol`: General tolerance, passed to `scipy.optimize.minimize`.
+        * `options`: Further method specific options, passed to `scipy.optimize.minimize`.
+        * `learning_rate`: Learning rate of `adam`, defaults to `0.01`.
+
+    Parameters
+    ----------
+    optimizer_kwargs: Optional[Dict[str, Any]]
+        Configuration of the optimizer, see above.
+
+    Returns
+    -------
+    _optimize: Callable[[gpflow.models.Model, Dict[str, Any]], None]
+        Optimizes a model inplace and writes information about the optimization run, i.e., `method`,
+        `iterations` and `function_evaluations`, into the dict passed to it. The dict is filled during optimization,
+        such that it is complete even if optimization fails. If the final objective value of the optimization is
+        known exactly, it is added as `final_objective`.
+
+    Raises
+    ------
+    ValueError
+        If unknown options are passed.
+
+    """
+    if optimizer_kwargs is None:
+        optimizer_kwargs = {}
+
+    unknown_kwargs = set(optimizer_kwargs) - _OPTIMIZER_KWARGS
+    if unknown_kwargs:
+        _LOGGER.exception(f'Unknown optimizer options passed: `{sorted(unknown_kwargs)}`, known are: `{sorted(_OPTIMIZER_KWARGS)}`.')
+        raise ValueError(f'Unknown optimizer options passed: `{sorted(unknown_kwargs)}`.')
+
+    method = optimizer_kwargs.get('method', _DEFAULT_METHOD)
+    maxiter = optimizer_kwargs.get('maxiter', _DEFAULT_MAXITER)
+
+    if method.lower() == _ADAM:
+        return _make_adam_optimizer(maxiter, optimizer_kwargs.get('learning_rate', _DEFAULT_LEARNING_RATE))
+
+    return _make_scipy_optimizer(method, maxiter, optimizer_kwargs)
+
+
+def _make_adam_optimizer(maxiter: int, learning_rate: float) -> Callable[[gpflow.models.Model, Dict[str, Any]], None]:
+    """Make a callable that optimizes a model using Adam.
+
+    Parameters
+    ----------
+    maxiter: int
+        Number of steps Adam takes.
+
+    learning_rate: float
+        Learning rate of Adam.
+
+    Returns
+    -------
+    _optimize: Callable[[gpflow.models.Model, Dict[str, Any]], None]
+        Optimizes a model inplace, see `make_optimizer`.
+
+    """
+    def _optimize(model: gpflow.models.Model, optimization_info: Dict[str, Any]) -> None:
+        optimization_info.update({
+            'method': _ADAM,
+            'iterations': maxiter,
+            'function_evaluations': maxiter,
+        })
+        gpflow.train.AdamOptimizer(learning_rate).minimize(model, maxiter=maxiter)
+
+    return _optimize
+
+
+def _make_scipy_optimizer(method: str, maxiter: int, optimizer_kwargs: Dict[str, Any]) -> Callable[[gpflow.models.Model, Dict[str, Any]], None]:
+    """Make a callable that optimizes a model using `scipy.optimize.minimize`.
+
+    The objective value is recorded at every function evaluation. `L-BFGS-B` only ever takes a step
+    to the point it evaluated last and, if it terminates abnormally, restores the point of its last step.
+    Thus the value recorded at its last step (or the initial value, if no step was taken) is the objective
+    at the final parameters, saving a recomputation of it after optimization.
+
+    Parameters
+    ----------
+    method: str
+        Method of `scipy.optimize.minimize` to use.
+
+    maxiter: int
+        Maximum number of iterations.
+
+    optimizer_kwargs: Dict[str, Any]
+        Configuration of the optimizer, see `make_optimizer`.
+
+    Returns
+    -------
+    _optimize: Callable[[gpflow.models.Model, Dict[str, Any]], None]
+        Optimizes a model inplace, see `make_optimizer`.
+
+    """
+    options = dict(optimizer_kwargs.get('options', {}))
+    for tolerance in ['gtol', 'ftol']:
+        if tolerance in optimizer_kwargs:
+            options[tolerance] = optimizer_kwargs[tolerance]
+
+    scipy_kwargs: Dict[str, Any] = {'method': method}
+    if options:
+        scipy_kwargs['options'] = options
+    if 'tol' in optimizer_kwargs:
+        scipy_kwargs['tol'] = optimizer_kwargs['tol']
+
+    optimizer = gpflow.train.ScipyOptimizer(**scipy_kwargs)
+
+    def _optimize(model: gpflow.models.Model, optimization_info: Dict[str, Any]) -> None:
+        optimization_info.update({
+            'method': method,
+            'iterations': 0,
+            'function_evaluations': 0,
+        })
+
+        objectives: Dict[str, float] = {}
+
+        def _count_iteration(*args: Any) -> None:
+            optimization_info['iterations'] += 1
+            objectives['at_last_step'] = objectives['last']
+
+        def _count_function_evaluation(objective: float) -> None:
+            optimization_info['function_evaluations'] += 1
+            objectives.setdefault('initial', objective)
+            objectives['last'] = objective
+
+        optimizer.minimize(model, maxiter=maxiter, step_callback=_count_iteration,
+                           fetches=[model.objective], loss_callback=_count_function_evaluation)
+
+        if method.lower() in _EXACT_FINAL_OBJECTIVE_METHODS and 'initial' in objectives:
+            optimization_info['final_objective'] = float(objectives.get('at_last_step', objectives['initial']))
+
+    return _optimize
+
+
+def make_tolerance_schedule(search_depth: int, initial_tolerance: float=1e-3, final_tolerance: float=1e-8,
+                            **optimizer_kwargs: Any) -> Callable[[int], Dict[str, Any]]:
+    """Make a per depth schedule of optimizer options, with tolerances tightening over depths.
+
+    Tolerances `gtol` and `ftol` are interpolated geometrically from `initial_tolerance` at depth `0`
+    to `final_tolerance` at depth `search_depth - 1`. This way shallow depths are scored roughly,
+    while the final kernels are optimized to full convergence.
+
+    Parameters
+    ----------
+    search_depth: int
+        Search depth of discovery the schedule is used for.
+
+    initial_tolerance: float
+        Tolerance used at depth `0`.
+
+    final_tolerance: float
+        Tolerance used at the last depth.
+
+    optimizer_kwargs: Any
+        Further options passed at every depth, see `make_optimizer`.
+
+    Returns
+    -------
+    _schedule: Callable[[int], Dict[str, Any]]
+        Maps a depth to optimizer options for that depth.
+
+    """
+    def _schedule(depth: int) -> Dict[str, Any]:
+        progress = min(depth / (search_depth - 1), 1) if search_depth > 1 else 1
+        tolerance = initial_tolerance * (final_tolerance / initial_tolerance) ** progress
+        return {
+            **optimizer_kwargs,
+            'gtol': tolerance,
+            'ftol': tolerance,
+        }
+
+    return _schedule
@@ -0,0 +1,306 @@
+"""Module to evaluate kernels on worker processes, possibly on other hosts, over TCP.
+
+Workers are started using `serve_evaluation_worker`, e.g., on each host, listening on its address in a private network:
+```
+    > EVALUATION_WORKER_AUTHKEY=... python -c "from kerndisc.evaluation import serve_evaluation_worker; serve_evaluation_worker(('10.0.0.2', 6000))"
+```
+The `RemoteExecutor` connects to all of them, ships the data once per connection and then sends one task at a time
+to each worker, such that fast workers evaluate more kernels. Once no tasks are left, idle workers speculatively
+evaluate tasks that take much longer than completed ones did (stragglers), the first result of each task is used.
+
+Messages are pickled and connections are authenticated using `authkey`, which defaults to the environment variable
+`EVALUATION_WORKER_AUTHKEY`, there is no default key. Only run workers in trusted networks, anyone knowing the key can
+run code on them.
+
+"""
+from collections import defaultdict, OrderedDict
+import logging
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+import os
+import queue
+import statistics
+import threading
+import time
+import traceback
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from ._executors import evaluate_task, Executor
+from ._tasks import EvaluationData, EvaluationResult, EvaluationTask
+
+
+_LOGGER = logging.getLogger(__package__)
+# Number of data sets a worker keeps, e.g., of several discoveries sharing it.
+_MAX_WORKER_DATA = 4
+_POLL_INTERVAL = 0.05
+
+Address = Tuple[str, int]
+
+
+def serve_evaluation_worker(address: Address, authkey: Optional[bytes]=None) -> None:
+    """Serve as worker of `RemoteExecutor`s, evaluating the tasks they send until interrupted.
+
+    Connections are served one after another, each by evaluating one task at a time.
+
+    Parameters
+    ----------
+    address: Tuple[str, int]
+        Host and port to listen on.
+
+    authkey: Optional[bytes]
+        Key executors must know to connect, read from the environment variable `EVALUATION_WORKER_AUTHKEY` if `None`.
+
+    Raises
+    ------
+    ValueError
+        If no key is passed and the environment variable is not set.
+
+    """
+    data_by_fingerprint: 'OrderedDict[str, EvaluationData]' = OrderedDict()
+    with Listener(address, authkey=_get_authkey(authkey)) as listener:
+        _LOGGER.info(f'Evaluation worker with pid `{os.getpid()}` is listening at `{listener.address}`.')
+        while True:
+            try:
+                connection = listener.accept()
+            except (AuthenticationError, OSError):
+                _LOGGER.warning('Refused a connection that failed to authenticate.')
+                continue
+            with connection:
+                _serve_connection(connection, data_by_fingerprint)
+
+
+def _serve_connection(connection: Connection, data_by_fingerprint: 'OrderedDict[str, EvaluationData]') -> None:
+    """Evaluate tasks sent over a connection, until it is closed."""
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+
+        if message[0] == 'data':
+            _, fingerprint, data = message
+            data_by_fingerprint[fingerprint] = data
+            while len(data_by_fingerprint) > _MAX_WORKER_DATA:
+                data_by_fingerprint.popitem(last=False)
+            continue
+
+        _, task = message
+        try:
+            response = ('result', evaluate_task(data_by_fingerprint[task.fingerprint], task))
+        except Exception:
+            _LOGGER.exception(f'Evaluation of task failed:\n{task.ast}')
+            response = ('error', traceback.format_exc())
+
+        try:
+            connection.send(response)
+        except OSError:
+            return
+
+
+class RemoteExecutor(Executor):
+    """Executor evaluating tasks on workers served by `serve_evaluation_worker`.
+
+    Parameters
+    ----------
+    addresses: List[Tuple[str, int]]
+        Host and port of each worker.
+
+    authkey: Optional[bytes]
+        Key to authenticate at workers, read from the environment variable `EVALUATION_WORKER_AUTHKEY` if `None`.
+
+    speculation_factor: float
+        Once all tasks were sent, a task is sent again to an idle worker if it runs this many times longer than
+        the median of completed tasks.
+
+    min_speculation_seconds: float
+        Tasks are never sent again before running at least this many seconds.
+
+    Raises
+    ------
+    ValueError
+        If no key is passed and the environment variable is not set.
+
+    """
+
+    def __init__(self, addresses: List[Address], authkey: Optional[bytes]=None, speculation_factor: float=3.,
+                 min_speculation_seconds: float=1.) -> None:
+        self.addresses = addresses
+        self.authkey = _get_authkey(authkey)
+        self.speculation_factor = speculation_factor
+        self.min_speculation_seconds = min_speculation_seconds
+        self._workers: Dict[Address, _Worker] = {}
+
+    def evaluate(self, data: EvaluationData, tasks: List[EvaluationTask]) -> Iterator[Tuple[int, EvaluationResult]]:
+        schedule = _Schedule(len(tasks), self.speculation_factor, self.min_speculation_seconds)
+        threads = [threading.Thread(target=self._run_worker, args=(worker, data, tasks, schedule), daemon=True) for worker in self._connect()]
+        if not threads:
+            raise RuntimeError(f'No evaluation worker reachable at `{self.addresses}`.')
+        for thread in threads:
+            thread.start()
+
+        n_completed = 0
+        try:
+            while n_completed < len(tasks):
+                try:
+                    index, result, error = schedule.results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if not any(thread.is_alive() for thread in threads):
+                        raise RuntimeError(f'Lost all evaluation workers with `{len(tasks) - n_completed}` tasks left.')
+                    continue
+
+                if error is not None:
+                    raise RuntimeError(f'Evaluation failed on a worker:\n{error}')
+                n_completed += 1
+                yield index, result
+        finally:
+            # Stops sending tasks once the consumer stopped iterating, e.g., because an evaluation hook raised.
+            schedule.cancel()
+
+    def shutdown(self) -> None:
+        for worker in self._workers.values():
+            worker.close()
+        self._workers = {}
+
+    def _connect(self) -> List['_Worker']:
+        """Connect to all workers not connected yet, returning all connected workers."""
+        for address in self.addresses:
+            if address in self._workers and not self._workers[address].closed:
+                continue
+            try:
+                self._workers[address] = _Worker(Client(address, authkey=self.authkey))
+            except OSError:
+                _LOGGER.warning(f'Could not connect to evaluation worker at `{address}`.')
+        return [worker for worker in self._workers.values() if not worker.closed]
+
+    @staticmethod
+    def _run_worker(worker: '_Worker', data: EvaluationData, tasks: List[EvaluationTask], schedule: '_Schedule') -> None:
+        """Send tasks to a worker until all are done, requeueing its task if it fails."""
+        while True:
+            index = schedule.next_index()
+            if index is None:
+                return
+
+            start = time.perf_counter()
+            try:
+                status, value = worker.evaluate(data, tasks[index])
+            except Exception:
+                # Connections closed by `shutdown` fail in various ways, e.g., while a straggler is still evaluated.
+                if worker.closed:
+                    return
+                _LOGGER.warning(f'Lost connection to an evaluation worker while evaluating task `{index}`, requeueing it.')
+                worker.close()
+                schedule.requeue(index)
+                return
+            schedule.complete(index, value if status == 'result' else None, value if status == 'error' else None, time.perf_counter() - start)
+
+
+def _get_authkey(authkey: Optional[bytes]) -> bytes:
+    """Get the passed key, falling back to the environment variable `EVALUATION_WORKER_AUTHKEY`.
+
+    Raises
+    ------
+    ValueError
+        If no key is passed and the environment variable is not set.
+
+    """
+    if authkey:
+        return authkey
+    if os.environ.get('EVALUATION_WORKER_AUTHKEY'):
+        return os.environ['EVALUATION_WORKER_AUTHKEY'].encode()
+
+    _LOGGER.exception('No key to authenticate evaluation workers, pass `authkey` or set `EVALUATION_WORKER_AUTHKEY`.')
+    raise ValueError('No key to authenticate evaluation workers, pass `authkey` or set `EVALUATION_WORKER_AUTHKEY`.')
+
+
+class _Worker:
+    """Connection to a worker, remembering which data it was sent."""
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self.closed = False
+        self._fingerprints: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def evaluate(self, data: EvaluationData, task: EvaluationTask) -> Tuple[str, Any]:
+        with self._lock:
+            if task.fingerprint not in self._fingerprints:
+                self.connection.send(('data', task.fingerprint, data))
+                self._fingerprints.add(task.fingerprint)
+            self.connection.send(('task', task))
+            return self.connection.recv()
+
+    def close(self) -> None:
+        self.closed = True
+        self.connection.close()
+
+
+class _Schedule:
+    """Thread-safe schedule of tasks, handing out pending tasks first and speculative copies of stragglers afterwards."""
+
+    def __init__(self, n_tasks: int, speculation_factor: float, min_speculation_seconds: float) -> None:
+        self.results: 'queue.Queue[Tuple[int, Optional[EvaluationResult], Optional[str]]]' = queue.Queue()
+        self._pending = list(range(n_tasks))[::-1]
+        self._started: Dict[int, float] = {}
+        # Number of workers evaluating each task right now.
+        self._running: Dict[int, int] = defaultdict(int)
+        self._speculated: Set[int] = set()
+        self._done: Set[int] = set()
+        self._durations: List[float] = []
+        self._n_tasks = n_tasks
+        self._speculation_factor = speculation_factor
+        self._min_speculation_seconds = min_speculation_seconds
+        self._cancelled = False
+        self._condition = threading.Condition()
+
+    def next_index(self) -> Optional[int]:
+        """Get index of the next task to evaluate, blocking until there is one, `None` once all tasks are done."""
+        with self._condition:
+            while not self._cancelled and len(self._done) < self._n_tasks:
+                if self._pending:
+                    index = self._pending.pop()
+                    self._started.setdefault(index, time.perf_counter())
+                    self._running[index] += 1
+                    return index
+
+                straggler = self._straggler()
+                if straggler is not None:
+                    self._speculated.add(straggler)
+                    self._running[straggler] += 1
+                    _LOGGER.info(f'Evaluating straggling task `{straggler}` again on an idle worker.')
+                    return straggler
+                self._condition.wait(_POLL_INTERVAL)
+            return None
+
+    def complete(self, index: int, result: Optional[EvaluationResult], error: Optional[str], duration: float) -> None:
+        """Record a result or error of a task, of which only the first one is used."""
+        with self._condition:
+            self._running[index] -= 1
+            if index in self._done:
+                return
+            self._done.add(index)
+            self._durations.append(duration)
+            self.results.put((index, result, error))
+            self._condition.notify_all()
+
+    def requeue(self, index: int) -> None:
+        """Requeue a task whose worker was lost, unless it is done or still evaluated by another worker."""
+        with self._condition:
+            self._running[index] -= 1
+            if index not in self._done and not self._running[index]:
+                self._pending.append(index)
+                self._condition.notify_all()
+
+    def cancel(self) -> None:
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+    def _straggler(self) -> Optional[int]:
+        """Get the longest running task not evaluated speculatively yet, if it runs long enough to be a straggler."""
+        running = [index for index in self._started if index not in self._done and index not in self._speculated]
+        if not running or not self._durations:
+            return None
+
+        index = min(running, key=self._started.__getitem__)
+        threshold = max(self._min_speculation_seconds, self._speculation_factor * statistics.median(self._durations))
+        return index if time.perf_counter() - self._started[index] > threshold else None
@@ -0,0 +1,129 @@
+"""Module to share data with worker processes on the same host through memory-mapped files, instead of pickling it.
+
+The process owning the data writes each array once into a file of a temporary directory, by default in `/dev/shm`
+such that files live in memory, and passes only small picklable handles to workers, which map the files read-only.
+Thus memory of the arrays is shared by all workers and starting a worker costs the same for any size of data.
+
+The directory is removed when the data is closed, when the owning process exits or, if it crashed, by the next
+process sharing data in the same directory, see `SharedData`.
+
+"""
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import NamedTuple, Optional, Tuple
+import weakref
+
+import numpy as np
+
+from ._tasks import EvaluationData
+
+
+_LOGGER = logging.getLogger(__package__)
+_SHARED_DATA_DIRECTORY = os.environ.get('SHARED_DATA_DIRECTORY', '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+_PREFIX = 'kerndisc-shared-'
+_OWNED_DIRECTORY = re.compile(f'^{_PREFIX}(?P<pid>[0-9]+)-')
+
+
+class SharedArray(NamedTuple):
+    """Picklable handle of an array in a memory-mapped file, `path` is `None` for empty arrays, which can not be mapped."""
+
+    path: Optional[str]
+    dtype: str
+    shape: Tuple[int, ...]
+
+    def open(self) -> np.ndarray:
+        """Map the array read-only."""
+        if self.path is None:
+            return np.empty(self.shape, dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode='r', shape=self.shape)
+
+
+class SharedEvaluationData(NamedTuple):
+    """Picklable handle of `EvaluationData` in memory-mapped files."""
+
+    x: SharedArray
+    y: SharedArray
+    noise_weights: Optional[SharedArray]
+
+    def open(self) -> EvaluationData:
+        """Map all arrays read-only."""
+        return EvaluationData(*(None if array is None else array.open() for array in self))
+
+
+class SharedData:
+    """Data written to memory-mapped files, to be shared with worker processes through `handle`.
+
+    Parameters
+    ----------
+    data: EvaluationData
+        Data to share.
+
+    directory: Optional[str]
+        Directory to create the temporary directory of the files in, defaults to the environment variable
+        `SHARED_DATA_DIRECTORY` or `/dev/shm`, if it exists, and the temporary directory of the system otherwise.
+
+    Example
+    -------
+    ```
+        > with SharedData(data) as shared_data:
+        >     pool = ProcessPoolExecutor(initializer=..., initargs=(shared_data.handle,))
+    ```
+
+    """
+
+    def __init__(self, data: EvaluationData, directory: Optional[str]=None) -> None:
+        directory = _SHARED_DATA_DIRECTORY if directory is None else directory
+        _remove_stale_directories(directory)
+        self.directory = tempfile.mkdtemp(prefix=f'{_PREFIX}{os.getpid()}-', dir=directory)
+        # Removes the directory once closed, garbage collected or at exit of the interpreter, whichever comes first.
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+        self.handle = SharedEvaluationData(*(None if array is None else self._share(name, array) for name, array in data._asdict().items()))
+
+    def close(self) -> None:
+        """Remove the files, workers must not map them afterwards."""
+        self._finalizer()
+
+    def __enter__(self) -> 'SharedData':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _share(self, name: str, array: np.ndarray) -> SharedArray:
+        array = np.ascontiguousarray(array)
+        if array.size == 0:
+            return SharedArray(None, array.dtype.str, array.shape)
+
+        path = os.path.join(self.directory, f'{name}.bin')
+        shared_array = np.memmap(path, dtype=array.dtype, mode='w+', shape=array.shape)
+        shared_array[...] = array
+        shared_array.flush()
+        return SharedArray(path, array.dtype.str, array.shape)
+
+
+def _remove_stale_directories(directory: str) -> None:
+    """Remove directories of shared data left behind by processes which crashed."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+
+    for name in names:
+        match = _OWNED_DIRECTORY.match(name)
+        if match and not _is_alive(int(match.group('pid'))):
+            _LOGGER.info(f'Removing shared data `{name}` of crashed process `{match.group("pid")}`.')
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Process of another user.
+        return True
+    return True
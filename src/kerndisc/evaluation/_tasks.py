@@ -0,0 +1,52 @@
+"""Module defining picklable tasks to evaluate kernels, which executors ship to other threads, processes or hosts.
+
+Evaluating a kernel needs the data, which is the same for all kernels of a discovery, and a kernel along with
+options of its evaluation. Thus data is shipped separately as `EvaluationData`, identified by its fingerprint,
+and only once to each worker, while tasks only carry the fingerprint, a serialized AST and small options.
+
+"""
+import hashlib
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+# Optimized parameters, score and evaluation information of a kernel, as yielded by `evaluate_asts`.
+EvaluationResult = Tuple[Dict[str, np.ndarray], float, Dict[str, Any]]
+
+
+class EvaluationData(NamedTuple):
+    """Data kernels are evaluated on, see `evaluate_asts`."""
+
+    x: np.ndarray
+    y: np.ndarray
+    noise_weights: Optional[np.ndarray] = None
+
+    def fingerprint(self) -> str:
+        """Hash of all arrays, identifying the data without shipping it."""
+        digest = hashlib.sha1()
+        for array in self:
+            digest.update(b'-' if array is None else np.ascontiguousarray(array, dtype=float).tobytes())
+        return digest.hexdigest()
+
+
+class EvaluationTask(NamedTuple):
+    """Task to evaluate a single kernel on data with a given fingerprint.
+
+    Attributes
+    ----------
+    fingerprint: str
+        Fingerprint of the `EvaluationData` to evaluate on.
+
+    ast: Dict[str, Any]
+        Kernel to evaluate, as returned by `kerndisc.description.ast_to_dict`.
+
+    options: Dict[str, Any]
+        Keyword arguments of the evaluator, e.g., `add_jitter`, `optimizer_kwargs` and `config`,
+        with `parent_params` only holding the parameters of the parent of this kernel.
+
+    """
+
+    fingerprint: str
+    ast: Dict[str, Any]
+    options: Dict[str, Any]
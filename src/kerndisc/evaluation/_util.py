@@ -1,7 +1,20 @@
 """Module for evaluation utility functions."""
+from collections import defaultdict
+import re
+import sys
+from typing import DefaultDict, Dict, List, Optional, Tuple
+
+from anytree import Node
 import gpflow
 import numpy as np
 
+from ..description import ast_to_kernel, instantiate_model_from_kernel
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, `resource` is unavailable on windows.
+    resource = None
+
 
 def add_jitter_to_model(model: gpflow.models.Model, mean: float=0, sd: float=0.1) -> None:
     """Add randomness (jitter) to a models parameters.
@@ -25,3 +38,115 @@ def add_jitter_to_model(model: gpflow.models.Model, mean: float=0, sd: float=0.1
         model.assign({
             param_pathname: param_value + np.random.normal(loc=mean, scale=sd),
         })
+
+
+def build_model(x: np.ndarray, y: np.ndarray, ast: Node, noise_weights: Optional[np.ndarray]=None,
+                noise_floor: Optional[float]=None, jitter: float=0.,
+                params: Optional[Dict[str, np.ndarray]]=None) -> gpflow.models.GPR:
+    """Build a model from an AST, optionally bounding its likelihood variance from below.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        Function input values `x_1, ..., x_n`, usually time points.
+
+    y: np.ndarray
+        Observed function values `y_1, ..., y_n`.
+
+    ast: Node
+        AST of the kernel of the model.
+
+    noise_weights: Optional[np.ndarray]
+        Weights of the noise variance of each point, homoscedastic noise if `None`.
+
+    noise_floor: Optional[float]
+        Lower bound of the likelihood variance, which keeps the covariance matrix positive definite
+        by at least this much jitter on its diagonal. gpflows default bound if `None`.
+
+    jitter: float
+        Fixed variance added to the diagonal of the covariance matrix.
+
+    params: Optional[Dict[str, np.ndarray]]
+        Initial values of parameters, defaults of gpflow if `None`. They are transferred using `transfer_params`,
+        so they can be those of a model with a different kernel, e.g., a parent. A likelihood variance below
+        `noise_floor` is raised above it.
+
+    Returns
+    -------
+    model: gpflow.models.GPR
+        Compiled model.
+
+    """
+    with gpflow.defer_build():
+        model = instantiate_model_from_kernel(x, y, ast_to_kernel(ast), noise_weights=noise_weights, jitter=jitter)
+
+    if noise_floor is not None:
+        model.likelihood.variance.transform = gpflow.transforms.Log1pe(lower=noise_floor)
+    model.compile()
+
+    if params:
+        params = transfer_params(params, list(model.read_values()))
+        if noise_floor is not None and model.likelihood.variance.pathname in params:
+            params[model.likelihood.variance.pathname] = np.maximum(params[model.likelihood.variance.pathname], 2 * noise_floor)
+        model.assign(params)
+
+    return model
+
+
+def transfer_params(params: Dict[str, np.ndarray], param_names: List[str]) -> Dict[str, np.ndarray]:
+    """Transfer parameters of one model to another model, with a different kernel, e.g., from a parent to its expansion.
+
+    Parameters are matched by the base kernel they belong to and their name, e.g., `rbf/lengthscales`, regardless
+    of where the base kernel is in the kernel. The `i`-th occurrence of a parameter in `param_names` is assigned the
+    value of its `i`-th occurrence in `params`, the likelihood variance is transferred as is.
+
+    Parameters
+    ----------
+    params: Dict[str, np.ndarray]
+        Parameters to transfer, e.g., as returned by `model.read_values()`.
+
+    param_names: List[str]
+        Full names of parameters of the model to transfer to.
+
+    Returns
+    -------
+    transferred_params: Dict[str, np.ndarray]
+        Values of all parameters of `param_names` that have a match in `params`.
+
+    """
+    values_by_key: DefaultDict[Tuple[str, str], List[np.ndarray]] = defaultdict(list)
+    for param_name, param_value in params.items():
+        values_by_key[_param_key(param_name)].append(param_value)
+
+    transferred_params = {}
+    occurrences: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+    for param_name in param_names:
+        key = _param_key(param_name)
+        if occurrences[key] < len(values_by_key[key]):
+            transferred_params[param_name] = values_by_key[key][occurrences[key]]
+        occurrences[key] += 1
+
+    return transferred_params
+
+
+def _param_key(param_name: str) -> Tuple[str, str]:
+    """Get owner and name of a parameter, e.g., `('rbf', 'variance')` for `GPR/kern/sum/rbf_1/variance`."""
+    *_, owner, name = param_name.split('/')
+    return re.sub(r'_\d+$', '', owner), name
+
+
+def get_peak_rss_kb() -> int:
+    """Get peak resident set size (RSS) of the current process in kilobytes.
+
+    Returns
+    -------
+    peak_rss: int
+        Peak RSS of the current process in kilobytes, `0` if it can't be determined on the current platform.
+
+    """
+    if resource is None:
+        return 0
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # `ru_maxrss` is measured in bytes on mac, but in kilobytes on linux.
+    return peak_rss // 1024 if sys.platform == 'darwin' else peak_rss
@@ -3,10 +3,11 @@
 Usage
 -----
 A new metric can be implemented in the `_metrics` module, afterwards it can be imported and
-added to the `_METRICS` dictionary here. Then it can be selected for training by setting the
-environment variable `METRIC` to its name.
+added to the `_METRICS` dictionary here. Then it can be selected for training by passing a `kerndisc.Config`
+with its name as `metric`, or by setting the environment variable `METRIC`, which is used if no configuration is passed.
 
-All metrics MUST be better when lower, i.e., result in a minimization problem.
+All metrics MUST be better when lower, i.e., result in a minimization problem. All metrics MUST accept
+the keyword arguments `objective` and `parameter_count`, see `_metrics` for details.
 
 Example
 -------
@@ -19,40 +20,76 @@ To score a model, run:
 
 
 """
+import logging
 import os
+from typing import Optional
 
 import gpflow
 
 from ._metrics import (bayesian_information_criterion,
                        bayesian_information_criterion_duvenaud,
+                       k_fold_cross_validation,
+                       leave_one_out_cross_validation,
                        negative_log_likelihood)
+from ._util import get_parameter_count_ast
+from ..._config import _STANDARD_METRIC, Config
 
 
-_STANDARD_METRIC = 'bayesian_information_criterion'
+_LOGGER = logging.getLogger(__package__)
 _METRICS = {
     'negative_log_likelihood': negative_log_likelihood,
     'bayesian_information_criterion': bayesian_information_criterion,
     'bayesian_information_criterion_duvenaud': bayesian_information_criterion_duvenaud,
+    'leave_one_out_cross_validation': leave_one_out_cross_validation,
+    'k_fold_cross_validation': k_fold_cross_validation,
 }
+# Metric selected via environment at import time, kept for backwards compatibility. Prefer passing a `Config`.
 SELECTED_METRIC_NAME = os.environ.get('METRIC', _STANDARD_METRIC)
 
+__all__ = [
+    'get_parameter_count_ast',
+    'score_model',
+    'SELECTED_METRIC_NAME',
+]
 
-def score_model(model: gpflow.models.Model) -> float:
-    """Score a model using the currently selected metric.
 
-    Metric for scoring can be selected by setting the environment variable `METRIC` to one of
-    the metrics available here. This can also be used to add a custom metric.
+def score_model(model: gpflow.models.Model, objective: Optional[float]=None, parameter_count: Optional[int]=None,
+                config: Optional[Config]=None) -> float:
+    """Score a model using the configured metric.
+
+    Metric for scoring can be selected by passing a configuration or by setting the environment variable `METRIC`
+    to one of the metrics available here. This can also be used to add a custom metric.
 
     Parameters
     ----------
     model: gpflow.models.Model
         Model to be scored using the selected metric.
 
+    objective: Optional[float]
+        Known negative log likelihood of `model`, e.g., the final objective value of its optimization.
+        Saves recomputing it, if passed.
+
+    parameter_count: Optional[int]
+        Known count of parameters of `model`. Saves counting them, if passed.
+
+    config: Optional[Config]
+        Configuration selecting the metric, read from the environment if `None`.
+
     Returns
     -------
     score: float
-        Score calculated by metric selected via environment variable `METRIC`.
+        Score calculated by the configured metric.
+
+    Raises
+    ------
+    ValueError
+        If the configured metric does not exist.
 
     """
-    _score = _METRICS[SELECTED_METRIC_NAME]
-    return _score(model)
+    metric_name = (config or Config.from_environment()).metric
+    if metric_name not in _METRICS:
+        _LOGGER.exception(f'Unknown metric `{metric_name}`, available are `{list(_METRICS)}`.')
+        raise ValueError(f'Unknown metric `{metric_name}`.')
+
+    _score = _METRICS[metric_name]
+    return _score(model, objective=objective, parameter_count=parameter_count)
@@ -1,11 +1,29 @@
-"""Module to maintain all metrics that are available to score models."""
+"""Module to maintain all metrics that are available to score models.
+
+All metrics take a model and optionally:
+    * `objective`: The negative log likelihood of the model at its current parameters, usually the final objective
+      value of its optimization. It is computed from the model if not passed.
+    * `parameter_count`: The count of parameters of the model, it is counted from the model if not passed.
+
+Passing these avoids recomputing values already known after optimization, most notably the `O(n^3)` Cholesky
+decomposition required to calculate the log likelihood.
+
+"""
+import logging
+from typing import Optional
+
 import gpflow
 import numpy as np
+from scipy.linalg import solve_triangular
 
-from ._util import get_prod_count_kernel
+from ._util import get_inverse_covariance_and_alpha, get_prod_count_kernel
 
 
-def negative_log_likelihood(model: gpflow.models.Model) -> float:
+_K_FOLDS = 10
+_LOGGER = logging.getLogger(__package__)
+
+
+def negative_log_likelihood(model: gpflow.models.Model, objective: Optional[float]=None, parameter_count: Optional[int]=None) -> float:
     r"""Calculate the negative logarithmic likelihood of a model.
 
     Uses gpflow method `compute_log_likelihood`, which returns:
@@ -17,21 +35,31 @@ def negative_log_likelihood(model: gpflow.models.Model) -> float:
 
     We then negate `LL` in order to obtain the negative log likelihood.
 
+    If `objective` is passed, it is returned instead.
+
     Parameters
     ----------
     model: gpflow.models.Model
         Model to be scored.
 
+    objective: Optional[float]
+        Known negative log likelihood of `model`.
+
+    parameter_count: Optional[int]
+        Unused, accepted to share the signature of all metrics.
+
     Returns
     -------
     score: float
         Negative logarithmic likelihood score of the passed model.
 
     """
+    if objective is not None:
+        return objective
     return -model.compute_log_likelihood()
 
 
-def bayesian_information_criterion(model: gpflow.models.Model) -> float:
+def bayesian_information_criterion(model: gpflow.models.Model, objective: Optional[float]=None, parameter_count: Optional[int]=None) -> float:
     """Calculate the bayesian information criterion (BIC) value of a model.
 
     Calculate:
@@ -48,17 +76,26 @@ def bayesian_information_criterion(model: gpflow.models.Model) -> float:
     model: gpflow.models.Model
         Model to be scored.
 
+    objective: Optional[float]
+        Known negative log likelihood of `model`.
+
+    parameter_count: Optional[int]
+        Known count of parameters of `model`.
+
     Returns
     -------
     score: float
         BIC score of the passed model.
 
     """
-    # `model.parameters` returns a generator, thus we have to exhaust it first.
-    return 2 * negative_log_likelihood(model) + len(list(model.parameters)) * np.log(model.X.shape[0])
+    if parameter_count is None:
+        # `model.parameters` returns a generator, thus we have to exhaust it first.
+        parameter_count = len(list(model.parameters))
+    return 2 * negative_log_likelihood(model, objective=objective) + parameter_count * np.log(model.X.shape[0])
 
 
-def bayesian_information_criterion_duvenaud(model: gpflow.models.Model) -> float:
+def bayesian_information_criterion_duvenaud(model: gpflow.models.Model, objective: Optional[float]=None,
+                                            parameter_count: Optional[int]=None) -> float:
     """Calculate the bayesian information criterion (BIC) value of a model.
 
     Here Duvenauds BIC is defined as:
@@ -85,13 +122,122 @@ def bayesian_information_criterion_duvenaud(model: gpflow.models.Model) -> float
     model: gpflow.models.Model
         Model to be scored.
 
+    objective: Optional[float]
+        Known negative log likelihood of `model`.
+
+    parameter_count: Optional[int]
+        Known count of parameters of `model`.
+
     Returns
     -------
     score: float
         Duvenaud D_BIC score of the passed model.
 
     """
-    effective_theta_cnt = len(list(model.parameters)) - 1  # Minus 1 for variance of likelihood.
+    if parameter_count is None:
+        parameter_count = len(list(model.parameters))
+    effective_theta_cnt = parameter_count - 1  # Minus 1 for variance of likelihood.
 
     effective_theta_cnt -= get_prod_count_kernel(model.kern) - 1
-    return 2 * negative_log_likelihood(model) + effective_theta_cnt * np.log(model.X.shape[0])
+    return 2 * negative_log_likelihood(model, objective=objective) + effective_theta_cnt * np.log(model.X.shape[0])
+
+
+def leave_one_out_cross_validation(model: gpflow.models.GPR, objective: Optional[float]=None, parameter_count: Optional[int]=None) -> float:
+    r"""Calculate the negative leave one out (LOO) predictive log probability of a GPR model.
+
+    The LOO predictive distributions are calculated in closed form, see Rasmussen and Williams, section 5.4.2.
+    With `K_inv = (K + s^2 * I)^-1` and `alpha = K_inv * y`:
+    ```
+        mu_i = y_i - alpha_i / K_inv_ii,
+        sigma_i^2 = 1 / K_inv_ii,
+        LOO = \sum_i \log p(y_i | y_{-i}, theta) = \sum_i -0.5 * \log(sigma_i^2) - (y_i - mu_i)^2 / (2 * sigma_i^2) - 0.5 * \log(2 * pi)
+    ```
+    Parameters `theta` are the ones trained on all data points, which is why the cost of this metric is a single Cholesky
+    decomposition of the models covariance matrix. `LOO` is negated to obtain a minimization problem.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        Model to be scored.
+
+    objective: Optional[float]
+        Unused, accepted to share the signature of all metrics.
+
+    parameter_count: Optional[int]
+        Unused, accepted to share the signature of all metrics.
+
+    Returns
+    -------
+    score: float
+        Negative LOO predictive log probability of the passed model, `np.Inf` if its covariance matrix is not positive definite.
+
+    """
+    try:
+        inverse_covariance, alpha = get_inverse_covariance_and_alpha(model)
+    except np.linalg.LinAlgError:
+        _LOGGER.debug('Cholesky decomposition failed while calculating LOO predictive log probability.')
+        return np.Inf
+
+    inverse_covariance_diagonal = np.diag(inverse_covariance)
+    log_predictive_probabilities = 0.5 * np.log(inverse_covariance_diagonal) - 0.5 * alpha[:, 0] ** 2 / inverse_covariance_diagonal
+    log_predictive_probabilities -= 0.5 * np.log(2 * np.pi)
+    return float(-log_predictive_probabilities.sum())
+
+
+def k_fold_cross_validation(model: gpflow.models.GPR, objective: Optional[float]=None, parameter_count: Optional[int]=None,
+                            k: int=_K_FOLDS) -> float:
+    r"""Calculate the negative `k`-fold cross validation predictive log probability of a GPR model.
+
+    Data points are split into `k` contiguous folds `I_1, ..., I_k`. The predictive distribution of each fold,
+    conditioned on all other folds, is calculated in closed form by block inverse updates of the full inverse
+    covariance matrix `K_inv = (K + s^2 * I)^-1`, with `alpha = K_inv * y`:
+    ```
+        mu_I = y_I - (K_inv_II)^-1 * alpha_I,
+        Sigma_I = (K_inv_II)^-1,
+        CV = \sum_I \log N(y_I | mu_I, Sigma_I)
+           = \sum_I -0.5 * alpha_I^T * (K_inv_II)^-1 * alpha_I + 0.5 * \log|K_inv_II| - |I| / 2 * \log(2 * pi)
+    ```
+    Only a single Cholesky decomposition of the full covariance matrix and one of each `(n / k, n / k)` block of
+    its inverse is required, instead of `k` model fits. As with `leave_one_out_cross_validation`, parameters `theta`
+    are the ones trained on all data points. `CV` is negated to obtain a minimization problem.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        Model to be scored.
+
+    objective: Optional[float]
+        Unused, accepted to share the signature of all metrics.
+
+    parameter_count: Optional[int]
+        Unused, accepted to share the signature of all metrics.
+
+    k: int
+        Number of folds, capped at the number of data points.
+
+    Returns
+    -------
+    score: float
+        Negative `k`-fold predictive log probability of the passed model, `np.Inf` if its covariance matrix is not
+        positive definite.
+
+    """
+    try:
+        inverse_covariance, alpha = get_inverse_covariance_and_alpha(model)
+    except np.linalg.LinAlgError:
+        _LOGGER.debug('Cholesky decomposition failed while calculating k-fold predictive log probability.')
+        return np.Inf
+
+    log_predictive_probability = 0.
+    for fold in np.array_split(np.arange(alpha.shape[0]), min(k, alpha.shape[0])):
+        try:
+            fold_cholesky = np.linalg.cholesky(inverse_covariance[np.ix_(fold, fold)])
+        except np.linalg.LinAlgError:
+            _LOGGER.debug('Cholesky decomposition of a fold failed while calculating k-fold predictive log probability.')
+            return np.Inf
+        # `alpha_I^T * (K_inv_II)^-1 * alpha_I = |L^-1 * alpha_I|^2` with `K_inv_II = L * L^T`.
+        whitened_alpha = solve_triangular(fold_cholesky, alpha[fold], lower=True)
+        log_predictive_probability += -0.5 * np.sum(whitened_alpha ** 2) + np.sum(np.log(np.diag(fold_cholesky)))
+        log_predictive_probability -= 0.5 * fold.shape[0] * np.log(2 * np.pi)
+
+    return float(-log_predictive_probability)
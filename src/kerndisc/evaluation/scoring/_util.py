@@ -1,5 +1,15 @@
 """Module for scoring utility functions."""
+from typing import Dict, Tuple, Type
+
+from anytree import Node
 import gpflow
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from ...description import get_noise_variances
+
+
+_BASE_KERNEL_PARAMETER_COUNTS: Dict[Type[gpflow.kernels.Kernel], int] = {}
 
 
 def get_prod_count_kernel(kernel: gpflow.kernels.Kernel) -> int:
@@ -18,3 +28,61 @@ def get_prod_count_kernel(kernel: gpflow.kernels.Kernel) -> int:
     if isinstance(kernel, gpflow.kernels.Sum):
         return sum(get_prod_count_kernel(k) for k in kernel.children.values())
     return 0
+
+
+def get_parameter_count_ast(ast: Node) -> int:
+    """Get count of parameters of a GPR model using the kernel represented by an AST.
+
+    Counts the same parameters as `len(list(model.parameters))` would, i.e., those of each base kernel
+    plus the variance of the models likelihood. Parameter counts of base kernels are cached per kernel
+    class, such that no kernel or model has to be built or walked through to count parameters.
+
+    Parameters
+    ----------
+    ast: Node
+        AST of the kernel, as generated by `kernel_to_ast`.
+
+    Returns
+    -------
+    parameter_count: int
+        Count of parameters of a GPR model with the kernel represented by `ast`.
+
+    """
+    return 1 + sum(_get_parameter_count_base_kernel(leaf.name) for leaf in ast.leaves)
+
+
+def _get_parameter_count_base_kernel(kernel_class: Type[gpflow.kernels.Kernel]) -> int:
+    """Get count of parameters of a base kernel class, instantiating it only once."""
+    if kernel_class not in _BASE_KERNEL_PARAMETER_COUNTS:
+        with gpflow.defer_build():
+            _BASE_KERNEL_PARAMETER_COUNTS[kernel_class] = len(list(kernel_class(1).parameters))
+    return _BASE_KERNEL_PARAMETER_COUNTS[kernel_class]
+
+
+def get_inverse_covariance_and_alpha(model: gpflow.models.GPR) -> Tuple[np.ndarray, np.ndarray]:
+    """Get inverse covariance matrix `(K + s^2 * I)^-1` and `alpha = (K + s^2 * I)^-1 * y` of a GPR model.
+
+    Both are calculated from a single Cholesky decomposition of the models covariance matrix,
+    at the models current parameters. For models with noise weights `s^2 * I` is `s^2 * diag(1 / w)`.
+
+    Parameters
+    ----------
+    model: gpflow.models.GPR
+        GPR model, usually trained.
+
+    Returns
+    -------
+    inverse_covariance, alpha: Tuple[np.ndarray, np.ndarray]
+        Inverse of covariance matrix of shape `(n, n)` and `alpha` of shape `(n, 1)`.
+
+    Raises
+    ------
+    np.linalg.LinAlgError
+        If the covariance matrix is not positive definite.
+
+    """
+    x, y = model.X.read_value(), model.Y.read_value()
+    covariance = model.kern.compute_K_symm(x) + np.diag(get_noise_variances(model))
+
+    cholesky = cho_factor(covariance, lower=True)
+    return cho_solve(cholesky, np.eye(x.shape[0])), cho_solve(cholesky, y)
@@ -14,11 +14,18 @@ To expand a kernel run:
 
 A `k_ast_n` is any valid gpflow kernel ast generated by the `description` package.
 
+Expansions are memoized, to drop all memoized expansions run:
+```
+    > from kerndisc.expansion import clear_expansion_cache
+    > clear_expansion_cache()
+```
+
 More examples and a deeper explanation of this can be found in the `grammars` package.
 
 """
-from ._expand import expand_asts
+from ._expand import clear_expansion_cache, expand_asts
 
 __all__ = [
+    'clear_expansion_cache',
     'expand_asts',
 ]
@@ -1,26 +1,38 @@
 """Module for kernel expansion."""
+from collections import OrderedDict
+from copy import deepcopy
 import logging
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
 
 from anytree import Node
 import gpflow
 
-from .grammars import expand_kernel, SELECTED_GRAMMAR_NAME
+from .grammars import expand_kernel
+from .._config import Config
+from .._profiling import timed
 from ..description import ast_to_kernel, ast_to_text, kernel_to_ast, simplify
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .._prior import StructurePrior
+
+_EXPANSION_CACHE: 'OrderedDict[Tuple[str, str, Hashable], List[Node]]' = OrderedDict()
+_EXPANSION_CACHE_SIZE = int(os.environ.get('EXPANSION_CACHE_SIZE', 1024))
 _LOGGER = logging.getLogger(__package__)
 
 
 @gpflow.defer_build()
-def expand_asts(asts: List[Node], grammar_kwargs: Optional[Dict[str, Any]]=None) -> List[Node]:
+def expand_asts(asts: List[Node], grammar_kwargs: Optional[Dict[str, Any]]=None, timings: Optional[Dict[str, float]]=None,
+                config: Optional[Config]=None, parents: Optional[Dict[str, str]]=None,
+                structure_prior: Optional['StructurePrior']=None) -> List[Node]:
     """Expand each kernel, represented as an AST, of a list into all its possible expansions allowed by grammar.
 
     This method transparently abstracts from ASTs to gpflow kernels. This way a new grammar can
     be implemented by using addition and multiplication, without having to hassle with tree
     operations.
 
-    Kernels are expanded by the grammar selected via the environment variable `GRAMMAR`. Default grammar is `duvenaud`,
-    as defined by Duvenaud et al., see `grammars` package for more info.
+    Kernels are expanded by the grammar selected via `config`, or the environment variable `GRAMMAR` if no configuration
+    is passed. Default grammar is `duvenaud`, as defined by Duvenaud et al., see `grammars` package for more info.
 
     Kernels expanded by this method are not built at runtime, to speed up expansion. Kernels built by this
     method are deduplicated at the end, this happens in two steps:
@@ -28,6 +40,10 @@ def expand_asts(asts: List[Node], grammar_kwargs: Optional[Dict[str, Any]]=None)
     * converting them to a textual representation and adding a new `kernel_name: kernel_ast` entry to a dict,
       deduplicating over iterations.
 
+    Expansions are memoized per canonical AST, selected grammar and `grammar_kwargs` in a bounded LRU cache,
+    so re-expanding a kernel, e.g., the leader of a greedy search, is free. The size of the cache can be set via
+    the environment variable `EXPANSION_CACHE_SIZE`, a size of `0` disables caching.
+
     Parameters
     ----------
     asts: List[Node]
@@ -37,19 +53,135 @@ def expand_asts(asts: List[Node], grammar_kwargs: Optional[Dict[str, Any]]=None)
         Options to be passed to grammars, to allow different configurations for manually implemented
         grammars.
 
+    timings: Optional[Dict[str, float]]
+        If passed, time spent simplifying expanded ASTs is added to `timings['simplification']`.
+
+    config: Optional[Config]
+        Configuration selecting the grammar, read from the environment if `None`.
+
+    parents: Optional[Dict[str, str]]
+        If passed, the text of the first kernel of `asts` each expanded kernel was expanded from is added to it,
+        by text of the expanded kernel.
+
+    structure_prior: Optional[StructurePrior]
+        If passed, expanded kernels are ordered by their probability to win under this prior, most probable first,
+        and those below its risk threshold are dropped, see `kerndisc.StructurePrior`.
+
     Returns
     -------
     expanded_kernels: List[Node]
         All possible alterations of kernel ASTs initially passed to method, according to rules of kernel grammar.
 
     """
-    _LOGGER.debug(f'Expanding ASTs:\n`{asts}`,\nusing grammar `{SELECTED_GRAMMAR_NAME}`.')
+    config = config or Config.from_environment()
+    _LOGGER.debug(f'Expanding ASTs:\n`{asts}`,\nusing grammar `{config.grammar}`.')
 
+    parents = {} if parents is None else parents
     expanded_kernels = {}
     for ast in asts:
-        kernel = ast_to_kernel(ast)
-        for kernel_alteration in expand_kernel(kernel, grammar_kwargs=grammar_kwargs):
-            ast = simplify(kernel_to_ast(kernel_alteration))
-            expanded_kernels[ast_to_text(ast)] = ast
+        for expanded_ast in _expand_ast(ast, config, grammar_kwargs=grammar_kwargs, timings=timings):
+            expanded_kernels[ast_to_text(expanded_ast)] = expanded_ast
+            parents.setdefault(ast_to_text(expanded_ast), ast_to_text(ast))
 
+    if structure_prior is not None:
+        return structure_prior.rank(list(expanded_kernels.values()), parents)
     return list(expanded_kernels.values())
+
+
+def clear_expansion_cache() -> None:
+    """Remove all memoized expansions."""
+    _EXPANSION_CACHE.clear()
+
+
+def _expand_ast(ast: Node, config: Config, grammar_kwargs: Optional[Dict[str, Any]]=None,
+                timings: Optional[Dict[str, float]]=None) -> List[Node]:
+    """Expand a single AST, using memoized expansions if available.
+
+    Cached ASTs are never handed out directly, only copies of them, such that callers are free
+    to alter returned ASTs.
+
+    Parameters
+    ----------
+    ast: Node
+        Kernel AST to be expanded.
+
+    config: Config
+        Configuration selecting the grammar.
+
+    grammar_kwargs: Optional[Dict[str, Any]]
+        Options to be passed to grammars.
+
+    timings: Optional[Dict[str, float]]
+        If passed, time spent simplifying expanded ASTs is added to `timings['simplification']`.
+
+    Returns
+    -------
+    expanded_asts: List[Node]
+        Simplified and deduplicated expansions of `ast`.
+
+    """
+    try:
+        cache_key: Optional[Tuple[str, str, Hashable]] = (config.grammar, _canonical_ast_key(ast), _freeze(grammar_kwargs or {}))
+        hash(cache_key)
+    except TypeError:
+        _LOGGER.debug(f'Passed grammar kwargs `{grammar_kwargs}` are not hashable, expansion is not cached.')
+        cache_key = None
+
+    if cache_key is not None and cache_key in _EXPANSION_CACHE:
+        _EXPANSION_CACHE.move_to_end(cache_key)
+        return deepcopy(_EXPANSION_CACHE[cache_key])
+
+    expanded_asts = {}
+    for kernel_alteration in expand_kernel(ast_to_kernel(ast), grammar_kwargs=grammar_kwargs, config=config):
+        with timed(timings, 'simplification'):
+            expanded_ast = simplify(kernel_to_ast(kernel_alteration))
+        expanded_asts[ast_to_text(expanded_ast)] = expanded_ast
+
+    if cache_key is not None and _EXPANSION_CACHE_SIZE > 0:
+        _EXPANSION_CACHE[cache_key] = deepcopy(list(expanded_asts.values()))
+        while len(_EXPANSION_CACHE) > _EXPANSION_CACHE_SIZE:
+            _EXPANSION_CACHE.popitem(last=False)
+
+    return list(expanded_asts.values())
+
+
+def _canonical_ast_key(node: Node) -> str:
+    """Generate a canonical key of an AST.
+
+    Unlike `ast_to_text`, this key keeps nesting of sums and products intact, as a grammar
+    might split `(a + b) + c` differently than `a + b + c`. Children are sorted, so that
+    commutative reorderings share the same key.
+
+    Parameters
+    ----------
+    node: Node
+        Node of AST. Key will be generated from this node down.
+
+    Returns
+    -------
+    key: str
+        Canonical key of AST.
+
+    """
+    if node.is_leaf:
+        return node.name.__name__.lower()
+    return f'{node.name.__name__.lower()}({", ".join(sorted(_canonical_ast_key(child) for child in node.children))})'
+
+
+def _freeze(value: Any) -> Hashable:
+    """Recursively turn dicts, lists and sets into hashable equivalents.
+
+    Raises
+    ------
+    TypeError
+        If `value` contains unhashable objects that cannot be frozen.
+
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(val) for val in value)
+    hash(value)
+    return value
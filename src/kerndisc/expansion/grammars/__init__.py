@@ -11,11 +11,13 @@ The new module MUST offer:
       The base kernels in this list represent all kernels implemented by the respective grammar.
 
 After creation of the module, it can be imported here and added to the `_GRAMMARS` dictionary.
-Then it can be selected for execution by setting the environment variable `GRAMMAR`.
+Then it can be selected for execution by passing a `kerndisc.Config` with its name as `grammar`, or by
+setting the environment variable `GRAMMAR`, which is used if no configuration is passed.
 
 For an example of a grammar module see `_grammar_duvenaud.py`.
 
 """
+import logging
 import os
 from typing import Any, Callable, Dict, List, Optional
 
@@ -23,6 +25,7 @@ import gpflow
 
 from ._grammar_duvenaud import (expand_kernel as expand_kernel_duvenaud,
                                 IMPLEMENTED_BASE_KERNEL_NAMES as IMPLEMENTED_BASE_KERNEL_NAMES_DUVENAUD)
+from ..._config import Config
 
 
 _GRAMMARS: Dict[str, Dict[str, Callable]] = {
@@ -31,12 +34,32 @@ _GRAMMARS: Dict[str, Dict[str, Callable]] = {
         'IMPLEMENTED_BASE_KERNEL_NAMES': IMPLEMENTED_BASE_KERNEL_NAMES_DUVENAUD,
     },
 }
+_LOGGER = logging.getLogger(__package__)
+# Grammar selected via environment at import time, kept for backwards compatibility. Prefer passing a `Config`.
 SELECTED_GRAMMAR_NAME = os.environ.get('GRAMMAR', 'duvenaud')
 IMPLEMENTED_BASE_KERNEL_NAMES = _GRAMMARS[SELECTED_GRAMMAR_NAME]['IMPLEMENTED_BASE_KERNEL_NAMES']
 
 
-def expand_kernel(kernel: gpflow.kernels.Kernel, grammar_kwargs: Optional[Dict[str, Any]]=None) -> List[gpflow.kernels.Kernel]:
-    """Expand a kernel using the currently selected grammar.
+def get_implemented_base_kernel_names(config: Optional[Config]=None) -> List[str]:
+    """Get names of all base kernels implemented by the configured grammar.
+
+    Parameters
+    ----------
+    config: Optional[Config]
+        Configuration selecting the grammar, read from the environment if `None`.
+
+    Returns
+    -------
+    base_kernel_names: List[str]
+        Names of base kernels, keys of `BASE_KERNELS`.
+
+    """
+    return _get_grammar(config)['IMPLEMENTED_BASE_KERNEL_NAMES']
+
+
+def expand_kernel(kernel: gpflow.kernels.Kernel, grammar_kwargs: Optional[Dict[str, Any]]=None,
+                  config: Optional[Config]=None) -> List[gpflow.kernels.Kernel]:
+    """Expand a kernel using the configured grammar.
 
     Expand takes a kernel, such as `white * constant` and returns
     all possible one step alterations of the kernel, using the current grammar.
@@ -54,6 +77,9 @@ def expand_kernel(kernel: gpflow.kernels.Kernel, grammar_kwargs: Optional[Dict[s
         Options to be passed to grammars, to allow different configurations for manually implemented
         grammars.
 
+    config: Optional[Config]
+        Configuration selecting the grammar, read from the environment if `None`.
+
     Returns
     -------
     kernel_alterations: List[gpflow.kernels.Kernel]
@@ -63,5 +89,21 @@ def expand_kernel(kernel: gpflow.kernels.Kernel, grammar_kwargs: Optional[Dict[s
     if grammar_kwargs is None:
         grammar_kwargs = {}
 
-    _expand = _GRAMMARS[SELECTED_GRAMMAR_NAME]['expand_kernel']
+    _expand = _get_grammar(config)['expand_kernel']
     return _expand(kernel, **grammar_kwargs)
+
+
+def _get_grammar(config: Optional[Config]=None) -> Dict[str, Any]:
+    """Get the grammar selected by a configuration.
+
+    Raises
+    ------
+    ValueError
+        If the selected grammar does not exist.
+
+    """
+    grammar_name = (config or Config.from_environment()).grammar
+    if grammar_name not in _GRAMMARS:
+        _LOGGER.exception(f'Unknown grammar `{grammar_name}`, available are `{list(_GRAMMARS)}`.')
+        raise ValueError(f'Unknown grammar `{grammar_name}`.')
+    return _GRAMMARS[grammar_name]
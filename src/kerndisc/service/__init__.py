@@ -0,0 +1,34 @@
+"""Package to run kernel discovery as a local service.
+
+This package provides:
+    * The `DiscoveryService`, an HTTP API to submit jobs, query their status, progress and results and to cancel them,
+      running jobs in a pool of worker processes, which keep tensorflow and gpflow imported between jobs,
+    * the `JobStore`, a SQLite database serving as job queue and result store, needing no external broker.
+
+Importing this package does not import tensorflow or gpflow, only workers do.
+
+Example
+-------
+To run the service with four workers, run:
+```
+    > python -m kerndisc.service --database jobs.sqlite --workers 4 --port 8000
+```
+
+Then submit a discovery, poll its status and fetch its result:
+```
+    > curl -X POST localhost:8000/jobs -d '{"kind": "discover", "x": [...], "y": [...], "kwargs": {"search_depth": 3}}'
+    {"id": "..."}
+    > curl localhost:8000/jobs/<id>
+    > curl localhost:8000/jobs/<id>/result
+```
+
+Running jobs are cancelled by `DELETE /jobs/<id>`. For all endpoints see `_service`, for all kinds of jobs see `_worker`.
+
+"""
+from ._service import DiscoveryService
+from ._store import JobStore
+
+__all__ = [
+    'DiscoveryService',
+    'JobStore',
+]
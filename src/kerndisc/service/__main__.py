@@ -0,0 +1,25 @@
+"""Run the discovery service until interrupted, see `kerndisc.service`."""
+import argparse
+
+from ._service import DiscoveryService
+from .. import configure_logging
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m kerndisc.service', description='Run the local kernel discovery service.')
+    parser.add_argument('--database', default='kerndisc-jobs.sqlite', help='SQLite database used as job queue and result store.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes, defaults to environment variable `CORES`.')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to.')
+    parser.add_argument('--port', type=int, default=8000, help='Port to bind to.')
+    args = parser.parse_args()
+
+    configure_logging()
+    with DiscoveryService(args.database, n_workers=args.workers, host=args.host, port=args.port) as service:
+        try:
+            service.wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
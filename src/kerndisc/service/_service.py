@@ -0,0 +1,204 @@
+"""Module to run the discovery service, an HTTP API in front of a job store and a pool of worker processes.
+
+The API accepts and returns JSON:
+    * `POST /jobs`: Submit a job of the form `{"kind": ..., "x": [...], "y": [...], "kwargs": {...}}`, see `_worker`.
+      Responds `201` with `{"id": ...}`, `400` if the job is malformed.
+    * `GET /jobs/<id>`: Status and progress of a job, see `JobStore.status`.
+    * `GET /jobs/<id>/result`: Result of a job, `409` if it is not done.
+    * `DELETE /jobs/<id>`: Cancel a job, responds `202` with its status afterwards.
+    * `GET /health`: Number of alive workers.
+
+"""
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ._store import JobStore
+from ._worker import check_job, run_worker
+from .._config import Config
+
+
+_JOB_PATH = re.compile(r'^/jobs/(?P<job_id>[0-9a-f]{32})(?P<result>/result)?$')
+_LOGGER = logging.getLogger(__package__)
+_SUPERVISION_INTERVAL = float(os.environ.get('SERVICE_SUPERVISION_INTERVAL', 1.))
+
+
+class DiscoveryService:
+    """Local discovery service, running jobs submitted over HTTP in a pool of worker processes.
+
+    Workers are spawned when the service starts and import tensorflow and gpflow once, such that jobs
+    do not pay for it. A supervising thread replaces workers that die, failing the job they were running.
+
+    Parameters
+    ----------
+    database_path: str
+        Path of the SQLite database used as job queue and result store. Queued jobs of a previous service
+        using the same database are run as well.
+
+    n_workers: Optional[int]
+        Number of worker processes, defaults to `cores` of the configuration read from the environment.
+
+    host: str
+        Host to bind the HTTP API to, local only by default.
+
+    port: int
+        Port to bind the HTTP API to, `0` picks a free port, see `url`.
+
+    poll_interval: float
+        Seconds idle workers wait before polling the queue again.
+
+    Example
+    -------
+    ```
+        > with DiscoveryService('jobs.sqlite', n_workers=4) as service:
+        >     print(f'Serving at `{service.url}`.')
+        >     service.wait()
+    ```
+
+    """
+
+    def __init__(self, database_path: str, n_workers: Optional[int]=None, host: str='127.0.0.1', port: int=0,
+                 poll_interval: float=0.1) -> None:
+        self.store = JobStore(database_path)
+        self.n_workers = Config.from_environment().cores if n_workers is None else n_workers
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context('spawn')
+        self._stop_event = self._context.Event()
+        self._workers: Dict[str, multiprocessing.Process] = {}
+        self._n_started_workers = 0
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.store = self.store
+        self._server.alive_worker_count = self._alive_worker_count
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'DiscoveryService':
+        """Start workers, their supervision and the HTTP API."""
+        for _ in range(self.n_workers):
+            self._start_worker()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._supervise, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        _LOGGER.info(f'Discovery service with `{self.n_workers}` workers is serving at `{self.url}`.')
+        return self
+
+    def stop(self, timeout: Optional[float]=None) -> None:
+        """Stop the HTTP API and all workers, waiting at most `timeout` seconds for workers to finish their current job.
+
+        Workers still running after `timeout` are terminated and their jobs failed.
+
+        """
+        self._stop_event.set()
+        self._server.shutdown()
+        self._server.server_close()
+        for worker_id, worker in self._workers.items():
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+                self.store.fail_running_jobs(worker_id, 'Worker was terminated when stopping the service.')
+        for thread in self._threads:
+            thread.join()
+
+    def wait(self) -> None:
+        """Block until the service is stopped, e.g., by a `KeyboardInterrupt`."""
+        self._stop_event.wait()
+
+    def __enter__(self) -> 'DiscoveryService':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _start_worker(self) -> None:
+        worker_id = f'worker-{self._n_started_workers}'
+        self._n_started_workers += 1
+        worker = self._context.Process(target=run_worker, args=(self.store.path, worker_id, self._stop_event, self.poll_interval),
+                                       name=worker_id, daemon=True)
+        worker.start()
+        self._workers[worker_id] = worker
+
+    def _supervise(self) -> None:
+        """Replace dead workers until the service stops, failing the job each of them was running."""
+        while not self._stop_event.wait(_SUPERVISION_INTERVAL):
+            for worker_id, worker in list(self._workers.items()):
+                if worker.is_alive():
+                    continue
+                _LOGGER.warning(f'Worker `{worker_id}` died with exit code `{worker.exitcode}`, replacing it.')
+                self.store.fail_running_jobs(worker_id, f'Worker died with exit code `{worker.exitcode}`.')
+                del self._workers[worker_id]
+                self._start_worker()
+
+    def _alive_worker_count(self) -> int:
+        return sum(worker.is_alive() for worker in list(self._workers.values()))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler serving the API of the discovery service, for the `store` of its server."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == '/health':
+            return self._respond(HTTPStatus.OK, {'workers': self.server.alive_worker_count()})
+
+        match = _JOB_PATH.match(self.path)
+        status = self.server.store.status(match.group('job_id')) if match else None
+        if status is None:
+            return self._respond(HTTPStatus.NOT_FOUND, {'error': 'Unknown job.'})
+        if not match.group('result'):
+            return self._respond(HTTPStatus.OK, status)
+
+        result = self.server.store.result(status['id'])
+        if result is None:
+            return self._respond(HTTPStatus.CONFLICT, {'error': f'Job is `{status["status"]}`.'})
+        self._respond(HTTPStatus.OK, raw_body=result.encode())
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path != '/jobs':
+            return self._respond(HTTPStatus.NOT_FOUND, {'error': 'Unknown path.'})
+
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            kind, payload = _split_job(job)
+            check_job(kind, payload)
+        except ValueError as error:
+            return self._respond(HTTPStatus.BAD_REQUEST, {'error': str(error)})
+        self._respond(HTTPStatus.CREATED, {'id': self.server.store.submit(kind, payload)})
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        match = _JOB_PATH.match(self.path)
+        status = self.server.store.cancel(match.group('job_id')) if match and not match.group('result') else None
+        if status is None:
+            return self._respond(HTTPStatus.NOT_FOUND, {'error': 'Unknown job.'})
+        self._respond(HTTPStatus.ACCEPTED, {'status': status})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        _LOGGER.debug(format % args)
+
+    def _respond(self, status: HTTPStatus, body: Optional[Dict[str, Any]]=None, raw_body: Optional[bytes]=None) -> None:
+        raw_body = raw_body if raw_body is not None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw_body)))
+        self.end_headers()
+        self.wfile.write(raw_body)
+
+
+def _split_job(job: Any) -> Tuple[str, Dict[str, Any]]:
+    """Split a submitted job into its kind and payload."""
+    if not isinstance(job, dict):
+        raise ValueError('Jobs must be objects.')
+    payload = dict(job)
+    return str(payload.pop('kind', 'discover')), payload
@@ -0,0 +1,168 @@
+"""Module to store jobs of the discovery service in SQLite, which serves as queue and result store.
+
+Jobs go through the following states:
+    * `queued`: Submitted, waiting for a worker,
+    * `running`: Claimed by a worker,
+    * `done`, `failed` or `cancelled`: Finished, either with a result, an error or by cancellation.
+
+Every operation opens its own connection, such that a store can be shared by threads of the server and by worker
+processes. Claiming a job is a single write transaction, so each job is claimed by exactly one worker.
+
+"""
+from contextlib import closing, contextmanager
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+import uuid
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    worker_id TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+_STATUS_COLUMNS = ['id', 'kind', 'status', 'progress', 'error', 'worker_id', 'created_at', 'updated_at']
+
+
+class JobStore:
+    """Queue and result store of jobs, backed by a SQLite database.
+
+    Parameters
+    ----------
+    path: str
+        Path of the database file, it is created if it does not exist.
+
+    timeout: float
+        Seconds to wait for a lock on the database, held by another connection.
+
+    """
+
+    def __init__(self, path: str, timeout: float=30.) -> None:
+        self.path = path
+        self.timeout = timeout
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(_SCHEMA)
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Queue a job, returning its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute('INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                               (job_id, kind, json.dumps(payload), QUEUED, now, now))
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """Claim the oldest queued job for a worker, returning its id, kind and payload, `None` if no job is queued."""
+        with self._transaction() as connection:
+            row = connection.execute('SELECT id, kind, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE jobs SET status = ?, worker_id = ?, updated_at = ? WHERE id = ?', (RUNNING, worker_id, time.time(), row[0]))
+        return row[0], row[1], json.loads(row[2])
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Store progress of a running job."""
+        self._update(job_id, progress=json.dumps(progress))
+
+    def finish(self, job_id: str, result: str) -> None:
+        """Store result of a job, as JSON text, and mark it as done."""
+        self._update(job_id, status=DONE, result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job as failed with an error message."""
+        self._update(job_id, status=FAILED, error=error)
+
+    def mark_cancelled(self, job_id: str) -> None:
+        """Mark a job, whose worker stopped working on it, as cancelled."""
+        self._update(job_id, status=CANCELLED)
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a job, returning its status afterwards, `None` if it does not exist.
+
+        Queued jobs are cancelled right away. For running jobs cancellation is requested, their worker stops working on
+        them at the next opportunity, see `is_cancel_requested`. Finished jobs are left as is.
+
+        """
+        with self._transaction() as connection:
+            row = connection.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row[0] == QUEUED:
+                connection.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?', (CANCELLED, time.time(), job_id))
+                return CANCELLED
+            if row[0] == RUNNING:
+                connection.execute('UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?', (time.time(), job_id))
+            return row[0]
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """Whether cancellation of a running job was requested."""
+        with self._connect() as connection:
+            row = connection.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def fail_running_jobs(self, worker_id: str, error: str) -> int:
+        """Mark all running jobs of a worker as failed, e.g., after it died, returning their number."""
+        with self._connect() as connection:
+            cursor = connection.execute('UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE worker_id = ? AND status = ?',
+                                        (FAILED, error, time.time(), worker_id, RUNNING))
+            return cursor.rowcount
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get status of a job, i.e., its `id`, `kind`, `status`, `progress`, `error`, `worker_id`, `created_at` and `updated_at`."""
+        with self._connect() as connection:
+            row = connection.execute(f'SELECT {", ".join(_STATUS_COLUMNS)} FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        status = dict(zip(_STATUS_COLUMNS, row))
+        status['progress'] = json.loads(status['progress']) if status['progress'] else None
+        return status
+
+    def result(self, job_id: str) -> Optional[str]:
+        """Get result of a job as JSON text, `None` if it is not done."""
+        with self._connect() as connection:
+            row = connection.execute('SELECT result FROM jobs WHERE id = ? AND status = ?', (job_id, DONE)).fetchone()
+        return row[0] if row else None
+
+    def _update(self, job_id: str, **columns: Any) -> None:
+        assignments = ', '.join(f'{column} = ?' for column in columns)
+        with self._connect() as connection:
+            connection.execute(f'UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?', (*columns.values(), time.time(), job_id))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode, closing it afterwards."""
+        with closing(sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)) as connection:
+            yield connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection holding the write lock of the database until committed."""
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
@@ -0,0 +1,179 @@
+"""Module to run jobs of the discovery service in worker processes.
+
+Workers import tensorflow, gpflow and all of `kerndisc` once, when started, so that jobs do not pay for
+imports. They poll the job store for queued jobs and run them one at a time, such that a long discovery
+never holds other queued jobs back from idle workers.
+
+Jobs are JSON objects, with the following kinds:
+    * `discover`: Runs `kerndisc.discover` on `x` and `y`, passing `kwargs`. A `config` in `kwargs` is passed as `kerndisc.Config`.
+      Progress is the `depth` of search and the number of `evaluated_kernels`.
+    * `evaluate`: Runs `kerndisc.evaluation.evaluate_asts` on `x` and `y` for `asts`, given as returned by
+      `kerndisc.description.ast_to_dict`, passing `kwargs`. Progress is the number of `evaluated_kernels`.
+
+Results are converted using `kerndisc.results_to_json`, i.e., non-finite scores are `null`.
+
+"""
+from functools import partial
+import json
+import logging
+from multiprocessing.synchronize import Event
+import os
+import traceback
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from ._store import JobStore
+from .._config import Config
+from .._serialization import results_to_json
+from ..description import ast_to_text, dict_to_ast
+
+
+_LOGGER = logging.getLogger(__package__)
+
+
+class JobCancelledError(Exception):
+    """Raised inside a running job, once its cancellation was requested."""
+
+
+def check_job(kind: str, payload: Dict[str, Any]) -> None:
+    """Check that a job can be run by a worker, before queueing it.
+
+    Parameters
+    ----------
+    kind: str
+        Kind of the job, `discover` or `evaluate`.
+
+    payload: Dict[str, Any]
+        Job, holding `x`, `y`, optional `kwargs` and, for `evaluate`, `asts`.
+
+    Raises
+    ------
+    ValueError
+        If the job is of unknown kind or its payload is malformed.
+
+    """
+    if kind not in _JOB_RUNNERS:
+        _LOGGER.exception(f'Unknown job kind `{kind}`, available are: `{list(_JOB_RUNNERS)}`.')
+        raise ValueError(f'Unknown job kind `{kind}`.')
+
+    if 'x' not in payload or 'y' not in payload or np.size(payload['x']) != np.size(payload['y']):
+        _LOGGER.exception('Jobs need `x` and `y` of the same size.')
+        raise ValueError('Jobs need `x` and `y` of the same size.')
+
+    if not isinstance(payload.get('kwargs', {}), dict) or 'evaluation_hook' in payload.get('kwargs', {}):
+        _LOGGER.exception('Job `kwargs` must be an object, without `evaluation_hook`.')
+        raise ValueError('Job `kwargs` must be an object, without `evaluation_hook`.')
+
+    if kind == 'evaluate' and not isinstance(payload.get('asts'), list):
+        _LOGGER.exception('Jobs of kind `evaluate` need a list of `asts`.')
+        raise ValueError('Jobs of kind `evaluate` need a list of `asts`.')
+
+
+def run_worker(store_path: str, worker_id: str, stop_event: Event, poll_interval: float=0.1) -> None:
+    """Run jobs of a job store until `stop_event` is set, the target of worker processes.
+
+    Parameters
+    ----------
+    store_path: str
+        Path of the database of the job store.
+
+    worker_id: str
+        Id of the worker, stored with each job it claims.
+
+    stop_event: multiprocessing.synchronize.Event
+        Event that stops the worker once set, after finishing its current job.
+
+    poll_interval: float
+        Seconds to wait before polling again, if no job is queued.
+
+    """
+    # Warm up, such that jobs don't pay for importing tensorflow and gpflow.
+    from .. import discover  # noqa: F401
+    from ..evaluation import evaluate_asts  # noqa: F401
+
+    store = JobStore(store_path)
+    _LOGGER.info(f'Worker `{worker_id}` with pid `{os.getpid()}` is ready.')
+    while not stop_event.is_set():
+        job = store.claim(worker_id)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        run_job(store, *job)
+
+
+def run_job(store: JobStore, job_id: str, kind: str, payload: Dict[str, Any]) -> None:
+    """Run a claimed job, storing its result, error or cancellation.
+
+    Parameters
+    ----------
+    store: JobStore
+        Store the job was claimed from.
+
+    job_id: str
+        Id of the job.
+
+    kind: str
+        Kind of the job, see `check_job`.
+
+    payload: Dict[str, Any]
+        Job, see `check_job`.
+
+    """
+    _LOGGER.info(f'Running job `{job_id}` of kind `{kind}`.')
+    x = np.asarray(payload['x'], dtype=float).reshape(-1, 1)
+    y = np.asarray(payload['y'], dtype=float).reshape(-1, 1)
+    kwargs = dict(payload.get('kwargs', {}))
+    if 'config' in kwargs:
+        kwargs['config'] = Config(**kwargs['config'])
+
+    try:
+        result = _JOB_RUNNERS[kind](x, y, payload, kwargs, partial(_report_progress, store, job_id))
+    except JobCancelledError:
+        _LOGGER.info(f'Job `{job_id}` was cancelled.')
+        store.mark_cancelled(job_id)
+        return
+    except Exception:
+        _LOGGER.exception(f'Job `{job_id}` failed.')
+        store.fail(job_id, traceback.format_exc())
+        return
+
+    store.finish(job_id, json.dumps(results_to_json(result), allow_nan=False))
+
+
+def _report_progress(store: JobStore, job_id: str, progress: Dict[str, Any]) -> None:
+    """Store progress of a job, raising `JobCancelledError` if its cancellation was requested."""
+    if store.is_cancel_requested(job_id):
+        raise JobCancelledError(job_id)
+    store.update_progress(job_id, progress)
+
+
+def _run_discover(x: np.ndarray, y: np.ndarray, payload: Dict[str, Any], kwargs: Dict[str, Any],
+                  report_progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    from .. import discover
+
+    progress = {'depth': 0, 'evaluated_kernels': 0}
+
+    def _evaluation_hook(record: Dict[str, Any]) -> None:
+        progress['depth'] = record['depth']
+        progress['evaluated_kernels'] += 1
+        report_progress(progress)
+
+    return discover(x, y, evaluation_hook=_evaluation_hook, **kwargs)
+
+
+def _run_evaluate(x: np.ndarray, y: np.ndarray, payload: Dict[str, Any], kwargs: Dict[str, Any],
+                  report_progress: Callable[[Dict[str, Any]], None]) -> List[Dict[str, Any]]:
+    from ..evaluation import evaluate_asts
+
+    results = []
+    for ast, params, score, evaluation_info in evaluate_asts(x, y, [dict_to_ast(ast) for ast in payload['asts']], **kwargs):
+        results.append({'kernel': ast_to_text(ast), 'ast': ast, 'params': params, 'score': score, 'evaluation': evaluation_info})
+        report_progress({'evaluated_kernels': len(results)})
+    return results
+
+
+_JOB_RUNNERS = {
+    'discover': _run_discover,
+    'evaluate': _run_evaluate,
+}
@@ -25,6 +25,8 @@ def available_metrics():
         'negative_log_likelihood',
         'bayesian_information_criterion',
         'bayesian_information_criterion_duvenaud',
+        'leave_one_out_cross_validation',
+        'k_fold_cross_validation',
     }
 
 
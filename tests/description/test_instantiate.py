@@ -1,7 +1,7 @@
 import gpflow
 import numpy as np
 
-from kerndisc.description._instantiate import instantiate_model_from_ast, instantiate_model_from_kernel  # noqa: I202, I100
+from kerndisc.description._instantiate import get_noise_variances, instantiate_model_from_ast, instantiate_model_from_kernel  # noqa: I202, I100
 
 
 def test_instantiate_model_from_ast(kernel_to_tree):
@@ -57,3 +57,25 @@ def test_instantiate_model_from_kernel():
     model_from_kernel = instantiate_model_from_kernel(x, y, kernel, params=artificial_params)
     for param_name, param_value in model_from_kernel.read_values().items():
         assert param_value == artificial_params[param_name]
+
+
+def test_instantiate_model_with_noise_weights():
+    x, y = np.linspace(0, 1, 10).reshape(-1, 1), np.sin(np.linspace(0, 1, 10)).reshape(-1, 1)
+    noise_weights = np.arange(1, 11, dtype=float)
+
+    model = instantiate_model_from_kernel(x, y, gpflow.kernels.RBF(1), noise_weights=noise_weights)
+    assert isinstance(model, gpflow.models.GPR)
+    assert model.read_values().keys() == instantiate_model_from_kernel(x, y, gpflow.kernels.RBF(1)).read_values().keys()
+    assert np.allclose(get_noise_variances(model), 1 / noise_weights)
+
+    covariance = model.kern.compute_K_symm(x) + np.diag(1 / noise_weights)
+    _, log_determinant = np.linalg.slogdet(covariance)
+    expected = -0.5 * (y.T @ np.linalg.solve(covariance, y) + log_determinant + x.shape[0] * np.log(2 * np.pi))
+    assert np.isclose(model.compute_log_likelihood(), expected)
+
+    mean, variance = model.predict_f(x)
+    assert np.allclose(mean, model.kern.compute_K_symm(x) @ np.linalg.solve(covariance, y))
+    assert np.all(variance > 0)
+
+    homoscedastic_model = instantiate_model_from_kernel(x, y, gpflow.kernels.RBF(1), noise_weights=np.ones(10))
+    assert np.isclose(homoscedastic_model.compute_log_likelihood(), instantiate_model_from_kernel(x, y, gpflow.kernels.RBF(1)).compute_log_likelihood())
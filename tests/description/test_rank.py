@@ -0,0 +1,82 @@
+import gpflow
+import numpy as np
+import pytest
+
+from kerndisc.description import _rank, instantiate_model_from_ast, kernel_to_ast  # noqa: I202, I100
+from kerndisc.description._instantiate import get_noise_variances  # noqa: I202, I100
+from kerndisc.description._rank import rank  # noqa: I202, I100
+
+
+def test_rank():
+    x = np.linspace(0, 10, 25).reshape(-1, 1)
+    y = np.sin(3 * x) + 0.3 * x
+    ast = kernel_to_ast(gpflow.kernels.RBF(1) + gpflow.kernels.Periodic(1) + gpflow.kernels.Linear(1) * gpflow.kernels.Constant(1))
+    model = instantiate_model_from_ast(x, y, ast)
+    gpflow.train.ScipyOptimizer().minimize(model, maxiter=20)
+    params = model.read_values()
+
+    model_score, ranked_subexpressions = rank(ast, 1., x, y, params)
+
+    assert model_score == 1.
+    assert len(ranked_subexpressions) == 3
+    assert ranked_subexpressions == sorted(ranked_subexpressions, reverse=True)
+    assert sorted(names for _, names in ranked_subexpressions) == [['constant', 'linear'], ['periodic'], ['rbf']]
+
+    # Brute force: Leave out each subkernel, keeping fitted parameters of all others.
+    full_nll = -model.compute_log_likelihood()
+    sub_kernels = list(model.kern.children.values())
+    expected_impacts = []
+    for i in range(len(sub_kernels)):
+        reduced_kernel = sum(sub_kernels[j].compute_K_symm(x) for j in range(len(sub_kernels)) if j != i)
+        covariance = reduced_kernel + model.likelihood.variance.read_value() * np.eye(x.shape[0])
+        _, log_determinant = np.linalg.slogdet(covariance)
+        reduced_nll = 0.5 * (y.T @ np.linalg.solve(covariance, y) + log_determinant + x.shape[0] * np.log(2 * np.pi))
+        expected_impacts.append(abs(full_nll - reduced_nll.item()))
+
+    assert np.allclose(sorted(impact for impact, _ in ranked_subexpressions), sorted(expected_impacts), rtol=1e-4)
+
+
+def test_rank_noise_weights():
+    x = np.linspace(0, 10, 25).reshape(-1, 1)
+    y = np.sin(3 * x) + 0.3 * x
+    noise_weights = np.linspace(0.2, 5, 25)
+    ast = kernel_to_ast(gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1))
+    model = instantiate_model_from_ast(x, y, ast, noise_weights=noise_weights)
+    gpflow.train.ScipyOptimizer().minimize(model, maxiter=20)
+    params = model.read_values()
+
+    _, ranked_subexpressions = rank(ast, 1., x, y, params, noise_weights=noise_weights)
+
+    # Brute force: Leave out each subkernel, keeping the weighted noise variance of each point.
+    full_nll = -model.compute_log_likelihood()
+    sub_kernels = list(model.kern.children.values())
+    expected_impacts = []
+    for i in range(len(sub_kernels)):
+        covariance = sub_kernels[1 - i].compute_K_symm(x) + np.diag(get_noise_variances(model))
+        _, log_determinant = np.linalg.slogdet(covariance)
+        reduced_nll = 0.5 * (y.T @ np.linalg.solve(covariance, y) + log_determinant + x.shape[0] * np.log(2 * np.pi))
+        expected_impacts.append(abs(full_nll - reduced_nll.item()))
+
+    assert np.allclose(sorted(impact for impact, _ in ranked_subexpressions), sorted(expected_impacts), rtol=1e-4)
+
+    _, unweighted_subexpressions = rank(ast, 1., x, y, params)
+    assert not np.allclose(sorted(impact for impact, _ in unweighted_subexpressions), sorted(expected_impacts), rtol=1e-4)
+
+
+def test_rank_in_batches(monkeypatch):
+    x = np.linspace(0, 10, 25).reshape(-1, 1)
+    y = np.sin(3 * x) + 0.3 * x
+    ast = kernel_to_ast(gpflow.kernels.RBF(1) + gpflow.kernels.Periodic(1) + gpflow.kernels.Linear(1))
+    _, ranked_subexpressions = rank(ast, 1., x, y, {})
+
+    monkeypatch.setattr(_rank, '_RANK_BATCH_BYTES', 2 * 25 * 25 * 8)
+    _, batched_subexpressions = rank(ast, 1., x, y, {})
+
+    assert [names for _, names in batched_subexpressions] == [names for _, names in ranked_subexpressions]
+    assert np.allclose([impact for impact, _ in batched_subexpressions], [impact for impact, _ in ranked_subexpressions])
+
+
+def test_rank_base_kernel():
+    x = np.linspace(0, 10, 25).reshape(-1, 1)
+    with pytest.raises(RuntimeError):
+        rank(kernel_to_ast(gpflow.kernels.RBF(1)), 1., x, x, {})
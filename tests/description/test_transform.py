@@ -4,7 +4,7 @@ from anytree import Node
 import gpflow
 import pytest
 
-from kerndisc.description._transform import ast_to_kernel, ast_to_text, kernel_to_ast  # noqa: I202, I100
+from kerndisc.description._transform import ast_to_dict, ast_to_kernel, ast_to_text, dict_to_ast, kernel_to_ast  # noqa: I202, I100
 
 
 def test_kernel_to_ast(are_asts_equal):
@@ -95,3 +95,23 @@ def test_ast_to_text():
     with pytest.raises(AttributeError) as ex:
         ast_to_text(Node('not_a_kernel'))
     assert str(ex.value) == "'str' object has no attribute '__name__'"
+
+
+def test_ast_to_dict_to_ast(are_asts_equal):
+    kernel = (gpflow.kernels.RBF(1) + gpflow.kernels.White(1) * gpflow.kernels.Linear(1)) * gpflow.kernels.Polynomial(1)
+    ast = kernel_to_ast(kernel)
+
+    representation = ast_to_dict(ast)
+    assert representation['kernel'] == 'product'
+    assert [child['kernel'] for child in representation['children']] == [child.name.__name__.lower() for child in ast.children]
+
+    restored_ast = dict_to_ast(representation)
+    assert are_asts_equal(ast, restored_ast)
+    assert [node.full_name for node in restored_ast.descendants] == [node.full_name for node in ast.descendants]
+    assert restored_ast.children[1].name is gpflow.kernels.Polynomial
+    assert ast_to_dict(restored_ast) == representation
+
+
+def test_dict_to_ast_unknown_kernel():
+    with pytest.raises(ValueError):
+        dict_to_ast({'kernel': 'unknown', 'children': []})
@@ -3,6 +3,8 @@ import numpy as np
 
 from kerndisc.evaluation.scoring._metrics import (bayesian_information_criterion,  # noqa: I202, I100
                                                   bayesian_information_criterion_duvenaud,
+                                                  k_fold_cross_validation,
+                                                  leave_one_out_cross_validation,
                                                   negative_log_likelihood)
 
 
@@ -45,3 +47,49 @@ def test_difference_bic_duvenaud():
     m = gpflow.models.GPR(x, y, kern=k)
     # This holds because `k` contains a product.
     assert bayesian_information_criterion_duvenaud(m) < bayesian_information_criterion(m)
+
+
+def test_metrics_known_objective_and_parameter_count():
+    x, y = np.array([[0], [1], [2], [3]]).astype(float), np.array([[0], [1], [2], [1]]).astype(float)
+    m = gpflow.models.GPR(x, y, kern=gpflow.kernels.Linear(1) * gpflow.kernels.RBF(1))
+
+    for metric in [negative_log_likelihood, bayesian_information_criterion, bayesian_information_criterion_duvenaud]:
+        assert np.isclose(metric(m), metric(m, objective=-m.compute_log_likelihood(), parameter_count=len(list(m.parameters))))
+
+    assert negative_log_likelihood(m, objective=1.5) == 1.5
+    assert np.isclose(bayesian_information_criterion(m, objective=1.5, parameter_count=2), 3 + 2 * np.log(4))
+
+
+def _brute_force_cross_validation(model, folds):
+    x, y = model.X.read_value(), model.Y.read_value()
+    covariance = model.kern.compute_K_symm(x) + model.likelihood.variance.read_value() * np.eye(x.shape[0])
+
+    log_predictive_probability = 0
+    for fold in folds:
+        rest = np.setdiff1d(np.arange(x.shape[0]), fold)
+        gain = covariance[np.ix_(fold, rest)] @ np.linalg.inv(covariance[np.ix_(rest, rest)])
+        mean = gain @ y[rest, 0]
+        cov = covariance[np.ix_(fold, fold)] - gain @ covariance[np.ix_(rest, fold)]
+        residual = y[fold, 0] - mean
+        log_predictive_probability += -0.5 * residual @ np.linalg.solve(cov, residual) - 0.5 * np.linalg.slogdet(cov)[1]
+        log_predictive_probability -= 0.5 * fold.shape[0] * np.log(2 * np.pi)
+    return -log_predictive_probability
+
+
+def test_leave_one_out_cross_validation():
+    x, y = np.linspace(0, 5, 12).reshape(-1, 1), np.sin(np.linspace(0, 5, 12)).reshape(-1, 1)
+    m = gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1))
+    m.likelihood.variance = 0.1
+
+    assert np.isclose(leave_one_out_cross_validation(m), _brute_force_cross_validation(m, [np.array([i]) for i in range(12)]))
+
+
+def test_k_fold_cross_validation():
+    x, y = np.linspace(0, 5, 12).reshape(-1, 1), np.sin(np.linspace(0, 5, 12)).reshape(-1, 1)
+    m = gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1))
+    m.likelihood.variance = 0.1
+
+    assert np.isclose(k_fold_cross_validation(m, k=4), _brute_force_cross_validation(m, np.array_split(np.arange(12), 4)))
+    # `n` folds equal leave one out cross validation.
+    assert np.isclose(k_fold_cross_validation(m, k=12), leave_one_out_cross_validation(m))
+    assert np.isclose(k_fold_cross_validation(m, k=100), leave_one_out_cross_validation(m))
@@ -2,7 +2,9 @@ import os
 
 import gpflow
 import numpy as np
+import pytest
 
+from kerndisc import Config  # noqa: I202, I100
 from kerndisc.evaluation.scoring import (_METRICS,  # noqa: I202, I100
                                          _STANDARD_METRIC,
                                          score_model)
@@ -35,3 +37,17 @@ def test_score_model():
     assert score_2 == score_2_cur_metric
 
     assert score_2 < score_1
+
+    score_3 = score_model(m, objective=-m.compute_log_likelihood(), parameter_count=len(list(m.parameters)))
+    assert np.isclose(score_3, score_2)
+
+
+def test_score_model_config():
+    m = gpflow.models.GPR(np.array([[0], [1], [2]], dtype=float), np.array([[10], [-10], [-20]], dtype=float),
+                          kern=gpflow.kernels.Linear(1))
+
+    for metric in _METRICS:
+        assert score_model(m, config=Config(metric=metric)) == _METRICS[metric](m)
+
+    with pytest.raises(ValueError):
+        score_model(m, config=Config(metric='unknown'))
@@ -1,6 +1,7 @@
 import gpflow
+import numpy as np
 
-from kerndisc.evaluation.scoring._util import get_prod_count_kernel  # noqa: I202, I100
+from kerndisc.evaluation.scoring._util import get_parameter_count_ast, get_prod_count_kernel  # noqa: I202, I100
 
 
 def test_get_prod_count_kernel():
@@ -18,3 +19,16 @@ def test_get_prod_count_kernel():
 
     two_prods = gpflow.kernels.Linear(1) * gpflow.kernels.Linear(1) + gpflow.kernels.Linear(1) * gpflow.kernels.Linear(1) + gpflow.kernels.Linear(1)
     assert get_prod_count_kernel(two_prods) == 2
+
+
+def test_get_parameter_count_ast(kernel_to_tree):
+    x, y = np.array([[0], [1]]).astype(float), np.array([[0], [1]]).astype(float)
+    kernels = [
+        gpflow.kernels.Linear(1),
+        gpflow.kernels.RBF(1) * gpflow.kernels.Periodic(1),
+        (gpflow.kernels.RBF(1) + gpflow.kernels.White(1)) * gpflow.kernels.Constant(1) + gpflow.kernels.Linear(1),
+    ]
+
+    for kernel in kernels:
+        m = gpflow.models.GPR(x, y, kern=kernel)
+        assert get_parameter_count_ast(kernel_to_tree(kernel)) == len(list(m.parameters))
@@ -0,0 +1,46 @@
+from anytree import Node
+import gpflow
+import numpy as np
+import tensorflow as tf
+
+from kerndisc.evaluation._batched import build_batched_model, copy_params  # noqa: I202, I100
+from kerndisc.evaluation._util import build_model  # noqa: I202, I100
+
+
+def _asts():
+    return [
+        Node(gpflow.kernels.RBF),
+        Node(gpflow.kernels.Sum, children=[Node(gpflow.kernels.Linear), Node(gpflow.kernels.Periodic)]),
+        Node(gpflow.kernels.Product, children=[Node(gpflow.kernels.RBF), Node(gpflow.kernels.White)]),
+    ]
+
+
+def test_build_batched_model():
+    x = np.linspace(0, 1, 20).reshape(-1, 1)
+    y = np.sin(6 * x)
+    asts = _asts()
+
+    with tf.Session(graph=tf.Graph()):
+        models = [build_model(x, y, ast) for ast in asts]
+        for i, model in enumerate(models):
+            model.likelihood.variance = 0.1 * (i + 1)
+        batched_model = build_batched_model(asts, models)
+
+        assert batched_model.batch_size == len(asts)
+        assert np.allclose(batched_model.compute_candidate_log_likelihoods(), [model.compute_log_likelihood() for model in models])
+        assert np.isclose(batched_model.compute_log_likelihood(), sum(model.compute_log_likelihood() for model in models))
+
+
+def test_copy_params():
+    x = np.linspace(0, 1, 20).reshape(-1, 1)
+    y = np.sin(6 * x)
+    asts = _asts()
+
+    with tf.Session(graph=tf.Graph()):
+        models = [build_model(x, y, ast) for ast in asts]
+        batched_model = build_batched_model(asts, models)
+        gpflow.train.ScipyOptimizer().minimize(batched_model, maxiter=50)
+        copy_params(models, batched_model, to_batched=False)
+
+        assert np.allclose(batched_model.variances.read_value(), [model.likelihood.variance.read_value() for model in models])
+        assert np.allclose(batched_model.compute_candidate_log_likelihoods(), [model.compute_log_likelihood() for model in models])
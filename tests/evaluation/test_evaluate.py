@@ -1,9 +1,12 @@
+import os
+
 from anytree import Node
 import gpflow
 import numpy as np
+import pytest
 import tensorflow as tf
 
-from kerndisc.evaluation._evaluate import _make_evaluator, evaluate_asts  # noqa: I202, I100
+from kerndisc.evaluation._evaluate import _make_attempts, _make_evaluator, evaluate_asts  # noqa: I202, I100
 
 
 def test_evaluate_asts(standard_metric, tree_to_kernel):
@@ -14,12 +17,22 @@ def test_evaluate_asts(standard_metric, tree_to_kernel):
     asts = []
     models_params = []
     scores = []
-    for ast, model_params, score in evaluate_asts(x, y, unscored_asts):
+    evaluation_infos = []
+    for ast, model_params, score, evaluation_info in evaluate_asts(x, y, unscored_asts):
         asts.append(ast)
         models_params.append(model_params)
         scores.append(score)
-
-    assert len(asts) == len(scores) == len(models_params) == len(unscored_asts)
+        evaluation_infos.append(evaluation_info)
+
+    assert len(asts) == len(scores) == len(models_params) == len(evaluation_infos) == len(unscored_asts)
+    assert all(evaluation_info['method'] == 'L-BFGS-B' for evaluation_info in evaluation_infos)
+    for evaluation_info in evaluation_infos:
+        assert evaluation_info['build_time'] > 0
+        assert evaluation_info['optimization_time'] > 0
+        assert evaluation_info['scoring_time'] >= 0
+        assert evaluation_info['peak_rss_delta_kb'] >= 0
+        assert evaluation_info['worker_id'] == os.getpid()
+        assert not evaluation_info['cholesky_failed']
     assert set(asts) == set(unscored_asts)
     assert all(isinstance(ast, Node) for ast in asts)
     assert all(isinstance(score, float) for score in scores)
@@ -28,16 +41,20 @@ def test_evaluate_asts(standard_metric, tree_to_kernel):
             model = gpflow.models.GPR(x, y, kern=tree_to_kernel(ast))
             model.assign(model_params)
 
-            assert standard_metric(model) == score
+            # Score is calculated from the final objective of the optimizer, not a recomputation.
+            assert np.isclose(standard_metric(model), score)
 
 
 def test_bad_cholesky():
     x, y = np.array([[]]), np.array([[]])
     evaluate_asts = _make_evaluator(x, y, False)
 
-    model, score = evaluate_asts(Node(gpflow.kernels.Linear))
+    model, score, evaluation_info = evaluate_asts(Node(gpflow.kernels.Linear))
     assert isinstance(model, gpflow.models.GPR)
     assert score == np.Inf
+    assert evaluation_info['method'] == 'L-BFGS-B'
+    assert evaluation_info['cholesky_failed']
+    assert 'optimization_time' in evaluation_info
 
 
 def test_make_evaluator_and_scores():
@@ -52,8 +69,8 @@ def test_make_evaluator_and_scores():
         ast1 = Node(gpflow.kernels.Linear)
         ast2 = Node(gpflow.kernels.Linear)
 
-        model_wo_jitter, score_wo_jitter = evaluate_wo_jitter(ast1)
-        model_w_jitter, score_w_jitter = evaluate_w_jitter(ast2)
+        model_wo_jitter, score_wo_jitter, _ = evaluate_wo_jitter(ast1)
+        model_w_jitter, score_w_jitter, _ = evaluate_w_jitter(ast2)
 
         assert isinstance(model_wo_jitter, gpflow.models.GPR)
         assert isinstance(model_w_jitter, gpflow.models.GPR)
@@ -62,3 +79,87 @@ def test_make_evaluator_and_scores():
         assert np.isclose(score_w_jitter, 13.418110707440416)
 
         assert score_w_jitter != score_wo_jitter
+
+
+def test_evaluate_asts_optimizer_kwargs():
+    x, y = np.array([[0], [1], [2], [3]]).astype(float), np.array([[0], [1], [2], [1]]).astype(float)
+    ast = Node(gpflow.kernels.RBF)
+
+    *_, full_info = next(evaluate_asts(x, y, [ast], add_jitter=False))
+    *_, limited_info = next(evaluate_asts(x, y, [ast], add_jitter=False, optimizer_kwargs={'maxiter': 1}))
+
+    assert limited_info['iterations'] <= 1
+    assert full_info['iterations'] >= limited_info['iterations']
+    assert full_info['function_evaluations'] >= full_info['iterations']
+
+
+def test_evaluate_asts_float32():
+    x, y = np.array([[0], [1], [2], [3]]).astype(float), np.array([[0], [1], [2], [1]]).astype(float)
+    ast = Node(gpflow.kernels.RBF)
+
+    _, params, score, evaluation_info = next(evaluate_asts(x, y, [ast], add_jitter=False, precision='float32'))
+    *_, score_float64, _ = next(evaluate_asts(x, y, [ast], add_jitter=False))
+
+    assert evaluation_info['precision'] == 'float32'
+    assert not evaluation_info['precision_fallback']
+    assert all(value.dtype == np.float32 for value in params.values())
+    assert params['GPR/likelihood/variance'] >= 1e-4
+    assert isinstance(score, float)
+    assert np.isclose(score, score_float64, rtol=1e-2)
+
+    with pytest.raises(ValueError):
+        _make_evaluator(x, y, False, precision='float16')
+
+
+def test_bad_cholesky_float32_fallback():
+    x, y = np.array([[]]), np.array([[]])
+    evaluate_ast = _make_evaluator(x, y, False, precision='float32')
+
+    _, score, evaluation_info = evaluate_ast(Node(gpflow.kernels.Linear))
+    assert score == np.Inf
+    assert evaluation_info['cholesky_failed']
+    assert evaluation_info['precision_fallback']
+    assert evaluation_info['precision'] == 'float64'
+
+    evaluate_ast = _make_evaluator(x, y, False, precision='float32', max_cholesky_retries=1)
+    _, _, evaluation_info = evaluate_ast(Node(gpflow.kernels.Linear))
+    assert evaluation_info['precision_fallback']
+    assert evaluation_info['cholesky_retries'] == 1
+    assert evaluation_info['retry_strategy'] == 'jitter=1e-06'
+
+
+def test_bad_cholesky_retries():
+    x, y = np.array([[]]), np.array([[]])
+
+    evaluate_ast = _make_evaluator(x, y, False, parent_params={'linear': {'GPR/likelihood/variance': 1.}})
+    _, score, evaluation_info = evaluate_ast(Node(gpflow.kernels.Linear))
+    assert score == np.Inf
+    assert evaluation_info['cholesky_failed']
+    assert evaluation_info['cholesky_retries'] == 5
+    assert evaluation_info['retry_strategy'] == 'noise_floor=0.01'
+
+    evaluate_ast = _make_evaluator(x, y, False, max_cholesky_retries=1)
+    _, _, evaluation_info = evaluate_ast(Node(gpflow.kernels.Linear))
+    assert evaluation_info['cholesky_retries'] == 1
+    assert evaluation_info['retry_strategy'] == 'jitter=1e-06'
+
+
+def test_make_attempts():
+    assert [strategy for strategy, _ in _make_attempts('float64', None, 10)] == ['', 'jitter=1e-06', 'jitter=0.0001', 'jitter=0.01', 'noise_floor=0.01']
+    attempts = _make_attempts('float32', {'a': 1}, 4)
+    assert [strategy for strategy, _ in attempts] == ['', 'float64', 'jitter=1e-06', 'jitter=0.0001', 'jitter=0.01', 'parent_params']
+    assert attempts[0][1] == {'precision': 'float32', 'noise_floor': 1e-4}
+    assert [strategy for strategy, _ in _make_attempts('float64', None, 0)] == ['']
+
+
+def test_evaluate_asts_batched():
+    x, y = np.linspace(0, 1, 20).reshape(-1, 1), np.sin(6 * np.linspace(0, 1, 20)).reshape(-1, 1)
+    unscored_asts = [Node(k_class) for k_class in [gpflow.kernels.Linear, gpflow.kernels.White, gpflow.kernels.RBF, gpflow.kernels.Constant]]
+
+    evaluations = list(evaluate_asts(x, y, unscored_asts, batch_size=3))
+    assert [ast for ast, *_ in evaluations] == unscored_asts
+    assert [evaluation_info.get('batch_size') for *_, evaluation_info in evaluations] == [3, 3, 3, 1]
+
+    unbatched_scores = [score for _, _, score, _ in evaluate_asts(x, y, unscored_asts, add_jitter=False)]
+    batched_scores = [score for _, _, score, _ in evaluate_asts(x, y, unscored_asts, add_jitter=False, batch_size=4)]
+    assert np.allclose(batched_scores, unbatched_scores, rtol=1e-2)
@@ -0,0 +1,165 @@
+import multiprocessing
+from multiprocessing.connection import Client
+import socket
+import time
+
+from anytree import Node
+import gpflow
+import numpy as np
+import pytest
+
+from kerndisc.evaluation import (  # noqa: I202, I100
+    evaluate_asts,
+    ProcessExecutor,
+    RemoteExecutor,
+    SerialExecutor,
+    serve_evaluation_worker,
+    ThreadExecutor,
+)
+from kerndisc.evaluation._executors import evaluate_task  # noqa: I202, I100
+from kerndisc.evaluation._remote import _Schedule  # noqa: I202, I100
+from kerndisc.evaluation._tasks import EvaluationData, EvaluationTask  # noqa: I202, I100
+
+
+_AUTHKEY = b'test-authkey'
+
+
+def _free_port():
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+def _wait_for_worker(address, timeout=60):
+    start = time.time()
+    while True:
+        try:
+            Client(address, authkey=_AUTHKEY).close()
+            return
+        except OSError:
+            if time.time() - start > timeout:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.fixture()
+def remote_workers():
+    context = multiprocessing.get_context('spawn')
+    addresses = [('127.0.0.1', _free_port()) for _ in range(2)]
+    workers = [context.Process(target=serve_evaluation_worker, args=(address, _AUTHKEY), daemon=True) for address in addresses]
+    for worker in workers:
+        worker.start()
+    for address in addresses:
+        _wait_for_worker(address)
+    yield addresses
+    for worker in workers:
+        worker.terminate()
+
+
+def _evaluate(executor):
+    x = np.linspace(0, 1, 10).reshape(-1, 1)
+    y = np.sin(6 * x)
+    asts = [Node(k_class) for k_class in [gpflow.kernels.Linear, gpflow.kernels.White, gpflow.kernels.RBF, gpflow.kernels.Constant]]
+
+    with executor:
+        evaluations = list(evaluate_asts(x, y, asts, add_jitter=False, executor=executor))
+    assert sorted(ast.name.__name__ for ast, *_ in evaluations) == sorted(ast.name.__name__ for ast in asts)
+    for ast, params, score, evaluation_info in evaluations:
+        assert isinstance(score, float)
+        assert params
+        assert evaluation_info['iterations'] >= 0
+
+
+@pytest.mark.parametrize('executor', [SerialExecutor(), ThreadExecutor(2), ProcessExecutor(2)])
+def test_executors(executor):
+    _evaluate(executor)
+
+
+def test_remote_executor(remote_workers):
+    _evaluate(RemoteExecutor(remote_workers, authkey=_AUTHKEY))
+
+
+def test_remote_executor_requires_authkey(monkeypatch):
+    monkeypatch.delenv('EVALUATION_WORKER_AUTHKEY', raising=False)
+    with pytest.raises(ValueError):
+        RemoteExecutor([('127.0.0.1', _free_port())])
+    with pytest.raises(ValueError):
+        serve_evaluation_worker(('127.0.0.1', _free_port()))
+
+    monkeypatch.setenv('EVALUATION_WORKER_AUTHKEY', 'secret')
+    assert RemoteExecutor([('127.0.0.1', _free_port())]).authkey == b'secret'
+
+
+def test_remote_executor_stops_sending_tasks_once_consumer_stops(monkeypatch):
+    class _SlowWorker:
+        closed = False
+        n_evaluated = 0
+
+        def evaluate(self, data, task):
+            time.sleep(0.05)
+            self.n_evaluated += 1
+            return 'result', ({}, 0., {})
+
+    worker = _SlowWorker()
+    executor = RemoteExecutor([], authkey=_AUTHKEY)
+    monkeypatch.setattr(executor, '_connect', lambda: [worker])
+
+    evaluations = executor.evaluate(EvaluationData(np.zeros((2, 1)), np.zeros((2, 1))), [None] * 10)
+    next(evaluations)
+    evaluations.close()
+
+    time.sleep(0.2)
+    assert worker.n_evaluated <= 2
+
+
+def test_evaluate_task_checks_fingerprint():
+    data = EvaluationData(np.zeros((2, 1)), np.zeros((2, 1)))
+    task = EvaluationTask(EvaluationData(np.ones((2, 1)), np.zeros((2, 1))).fingerprint(), {}, {})
+    with pytest.raises(ValueError):
+        evaluate_task(data, task)
+
+
+def test_fingerprint():
+    x, y = np.zeros((2, 1)), np.ones((2, 1))
+    assert EvaluationData(x, y).fingerprint() == EvaluationData(x.copy(), y.copy()).fingerprint()
+    assert EvaluationData(x, y).fingerprint() != EvaluationData(y, x).fingerprint()
+    assert EvaluationData(x, y).fingerprint() != EvaluationData(x, y, np.ones(2)).fingerprint()
+
+
+def test_schedule_speculates_stragglers():
+    schedule = _Schedule(2, speculation_factor=2., min_speculation_seconds=0.)
+    assert schedule.next_index() == 0
+    assert schedule.next_index() == 1
+    schedule.complete(0, ({}, 0., {}), None, 0.01)
+
+    time.sleep(0.05)
+    assert schedule.next_index() == 1
+
+    schedule.complete(1, ({}, 1., {}), None, 0.05)
+    schedule.complete(1, ({}, 2., {}), None, 0.01)
+    assert schedule.next_index() is None
+    assert [schedule.results.get()[0] for _ in range(2)] == [0, 1]
+    assert schedule.results.empty()
+
+
+def test_schedule_requeues_lost_tasks():
+    schedule = _Schedule(1, speculation_factor=2., min_speculation_seconds=10.)
+    assert schedule.next_index() == 0
+    schedule.requeue(0)
+    assert schedule.next_index() == 0
+
+
+def test_schedule_does_not_requeue_tasks_running_elsewhere():
+    schedule = _Schedule(2, speculation_factor=2., min_speculation_seconds=0.)
+    assert schedule.next_index() == 0
+    assert schedule.next_index() == 1
+    schedule.complete(0, ({}, 0., {}), None, 0.01)
+
+    time.sleep(0.05)
+    assert schedule.next_index() == 1
+    # The first worker evaluating task `1` is lost, while the speculative copy is still running.
+    schedule.requeue(1)
+    assert schedule._pending == []
+
+    schedule.requeue(1)
+    assert schedule._pending == [1]
@@ -0,0 +1,107 @@
+import gpflow
+import numpy as np
+
+from kerndisc.evaluation._gram_cache import (  # noqa: I202, I100
+    _GRAM_CACHE,
+    _GramCache,
+    cache_grams,
+    choose_initial_params,
+    clear_gram_cache,
+    gram_matrix,
+    initial_negative_log_likelihood,
+)
+
+
+def test_gram_cache_evicts_least_recently_used():
+    cache = _GramCache(max_bytes=2 * np.zeros((2, 2)).nbytes)
+    cache.put('a', np.zeros((2, 2)))
+    cache.put('b', np.ones((2, 2)))
+    cache.get('a')
+    cache.put('c', np.ones((2, 2)))
+
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert not cache.get('a').flags.writeable
+    assert cache.nbytes == 2 * np.zeros((2, 2)).nbytes
+
+    cache.put('d', np.zeros((3, 3)))
+    assert cache.get('d') is None
+
+
+def test_gram_matrix():
+    clear_gram_cache()
+    x = np.linspace(0, 1, 10).reshape(-1, 1)
+    kernel = gpflow.kernels.RBF(1) * gpflow.kernels.Linear(1) + gpflow.kernels.White(1)
+
+    gram = gram_matrix(kernel, x)
+    assert np.allclose(gram, kernel.compute_K_symm(x))
+    assert len(_GRAM_CACHE) == 5
+
+    gram_matrix(gpflow.kernels.RBF(1) * gpflow.kernels.Linear(1), x)
+    assert len(_GRAM_CACHE) == 5
+
+    kernel.kernels[0].kernels[1].variance = 2.
+    assert np.allclose(gram_matrix(kernel, x), kernel.compute_K_symm(x))
+    assert len(_GRAM_CACHE) == 8
+
+
+def test_initial_negative_log_likelihood():
+    clear_gram_cache()
+    x = np.linspace(0, 1, 10).reshape(-1, 1)
+    y = np.sin(5 * x)
+    model = gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1))
+
+    assert np.isclose(initial_negative_log_likelihood(model), -model.compute_log_likelihood())
+    # Parameters of unoptimized models must not evict cached Gram matrices.
+    assert len(_GRAM_CACHE) == 0
+
+
+def test_cache_grams_skips_grams_exceeding_budget(monkeypatch):
+    clear_gram_cache()
+    x = np.linspace(0, 1, 10).reshape(-1, 1)
+    model = gpflow.models.GPR(x, np.sin(5 * x), kern=gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1))
+    monkeypatch.setattr(_GRAM_CACHE, 'max_bytes', 10 * 10 * 8 - 1)
+
+    cache_grams(model)
+    assert len(_GRAM_CACHE) == 0
+
+    monkeypatch.setattr(_GRAM_CACHE, 'max_bytes', 10 * 10 * 8 * 3)
+    cache_grams(model)
+    assert len(_GRAM_CACHE) == 3
+
+
+def test_choose_initial_params():
+    clear_gram_cache()
+    x = np.linspace(0, 1, 10).reshape(-1, 1)
+    y = np.sin(5 * x)
+    parent = gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1))
+    gpflow.train.ScipyOptimizer().minimize(parent)
+    parent_params = parent.read_values()
+    cache_grams(parent)
+
+    model = gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1))
+    assert choose_initial_params(model, parent_params)
+    assert np.isclose(model.kern.kernels[0].lengthscales.read_value(), parent.kern.lengthscales.read_value())
+
+    model = gpflow.models.GPR(x, y, kern=gpflow.kernels.Linear(1))
+    initial_params = model.read_values()
+    assert not choose_initial_params(model, {'GPR/kern/lengthscales': np.array(2.)})
+    assert model.read_values() == initial_params
+
+    assert not choose_initial_params(model, None)
+
+
+def test_choose_initial_params_keeps_more_likely_params(monkeypatch):
+    x = np.linspace(0, 1, 10).reshape(-1, 1)
+    y = np.sin(5 * x)
+    model = gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1))
+    initial_params = model.read_values()
+
+    assert not choose_initial_params(model, {'GPR/likelihood/variance': np.array(1e3)})
+    assert model.read_values() == initial_params
+
+    # Without cached Gram matrices, parameters of the parent are used without comparing them.
+    monkeypatch.setattr(_GRAM_CACHE, 'max_bytes', 0)
+    assert choose_initial_params(model, {'GPR/likelihood/variance': np.array(1e3)})
+    assert np.isclose(model.likelihood.variance.read_value(), 1e3)
@@ -0,0 +1,40 @@
+import json
+
+from kerndisc.evaluation._hooks import make_json_lines_hook, make_prometheus_textfile_hook  # noqa: I202, I100
+
+
+def test_make_json_lines_hook(tmpdir):
+    path = str(tmpdir.join('evaluations.jsonl'))
+    hook = make_json_lines_hook(path)
+
+    hook({'kernel': 'rbf', 'depth': 0, 'score': 1.5, 'iterations': 3})
+    hook({'kernel': 'linear + rbf', 'depth': 1, 'score': 0.5, 'iterations': 7})
+
+    with open(path) as json_lines_file:
+        records = [json.loads(line) for line in json_lines_file]
+
+    assert records == [
+        {'kernel': 'rbf', 'depth': 0, 'score': 1.5, 'iterations': 3},
+        {'kernel': 'linear + rbf', 'depth': 1, 'score': 0.5, 'iterations': 7},
+    ]
+
+
+def test_make_prometheus_textfile_hook(tmpdir):
+    path = str(tmpdir.join('kerndisc.prom'))
+    hook = make_prometheus_textfile_hook(path)
+
+    hook({'kernel': 'rbf * periodic', 'optimization_time': 1.5, 'iterations': 3, 'cholesky_failed': False})
+    hook({'kernel': 'periodic * rbf * rbf', 'optimization_time': 0.5, 'iterations': 7, 'cholesky_failed': True})
+    hook({'kernel': 'linear', 'optimization_time': 0.25, 'iterations': 2, 'cholesky_failed': False})
+
+    with open(path) as textfile:
+        lines = textfile.read().splitlines()
+
+    assert '# TYPE kerndisc_optimization_seconds_total counter' in lines
+    assert 'kerndisc_evaluated_kernels_total{kernel_family="periodic,rbf"} 2' in lines
+    assert 'kerndisc_evaluated_kernels_total{kernel_family="linear"} 1' in lines
+    assert 'kerndisc_optimization_seconds_total{kernel_family="periodic,rbf"} 2.0' in lines
+    assert 'kerndisc_optimizer_iterations_total{kernel_family="periodic,rbf"} 10' in lines
+    assert 'kerndisc_cholesky_failures_total{kernel_family="periodic,rbf"} 1' in lines
+    assert 'kerndisc_cholesky_failures_total{kernel_family="linear"} 0' in lines
+    assert [path.basename for path in tmpdir.listdir()] == ['kerndisc.prom']
@@ -0,0 +1,62 @@
+import gpflow
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from kerndisc.evaluation._optimize import make_optimizer, make_tolerance_schedule  # noqa: I202, I100
+
+
+def _make_model():
+    x, y = np.array([[0], [1], [2], [3]]).astype(float), np.array([[0], [1], [2], [1]]).astype(float)
+    return gpflow.models.GPR(x, y, kern=gpflow.kernels.RBF(1))
+
+
+def test_make_optimizer_default():
+    with tf.Session(graph=tf.Graph()):
+        model = _make_model()
+        optimization_info = {}
+        make_optimizer()(model, optimization_info)
+
+        assert optimization_info['method'] == 'L-BFGS-B'
+        assert optimization_info['iterations'] > 0
+        assert optimization_info['function_evaluations'] >= optimization_info['iterations']
+        assert np.isclose(optimization_info['final_objective'], -model.compute_log_likelihood())
+
+
+@pytest.mark.parametrize('optimizer_kwargs', [
+    {'maxiter': 2},
+    {'gtol': 1e-2, 'ftol': 1e-2},
+    {'method': 'Nelder-Mead', 'maxiter': 20},
+    {'method': 'adam', 'maxiter': 5, 'learning_rate': 0.1},
+])
+def test_make_optimizer_kwargs(optimizer_kwargs):
+    with tf.Session(graph=tf.Graph()):
+        model = _make_model()
+        log_likelihood_before = model.compute_log_likelihood()
+
+        optimization_info = {}
+        make_optimizer(optimizer_kwargs)(model, optimization_info)
+
+        assert optimization_info['method'] == optimizer_kwargs.get('method', 'L-BFGS-B')
+        assert optimization_info['iterations'] <= optimizer_kwargs.get('maxiter', 1000)
+        assert model.compute_log_likelihood() >= log_likelihood_before
+
+        if 'final_objective' in optimization_info:
+            assert np.isclose(optimization_info['final_objective'], -model.compute_log_likelihood())
+
+
+def test_make_optimizer_unknown_kwargs():
+    with pytest.raises(ValueError) as ex:
+        make_optimizer({'maxiter': 2, 'tolerance': 1})
+    assert str(ex.value) == "Unknown optimizer options passed: `['tolerance']`."
+
+
+def test_make_tolerance_schedule():
+    schedule = make_tolerance_schedule(5, initial_tolerance=1e-2, final_tolerance=1e-6, maxiter=100)
+
+    assert schedule(0) == {'maxiter': 100, 'gtol': 1e-2, 'ftol': 1e-2}
+    assert np.isclose(schedule(2)['gtol'], 1e-4)
+    assert np.isclose(schedule(4)['ftol'], 1e-6)
+    assert np.isclose(schedule(10)['gtol'], 1e-6)
+
+    assert np.isclose(make_tolerance_schedule(1, final_tolerance=1e-7)(0)['gtol'], 1e-7)
@@ -0,0 +1,38 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+
+from kerndisc.evaluation._shared import _PREFIX, SharedData  # noqa: I202, I100
+from kerndisc.evaluation._tasks import EvaluationData  # noqa: I202, I100
+
+
+def test_shared_data(tmpdir):
+    data = EvaluationData(np.linspace(0, 1, 10)[:, None], np.arange(10, dtype=np.float32)[:, None], None)
+    with SharedData(data, directory=str(tmpdir)) as shared_data:
+        opened_data = pickle.loads(pickle.dumps(shared_data.handle)).open()
+        assert opened_data.noise_weights is None
+        assert opened_data.y.dtype == np.float32
+        assert opened_data.fingerprint() == data.fingerprint()
+        assert os.path.isdir(shared_data.directory)
+    assert not os.path.exists(shared_data.directory)
+
+
+def test_shared_data_empty_array(tmpdir):
+    data = EvaluationData(np.zeros((0, 1)), np.zeros((0, 1)), np.ones(3))
+    with SharedData(data, directory=str(tmpdir)) as shared_data:
+        opened_data = shared_data.handle.open()
+    assert opened_data.x.shape == (0, 1)
+    assert np.array_equal(opened_data.noise_weights, np.ones(3))
+
+
+def test_shared_data_of_crashed_process_is_removed(tmpdir):
+    code = ('import os, numpy as np; from kerndisc.evaluation._shared import SharedData; from kerndisc.evaluation._tasks import EvaluationData; '
+            f'shared_data = SharedData(EvaluationData(np.ones((3, 1)), np.ones((3, 1))), directory={str(tmpdir)!r}); os._exit(1)')
+    subprocess.run([sys.executable, '-c', code])
+    assert len([name for name in os.listdir(str(tmpdir)) if name.startswith(_PREFIX)]) == 1
+
+    with SharedData(EvaluationData(np.ones((3, 1)), np.ones((3, 1))), directory=str(tmpdir)) as shared_data:
+        assert os.listdir(str(tmpdir)) == [os.path.basename(shared_data.directory)]
@@ -1,7 +1,8 @@
+from anytree import Node
 import gpflow
 import numpy as np
 
-from kerndisc.evaluation._util import add_jitter_to_model  # noqa: I202, I100
+from kerndisc.evaluation._util import add_jitter_to_model, build_model, transfer_params  # noqa: I202, I100
 
 
 def test_add_jitter_to_model():
@@ -18,3 +19,36 @@ def test_add_jitter_to_model():
 
     for param_value in m.read_values().values():
         assert param_value != 1.0
+
+
+def test_transfer_params():
+    params = {
+        'GPR/kern/rbf/variance': 2.,
+        'GPR/kern/rbf/lengthscales': 3.,
+        'GPR/likelihood/variance': 0.5,
+    }
+    param_names = [
+        'GPR/kern/sum/rbf/variance',
+        'GPR/kern/sum/rbf/lengthscales',
+        'GPR/kern/sum/rbf_1/variance',
+        'GPR/kern/sum/linear/variance',
+        'GPR/likelihood/variance',
+    ]
+
+    assert transfer_params(params, param_names) == {
+        'GPR/kern/sum/rbf/variance': 2.,
+        'GPR/kern/sum/rbf/lengthscales': 3.,
+        'GPR/likelihood/variance': 0.5,
+    }
+
+
+def test_build_model():
+    x, y = np.array([[0], [1], [2]]).astype(float), np.array([[0], [1], [0]]).astype(float)
+    ast = Node(gpflow.kernels.Sum, children=[Node(gpflow.kernels.RBF), Node(gpflow.kernels.Linear)])
+
+    model = build_model(x, y, ast, noise_floor=1e-2, jitter=1e-4, params={'GPR/kern/rbf/lengthscales': 3., 'GPR/likelihood/variance': 1e-6})
+    params = model.read_values()
+
+    assert np.isclose(params['GPR/kern/sum/rbf/lengthscales'], 3.)
+    assert np.isclose(params['GPR/likelihood/variance'], 2e-2)
+    assert model.jitter == 1e-4
@@ -1,8 +1,10 @@
 from anytree import Node
 import gpflow
+import pytest
 
+from kerndisc import Config, StructurePrior  # noqa: I202, I100
 from kerndisc.description import ast_to_text, simplify  # noqa: I202, I100
-from kerndisc.expansion._expand import expand_asts  # noqa: I202, I100
+from kerndisc.expansion._expand import _canonical_ast_key, _EXPANSION_CACHE, clear_expansion_cache, expand_asts  # noqa: I202, I100
 from kerndisc.expansion.grammars import expand_kernel  # noqa: I202, I100
 
 
@@ -22,3 +24,70 @@ def test_expand_asts(kernel_to_tree):
     # `expand_asts` should return a list containing the expansion of every single kernel
     # it was called with.
     assert set(expanded_kernels) == {ast_to_text(simplify(kernel_to_tree(k))) for k in res_should_be}
+
+
+def test_expand_asts_memoized():
+    clear_expansion_cache()
+    ast_linear = Node(gpflow.kernels.Linear)
+
+    first_expansion = expand_asts([ast_linear])
+    assert len(_EXPANSION_CACHE) == 1
+
+    second_expansion = expand_asts([ast_linear])
+    assert len(_EXPANSION_CACHE) == 1
+
+    assert [ast_to_text(ast) for ast in first_expansion] == [ast_to_text(ast) for ast in second_expansion]
+    # Cached ASTs must not be shared between calls.
+    assert not set(first_expansion) & set(second_expansion)
+
+    expand_asts([ast_linear], grammar_kwargs={'base_kernels_to_exclude': ['constant']})
+    assert len(_EXPANSION_CACHE) == 2
+
+    clear_expansion_cache()
+    assert not _EXPANSION_CACHE
+
+
+def test_canonical_ast_key():
+    sum_ab = Node(gpflow.kernels.Sum, children=[Node(gpflow.kernels.Linear), Node(gpflow.kernels.RBF)])
+    sum_ba = Node(gpflow.kernels.Sum, children=[Node(gpflow.kernels.RBF), Node(gpflow.kernels.Linear)])
+    assert _canonical_ast_key(sum_ab) == _canonical_ast_key(sum_ba)
+
+    nested = Node(gpflow.kernels.Sum, children=[sum_ab, Node(gpflow.kernels.White)])
+    flat = Node(gpflow.kernels.Sum, children=[Node(k) for k in [gpflow.kernels.Linear, gpflow.kernels.RBF, gpflow.kernels.White]])
+    assert ast_to_text(nested) == ast_to_text(flat)
+    assert _canonical_ast_key(nested) != _canonical_ast_key(flat)
+
+
+def test_expand_asts_config():
+    clear_expansion_cache()
+    ast_linear = Node(gpflow.kernels.Linear)
+
+    expanded_asts = expand_asts([ast_linear], config=Config(grammar='duvenaud'))
+    assert [ast_to_text(ast) for ast in expanded_asts] == [ast_to_text(ast) for ast in expand_asts([ast_linear])]
+    assert [key[0] for key in _EXPANSION_CACHE] == ['duvenaud']
+
+    with pytest.raises(ValueError):
+        expand_asts([Node(gpflow.kernels.RBF)], config=Config(grammar='unknown'))
+
+
+def test_expand_asts_parents():
+    parents = {}
+    expanded_asts = expand_asts([Node(gpflow.kernels.Linear), Node(gpflow.kernels.RBF)], parents=parents)
+
+    assert set(parents) == {ast_to_text(ast) for ast in expanded_asts}
+    assert set(parents.values()) == {'linear', 'rbf'}
+
+
+def test_expand_asts_structure_prior():
+    prior = StructurePrior.from_records([[
+        {'kernel': 'rbf', 'depth': 0, 'score': 1.},
+        {'kernel': 'rbf + white', 'depth': 1, 'score': 2.},
+        {'kernel': 'periodic * rbf', 'depth': 1, 'score': 0.},
+    ]] * 200)
+    ast_rbf = Node(gpflow.kernels.RBF)
+
+    expanded_kernels = [ast_to_text(ast) for ast in expand_asts([ast_rbf], structure_prior=prior)]
+
+    assert expanded_kernels[0] == 'periodic * rbf'
+    assert 'rbf + white' not in expanded_kernels
+    assert len(expanded_kernels) == len(expand_asts([ast_rbf])) - 1
@@ -0,0 +1,75 @@
+import json
+import os
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import gpflow
+import numpy as np
+import pytest
+
+from kerndisc.description import ast_to_dict, kernel_to_ast  # noqa: I202, I100
+from kerndisc.service import DiscoveryService  # noqa: I202, I100
+
+
+def _request(url, method='GET', body=None):
+    request = Request(url, data=json.dumps(body).encode() if body is not None else None, method=method)
+    try:
+        with urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def _wait_for(url, job_id, timeout=120):
+    start = time.time()
+    while time.time() - start < timeout:
+        _, status = _request(f'{url}/jobs/{job_id}')
+        if status['status'] not in ['queued', 'running']:
+            return status
+        time.sleep(0.1)
+    raise TimeoutError(job_id)
+
+
+def test_api_without_workers(tmpdir):
+    with DiscoveryService(os.path.join(tmpdir, 'jobs.sqlite'), n_workers=0) as service:
+        assert _request(f'{service.url}/health') == (200, {'workers': 0})
+
+        code, body = _request(f'{service.url}/jobs', 'POST', {'kind': 'discover', 'x': [0, 1], 'y': [0, 1]})
+        assert code == 201
+        job_id = body['id']
+
+        code, status = _request(f'{service.url}/jobs/{job_id}')
+        assert code == 200
+        assert status['status'] == 'queued'
+        assert _request(f'{service.url}/jobs/{job_id}/result')[0] == 409
+
+        assert _request(f'{service.url}/jobs/{job_id}', 'DELETE') == (202, {'status': 'cancelled'})
+        assert _request(f'{service.url}/jobs/{job_id}')[1]['status'] == 'cancelled'
+
+        assert _request(f'{service.url}/jobs/{"0" * 32}')[0] == 404
+        assert _request(f'{service.url}/jobs', 'POST', {'kind': 'unknown', 'x': [0], 'y': [0]})[0] == 400
+        assert _request(f'{service.url}/jobs', 'POST', {'x': [0, 1], 'y': [0]})[0] == 400
+
+
+@pytest.mark.parametrize('kind', ['discover', 'evaluate'])
+def test_jobs_run_by_workers(tmpdir, kind):
+    x = np.linspace(0, 1, 10)
+    job = {'kind': kind, 'x': x.tolist(), 'y': np.sin(6 * x).tolist()}
+    if kind == 'discover':
+        job['kwargs'] = {'search_depth': 1}
+    else:
+        job['asts'] = [ast_to_dict(kernel_to_ast(gpflow.kernels.RBF(1))), ast_to_dict(kernel_to_ast(gpflow.kernels.Linear(1)))]
+
+    with DiscoveryService(os.path.join(tmpdir, 'jobs.sqlite'), n_workers=2) as service:
+        _, body = _request(f'{service.url}/jobs', 'POST', job)
+        status = _wait_for(service.url, body['id'])
+        assert status['status'] == 'done', status['error']
+        assert status['progress']['evaluated_kernels'] > 0
+
+        code, result = _request(f'{service.url}/jobs/{body["id"]}/result')
+        assert code == 200
+        if kind == 'discover':
+            assert 'termination_reason' in result
+        else:
+            assert [kernel['kernel'] for kernel in result] == ['rbf', 'linear']
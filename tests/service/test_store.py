@@ -0,0 +1,61 @@
+import os
+
+from kerndisc.service._store import CANCELLED, DONE, FAILED, JobStore, QUEUED, RUNNING  # noqa: I202, I100
+
+
+def test_submit_and_claim(tmpdir):
+    store = JobStore(os.path.join(tmpdir, 'jobs.sqlite'))
+    first_id = store.submit('discover', {'x': [0, 1], 'y': [0, 1]})
+    second_id = store.submit('evaluate', {'x': [0], 'y': [0], 'asts': []})
+
+    assert store.status(first_id)['status'] == QUEUED
+    assert store.claim('worker-0') == (first_id, 'discover', {'x': [0, 1], 'y': [0, 1]})
+    assert store.claim('worker-1')[0] == second_id
+    assert store.claim('worker-0') is None
+
+    status = store.status(first_id)
+    assert status['status'] == RUNNING
+    assert status['worker_id'] == 'worker-0'
+    assert store.status('unknown') is None
+
+
+def test_progress_and_result(tmpdir):
+    store = JobStore(os.path.join(tmpdir, 'jobs.sqlite'))
+    job_id = store.submit('discover', {})
+    store.claim('worker-0')
+
+    store.update_progress(job_id, {'depth': 1})
+    assert store.status(job_id)['progress'] == {'depth': 1}
+    assert store.result(job_id) is None
+
+    store.finish(job_id, '{"a": 1}')
+    assert store.status(job_id)['status'] == DONE
+    assert store.result(job_id) == '{"a": 1}'
+
+
+def test_cancel(tmpdir):
+    store = JobStore(os.path.join(tmpdir, 'jobs.sqlite'))
+    queued_id = store.submit('discover', {})
+    running_id = store.submit('discover', {})
+
+    assert store.cancel(queued_id) == CANCELLED
+    assert store.claim('worker-0')[0] == running_id
+
+    assert not store.is_cancel_requested(running_id)
+    assert store.cancel(running_id) == RUNNING
+    assert store.is_cancel_requested(running_id)
+    store.mark_cancelled(running_id)
+    assert store.status(running_id)['status'] == CANCELLED
+
+    assert store.cancel('unknown') is None
+
+
+def test_fail_running_jobs(tmpdir):
+    store = JobStore(os.path.join(tmpdir, 'jobs.sqlite'))
+    job_id = store.submit('discover', {})
+    store.submit('discover', {})
+    store.claim('worker-0')
+
+    assert store.fail_running_jobs('worker-0', 'Worker died.') == 1
+    assert store.status(job_id)['status'] == FAILED
+    assert store.status(job_id)['error'] == 'Worker died.'
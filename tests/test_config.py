@@ -0,0 +1,25 @@
+import pickle
+
+from kerndisc import Config  # noqa: I202, I100
+
+
+def test_config_defaults():
+    config = Config()
+
+    assert config.metric == 'bayesian_information_criterion'
+    assert config.grammar == 'duvenaud'
+    assert config.cores == 1
+
+
+def test_config_from_environment(monkeypatch):
+    monkeypatch.setenv('METRIC', 'negative_log_likelihood')
+    monkeypatch.setenv('CORES', '4')
+    monkeypatch.delenv('GRAMMAR', raising=False)
+
+    assert Config.from_environment() == Config(metric='negative_log_likelihood', grammar='duvenaud', cores=4)
+
+
+def test_config_picklable():
+    config = Config(metric='negative_log_likelihood', cores=2)
+
+    assert pickle.loads(pickle.dumps(config)) == config
@@ -1,6 +1,9 @@
+import json
+
 import numpy as np
 
-from kerndisc import discover  # noqa: I202, I100
+from kerndisc import BayesianSearch, discover  # noqa: I202, I100
+from kerndisc.evaluation import make_json_lines_hook  # noqa: I202, I100
 
 
 def test_discover_no_depth():
@@ -63,3 +66,56 @@ def test_discover_early_stopping():
 
     assert 'Depth `2`: Early stopping, improvement was `' in kernels['termination_reason']
     assert '`, below threshold `20.00%`.' in kernels['termination_reason']
+
+
+def test_discover_optimizer_kwargs():
+    kernels = discover(np.array([0, 1, 2]), np.array([0, 1, 2]), search_depth=1,
+                       grammar_kwargs={'base_kernels_to_exclude': ['constant', 'white', 'linear', 'periodic']},
+                       optimizer_kwargs=lambda depth: {'maxiter': depth + 1})
+
+    assert 'rbf' in kernels
+    assert kernels['rbf']['evaluation']['iterations'] <= 1
+
+
+def test_discover_evaluation_hook(tmpdir):
+    path = str(tmpdir.join('evaluations.jsonl'))
+    kernels = discover(np.array([0, 1, 2]), np.array([0, 1, 2]), search_depth=1,
+                       grammar_kwargs={'base_kernels_to_exclude': ['constant', 'white', 'linear', 'periodic']},
+                       evaluation_hook=make_json_lines_hook(path))
+
+    with open(path) as json_lines_file:
+        records = [json.loads(line) for line in json_lines_file]
+
+    assert {record['kernel'] for record in records} == {'rbf'}
+    assert records[0]['depth'] == 0
+    assert records[0]['score'] == kernels['rbf']['score']
+    assert records[0]['optimization_time'] == kernels['rbf']['evaluation']['optimization_time']
+
+
+def test_discover_profile():
+    kernels = discover(np.array([0, 1, 2]), np.array([0, 1, 2]), search_depth=1,
+                       grammar_kwargs={'base_kernels_to_exclude': ['constant', 'white', 'linear', 'periodic']},
+                       profile=True, profile_slowest_n=1)
+
+    assert len(kernels['profile']['depths']) == 1
+    assert kernels['profile']['depths'][0]['optimization'] > 0
+    assert [candidate['kernel'] for candidate in kernels['profile']['slowest_candidates']] == ['rbf']
+    assert 'profile' not in kernels['rbf']['evaluation']
+
+
+def test_discover_float32():
+    kernels = discover(np.array([0, 1, 2]), np.array([0, 1, 2]), search_depth=1, find_n_best=2, precision='float32',
+                       grammar_kwargs={'base_kernels_to_exclude': ['constant', 'white', 'periodic']})
+
+    finalists = [kernel for kernel_name, kernel in kernels.items() if kernel_name in ['linear', 'rbf']]
+    assert len(finalists) == 2
+    assert all(kernel['evaluation']['precision'] == 'float64' for kernel in finalists)
+
+
+def test_discover_bayesian_search():
+    kernels = discover(np.array([0, 1, 2]), np.array([0, 1, 2]), search_depth=5, max_kernels_per_depth=None, find_n_best=100,
+                       search_strategy=BayesianSearch(n_per_depth=2, evaluation_budget=5))
+
+    # The `white` start kernel and `5` evaluated kernels, along with `highscore_progression` and `termination_reason`.
+    assert len(kernels) == 8
+    assert kernels['termination_reason'] == 'Depth `3`: Evaluation budget of `5` kernels exhausted.'
@@ -0,0 +1,33 @@
+import gpflow
+import numpy as np
+import pytest
+
+from kerndisc._kernel_functions import compile_kernel  # noqa: I202, I100
+
+
+def test_compile_kernel(available_kernels):
+    x, x2 = np.linspace(0, 2, 7).reshape(-1, 1), np.linspace(-1, 3, 5).reshape(-1, 1)
+    for kernel_class in available_kernels.values():
+        kernel = kernel_class(1)
+        for param in kernel.parameters:
+            param.assign(np.random.uniform(0.5, 2))
+        kernel_function = compile_kernel(kernel)
+
+        assert np.allclose(kernel_function(x), kernel.compute_K_symm(x), atol=1e-5)
+        assert np.allclose(kernel_function(x, x2), kernel.compute_K(x, x2), atol=1e-5)
+        assert np.allclose(kernel_function(x, diag=True), kernel.compute_Kdiag(x), atol=1e-5)
+
+
+def test_compile_kernel_combination():
+    x, x2 = np.linspace(0, 2, 7).reshape(-1, 1), np.linspace(-1, 3, 5).reshape(-1, 1)
+    kernel = (gpflow.kernels.RBF(1) + gpflow.kernels.Linear(1)) * gpflow.kernels.Periodic(1) + gpflow.kernels.White(1)
+    kernel_function = compile_kernel(kernel)
+
+    assert np.allclose(kernel_function(x), kernel.compute_K_symm(x))
+    assert np.allclose(kernel_function(x, x2), kernel.compute_K(x, x2))
+    assert np.allclose(kernel_function(x, diag=True), kernel.compute_Kdiag(x))
+
+
+def test_compile_kernel_unsupported():
+    with pytest.raises(ValueError):
+        compile_kernel(gpflow.kernels.Coregion(1, output_dim=1, rank=1))
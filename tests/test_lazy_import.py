@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+from kerndisc import save_results  # noqa: I202, I100
+from kerndisc.description import dict_to_ast  # noqa: I202, I100
+
+
+def _run(code):
+    return subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE).stdout.decode().strip()
+
+
+def test_import_without_tensorflow():
+    output = _run('import logging, sys\n'
+                  'import kerndisc\n'
+                  'from kerndisc.description import ast_to_text, describe, pretty_ast, simplify\n'
+                  'print("tensorflow" in sys.modules, "gpflow" in sys.modules, bool(logging.getLogger().handlers))')
+
+    assert output == 'False False False'
+
+
+def test_load_results_without_tensorflow(tmpdir):
+    path = str(tmpdir.join('results'))
+    save_results(path, [{'linear + rbf': {'ast': dict_to_ast({'kernel': 'sum', 'children': [{'kernel': 'rbf'}, {'kernel': 'linear'}]}),
+                                          'params': {}, 'score': 1., 'depth': 1}}])
+    output = _run('import sys\n'
+                  'from kerndisc import load_results\n'
+                  'from kerndisc.description import ast_to_text\n'
+                  f'print(ast_to_text(load_results({path!r})[0]["linear + rbf"]["ast"]), "gpflow" in sys.modules)')
+
+    assert output == 'linear + rbf False'
+
+
+def test_lazy_attributes():
+    output = _run('import sys\n'
+                  'from kerndisc import discover\n'
+                  'print(callable(discover), "gpflow" in sys.modules)')
+
+    assert output == 'True True'
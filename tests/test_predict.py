@@ -0,0 +1,86 @@
+import gpflow
+import numpy as np
+import pytest
+
+from kerndisc import Predictor  # noqa: I202, I100
+from kerndisc._preprocessing import preprocess  # noqa: I202, I100
+from kerndisc.description import instantiate_model_from_ast, kernel_to_ast  # noqa: I202, I100
+
+
+@pytest.fixture
+def data():
+    x = np.linspace(0, 20, 30)
+    y = 5 * np.sin(x) + x + 10
+    return x, y
+
+
+def test_predictor(data):
+    x, y = data
+    ast = kernel_to_ast(gpflow.kernels.RBF(1) + gpflow.kernels.Periodic(1) * gpflow.kernels.Linear(1))
+    model = instantiate_model_from_ast(*preprocess(x, y, rescale_x_to_upper_bound=10), ast)
+    gpflow.train.ScipyOptimizer().minimize(model, maxiter=50)
+    params = model.read_values()
+
+    x_new = np.linspace(-5, 25, 101)
+    predictor = Predictor(x, y, ast, params, rescale_x_to_upper_bound=10, chunk_size=16)
+    mean, variance = predictor.predict(x_new)
+    expected_mean, expected_variance = model.predict_f(10 * x_new.reshape(-1, 1) / x.max())
+
+    assert mean.shape == variance.shape == (101, 1)
+    assert np.allclose(mean, expected_mean * y.std() + y.mean(), atol=1e-4)
+    assert np.allclose(variance, expected_variance * y.var(), atol=1e-4)
+
+    _, noisy_variance = predictor.predict(x_new, include_noise=True)
+    assert np.allclose(noisy_variance - variance, model.likelihood.variance.read_value() * y.var())
+
+
+def test_predictor_from_discovery(data):
+    x, y = data
+    discovery = {
+        'rbf': {'ast': kernel_to_ast(gpflow.kernels.RBF(1)), 'params': {}, 'score': 1.},
+        'linear': {'ast': kernel_to_ast(gpflow.kernels.Linear(1)), 'params': {}, 'score': 2.},
+        'highscore_progression': [2., 1.],
+        'termination_reason': 'Some reason.',
+    }
+
+    mean, _ = Predictor.from_discovery(x, y, discovery).predict(x)
+    expected_mean, _ = Predictor(x, y, discovery['rbf']['ast'], {}).predict(x)
+    assert np.allclose(mean, expected_mean)
+
+    mean, _ = Predictor.from_discovery(x, y, discovery, kernel_name='linear').predict(x)
+    expected_mean, _ = Predictor(x, y, discovery['linear']['ast'], {}).predict(x)
+    assert np.allclose(mean, expected_mean)
+
+    with pytest.raises(ValueError):
+        Predictor.from_discovery(x, y, discovery, kernel_name='periodic')
+
+
+def test_predictor_components(data):
+    x, y = data
+    ast = kernel_to_ast(gpflow.kernels.RBF(1) + gpflow.kernels.Periodic(1) * gpflow.kernels.Linear(1) + gpflow.kernels.White(1))
+    predictor = Predictor(x, y, ast, {}, chunk_size=7)
+
+    x_new = np.linspace(-5, 25, 50)
+    components = predictor.predict_components(x_new)
+    mean, _ = predictor.predict(x_new)
+
+    assert sorted(name for name, _, _ in components) == ['linear * periodic', 'rbf', 'white']
+    assert np.allclose(sum(component_mean for _, component_mean, _ in components) + y.mean(), mean)
+
+    for name, component_mean, component_variance in components:
+        assert component_mean.shape == component_variance.shape == (50, 1)
+        assert np.all(component_variance >= -1e-8)
+        if name == 'white':
+            assert np.allclose(component_mean, 0)
+
+
+def test_predictor_components_single_kernel(data):
+    x, y = data
+    predictor = Predictor(x, y, kernel_to_ast(gpflow.kernels.RBF(1)), {})
+
+    [(name, component_mean, component_variance)] = predictor.predict_components(x)
+    mean, variance = predictor.predict(x)
+
+    assert name == 'rbf'
+    assert np.allclose(component_mean + y.mean(), mean)
+    assert np.allclose(component_variance, variance)
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from kerndisc._preprocessing import preprocess  # noqa: I202, I100
+from kerndisc._preprocessing import chunk_arrays, preprocess, preprocess_stream, reduce_data, reduce_stream, stream_statistics  # noqa: I202, I100
 
 
 def test_bad_shape():
@@ -61,3 +61,106 @@ def test_rescale_x():
     with pytest.raises(ValueError) as ex:
         preprocess(np.array([-6, -17, -28, -40, 0]), np.array([1, 2, 3, 4, 5]), rescale_x_to_upper_bound=0)
     assert str(ex.value) == 'Bad upper bound passed for to rescale `x` or bad maximum found for `x`.'
+
+
+def test_stream_statistics():
+    rng = np.random.RandomState(0)
+    x, y = np.arange(1, 1001), rng.randn(1000) * 3 + 1e6
+
+    statistics = stream_statistics(chunk_arrays(x, y, chunk_size=64))
+    assert statistics.count == 1000
+    assert np.isclose(statistics.y_mean, y.mean())
+    assert np.isclose(statistics.y_std, y.std())
+    assert statistics.x_max == 1000
+
+    with pytest.raises(ValueError):
+        stream_statistics([])
+
+
+def test_preprocess_stream(tmpdir):
+    rng = np.random.RandomState(0)
+    x, y = np.arange(1, 1001), rng.randn(1000)
+    np.save(str(tmpdir.join('x.npy')), x)
+    np.save(str(tmpdir.join('y.npy')), y)
+
+    chunks = chunk_arrays(np.load(str(tmpdir.join('x.npy')), mmap_mode='r'), np.load(str(tmpdir.join('y.npy')), mmap_mode='r'), chunk_size=100)
+    preprocessed_chunks = list(preprocess_stream(chunks, rescale_x_to_upper_bound=5))
+    assert len(preprocessed_chunks) == 10
+    assert all(x_chunk.shape == y_chunk.shape == (100, 1) for x_chunk, y_chunk in preprocessed_chunks)
+
+    x_expected, y_expected = preprocess(x, y, rescale_x_to_upper_bound=5)
+    assert np.allclose(np.concatenate([x_chunk for x_chunk, _ in preprocessed_chunks]), x_expected)
+    assert np.allclose(np.concatenate([y_chunk for _, y_chunk in preprocessed_chunks]), y_expected)
+
+
+def test_preprocess_stream_sd_zero():
+    x_chunk, y_chunk = next(preprocess_stream(chunk_arrays(np.array([1, 2]), np.array([1, 1]))))
+    assert y_chunk.mean() == 0
+    assert y_chunk.std() == 0
+
+
+def test_preprocess_stream_bad_input():
+    with pytest.raises(ValueError):
+        chunk_arrays(np.array([0]), np.array([0, 1]))
+
+    with pytest.raises(ValueError):
+        preprocess_stream(iter(chunk_arrays(np.array([1, 2]), np.array([1, 2]))))
+
+    with pytest.raises(ValueError):
+        preprocess_stream(chunk_arrays(np.array([1, 2]), np.array([1, 2])), rescale_x_to_upper_bound=0)
+
+    statistics = stream_statistics(chunk_arrays(np.array([1, 2]), np.array([1, 2])))
+    chunks = iter(chunk_arrays(np.array([1, 2]), np.array([1, 2])))
+    assert len(list(preprocess_stream(chunks, statistics=statistics))) == 1
+
+
+def test_reduce_data_duplicates():
+    x, y, noise_weights = reduce_data(np.array([2, 1, 1, 1.05, 3]), np.array([5, 1, 2, 6, 7]), duplicate_tolerance=0.1)
+
+    assert np.allclose(x, [1.05 / 3 + 2 / 3, 2, 3])
+    assert np.allclose(y, [3, 5, 7])
+    assert np.array_equal(noise_weights, [3, 1, 1])
+
+
+def test_reduce_data_resolution_and_n_points():
+    x, y = np.arange(100, dtype=float), np.arange(100, dtype=float) % 10
+
+    x_reduced, y_reduced, noise_weights = reduce_data(x, y, resolution=10)
+    assert np.array_equal(x_reduced, np.arange(4.5, 100, 10))
+    assert np.allclose(y_reduced, 4.5)
+    assert np.array_equal(noise_weights, np.full(10, 10.))
+
+    x_reduced, y_reduced, noise_weights = reduce_data(x, y, n_points=20)
+    assert x_reduced.shape == y_reduced.shape == noise_weights.shape == (20,)
+    assert noise_weights.sum() == 100
+    assert np.isclose(np.sum(noise_weights * y_reduced), y.sum())
+
+    x_reduced, y_reduced, noise_weights = reduce_data(x, y, n_points=20, preserve_extrema=True)
+    assert x_reduced.shape[0] <= 20
+    assert y_reduced.min() == 0 and y_reduced.max() == 9
+    assert np.all(np.diff(x_reduced) > 0)
+    assert np.array_equal(noise_weights, np.ones_like(x_reduced))
+
+
+def test_reduce_stream():
+    rng = np.random.RandomState(0)
+    x, y = np.sort(rng.uniform(0, 100, 1000)), rng.randn(1000)
+
+    expected = reduce_data(x, y, resolution=0.7, n_points=50)
+    reduced = reduce_stream(chunk_arrays(x, y, chunk_size=33), resolution=0.7, n_points=50)
+    for expected_array, reduced_array in zip(expected, reduced):
+        assert np.allclose(expected_array, reduced_array)
+
+
+def test_reduce_data_bad_input():
+    with pytest.raises(ValueError):
+        reduce_data(np.array([0]), np.array([0, 1]))
+
+    with pytest.raises(ValueError):
+        reduce_data(np.array([0, 1]), np.array([0, 1]), noise_weights=np.array([1, 0]))
+
+    with pytest.raises(ValueError):
+        reduce_data(np.array([0, 1]), np.array([0, 1]), resolution=0)
+
+    with pytest.raises(ValueError):
+        reduce_stream([])
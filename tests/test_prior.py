@@ -0,0 +1,45 @@
+from anytree import Node
+import gpflow
+import numpy as np
+
+from kerndisc import StructurePrior  # noqa: I202, I100
+from kerndisc._prior import expansion_rule  # noqa: I202, I100
+
+
+def test_expansion_rule():
+    assert expansion_rule('rbf', 'periodic * rbf') == 'rbf -> periodic * rbf'
+    assert expansion_rule('linear', 'linear + periodic') == ' -> periodic'
+    assert expansion_rule('linear + rbf', 'linear * periodic + periodic * rbf') == 'linear + rbf -> linear * periodic + periodic * rbf'
+
+
+def test_structure_prior_from_results():
+    result = {
+        'white': {'ast': None, 'params': {}, 'score': np.Inf, 'depth': 0},
+        'rbf': {'ast': None, 'params': {}, 'score': 5., 'depth': 0},
+        'linear': {'ast': None, 'params': {}, 'score': 9., 'depth': 0},
+        'periodic * rbf': {'ast': None, 'params': {}, 'score': 3., 'depth': 1},
+        'rbf + white': {'ast': None, 'params': {}, 'score': 4., 'depth': 1},
+        'linear * rbf': {'ast': None, 'params': {}, 'score': 6., 'depth': 2},
+        'highscore_progression': [5., 3., 3.],
+        'termination_reason': 'Depth `2`: Maximum search depth reached.',
+    }
+
+    prior = StructurePrior.from_results([result, result])
+
+    assert prior.wins == {'white -> rbf': 2, 'rbf -> periodic * rbf': 2}
+    assert prior.applications['white -> linear'] == 2
+    # Kernels of depth `2` are expanded from the best kernel so far, of depth `1`.
+    assert prior.applications['periodic * rbf -> linear * rbf'] == 2
+    assert prior.win_probability('white', 'rbf') == 0.75
+    assert prior.win_probability('white', 'linear') == 0.25
+    assert prior.win_probability('white', 'constant') == 0.5
+
+
+def test_structure_prior_rank():
+    prior = StructurePrior.from_records([[{'kernel': 'linear', 'depth': 0, 'score': 1.}, {'kernel': 'rbf', 'depth': 0, 'score': 2.}]] * 100,
+                                        risk_threshold=0.01)
+    asts = [Node(gpflow.kernels.RBF), Node(gpflow.kernels.Periodic), Node(gpflow.kernels.Linear)]
+
+    ranked = prior.rank(asts, {})
+
+    assert [ast.name for ast in ranked] == [gpflow.kernels.Linear, gpflow.kernels.Periodic]
@@ -0,0 +1,65 @@
+import cProfile
+
+import pytest
+
+from kerndisc._profiling import (add_evaluation_timings, format_depth_timings, keep_slowest_candidate,  # noqa: I202, I100
+                                 PHASES, summarize_profile, timed)
+
+
+def test_timed():
+    timings = {}
+    with timed(timings, 'expansion'):
+        pass
+    with timed(timings, 'expansion'):
+        pass
+
+    assert list(timings) == ['expansion']
+    assert timings['expansion'] >= 0
+
+    with timed(None, 'expansion'):
+        pass
+
+
+def test_timed_exception():
+    timings = {}
+    with pytest.raises(ValueError):
+        with timed(timings, 'scoring'):
+            raise ValueError
+
+    assert 'scoring' in timings
+
+
+def test_add_evaluation_timings():
+    timings = {'build': 1.}
+    add_evaluation_timings(timings, {'build_time': 1., 'optimization_time': 2., 'scoring_time': 3.})
+
+    assert timings == {'build': 2., 'optimization': 2., 'scoring': 3.}
+
+
+def test_keep_slowest_candidate():
+    slowest_candidates = []
+    for kernel_name, optimization_time in [('a', 1.), ('b', 3.), ('c', 2.)]:
+        profile = cProfile.Profile()
+        profile.runcall(sum, [optimization_time])
+        evaluation_info = {'optimization_time': optimization_time, 'profile': profile}
+        keep_slowest_candidate(slowest_candidates, 2, kernel_name, 0, evaluation_info)
+        assert 'profile' not in evaluation_info
+
+    profile = summarize_profile([], slowest_candidates)
+
+    assert [candidate['kernel'] for candidate in profile['slowest_candidates']] == ['b', 'c']
+    assert [candidate['evaluation_time'] for candidate in profile['slowest_candidates']] == [3., 2.]
+
+
+def test_summarize_profile():
+    profile = summarize_profile([{'expansion': 3., 'simplification': 1.}, {}], [])
+
+    assert len(profile['depths']) == 2
+    assert profile['depths'][0]['expansion'] == 2.
+    assert profile['depths'][0]['simplification'] == 1.
+    assert all(profile['depths'][1][phase] == 0. for phase in PHASES)
+
+    table = format_depth_timings(profile)
+
+    assert len(table.splitlines()) == 3
+    assert all(phase in table for phase in PHASES)
@@ -0,0 +1,51 @@
+import gpflow
+import numpy as np
+
+from kerndisc import BayesianSearch  # noqa: I202, I100
+from kerndisc._search import structure_distance, structure_features  # noqa: I202, I100
+from kerndisc.description import ast_to_text, kernel_to_ast  # noqa: I202, I100
+
+
+def _ast(kernel):
+    return kernel_to_ast(kernel)
+
+
+def test_structure_features():
+    features = structure_features(_ast(gpflow.kernels.Linear(1) * gpflow.kernels.RBF(1) + gpflow.kernels.Periodic(1)))
+
+    assert features == {'base:linear': 1, 'base:rbf': 1, 'base:periodic': 1, 'term:linear * rbf': 1, 'term:periodic': 1}
+
+
+def test_structure_distance():
+    linear, rbf, periodic = gpflow.kernels.Linear(1), gpflow.kernels.RBF(1), gpflow.kernels.Periodic(1)
+
+    assert structure_distance(_ast(linear * (rbf + periodic)), _ast(linear * rbf + linear * periodic)) == 0
+    assert structure_distance(_ast(rbf), _ast(rbf + periodic)) < structure_distance(_ast(rbf), _ast(linear * periodic))
+
+
+def test_bayesian_search_budget():
+    search = BayesianSearch(n_per_depth=2, evaluation_budget=3)
+    candidates = [_ast(gpflow.kernels.RBF(1)), _ast(gpflow.kernels.Linear(1)), _ast(gpflow.kernels.Periodic(1))]
+    scored_kernels = {'white': {'ast': _ast(gpflow.kernels.White(1)), 'score': np.Inf}}
+
+    assert search.select(candidates, scored_kernels) == candidates[:2]
+
+    scored_kernels.update({
+        'rbf': {'ast': candidates[0], 'score': 10.},
+        'linear': {'ast': candidates[1], 'score': 50.},
+    })
+    assert len(search.select(candidates[2:], scored_kernels)) == 1
+    assert search.select(candidates[2:], scored_kernels) == []
+
+
+def test_bayesian_search_prefers_expected_improvement():
+    rbf, linear, periodic = gpflow.kernels.RBF(1), gpflow.kernels.Linear(1), gpflow.kernels.Periodic(1)
+    scored_kernels = {
+        'rbf': {'ast': _ast(rbf), 'score': 10.},
+        'linear': {'ast': _ast(linear), 'score': 50.},
+    }
+    candidates = [_ast(linear + periodic), _ast(rbf + periodic)]
+
+    selected = BayesianSearch(n_per_depth=1, evaluation_budget=None).select(candidates, scored_kernels)
+
+    assert [ast_to_text(ast) for ast in selected] == ['periodic + rbf']
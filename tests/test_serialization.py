@@ -0,0 +1,91 @@
+import json
+import os
+
+import gpflow
+import numpy as np
+import pytest
+
+from kerndisc import load_results, results_to_json, save_results  # noqa: I202, I100
+from kerndisc.description import ast_to_text, kernel_to_ast  # noqa: I202, I100
+
+
+@pytest.fixture
+def results():
+    return [{
+        'rbf + white': {
+            'ast': kernel_to_ast(gpflow.kernels.RBF(1) + gpflow.kernels.White(1)),
+            'params': {'GPR/kern/rbf/lengthscales': np.array(2.), 'GPR/kern/rbf/variance': np.array([[1., 2.], [3., 4.]])},
+            'score': -1.5,
+            'depth': 1,
+            'evaluation': {'iterations': np.int64(10), 'optimization_time': 0.1},
+        },
+        'highscore_progression': [np.Inf, -1.5],
+        'termination_reason': 'Some reason.',
+    }, {
+        'linear': {
+            'ast': kernel_to_ast(gpflow.kernels.Linear(1)),
+            'params': {'GPR/kern/variance': np.array(3.)},
+            'score': np.Inf,
+            'depth': 0,
+            'evaluation': {},
+        },
+        'highscore_progression': [np.Inf],
+        'termination_reason': 'Some other reason.',
+    }]
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load_results(tmpdir, results, mmap):
+    path = str(tmpdir.join('results'))
+    save_results(path, results)
+    loaded_results = load_results(path, mmap=mmap)
+
+    assert len(loaded_results) == 2
+    for result, loaded_result in zip(results, loaded_results):
+        assert result.keys() == loaded_result.keys()
+        assert result['highscore_progression'] == loaded_result['highscore_progression']
+        assert result['termination_reason'] == loaded_result['termination_reason']
+
+        for kernel_name in [key for key in result if key not in ['highscore_progression', 'termination_reason']]:
+            kernel, loaded_kernel = result[kernel_name], loaded_result[kernel_name]
+            assert ast_to_text(loaded_kernel['ast']) == ast_to_text(kernel['ast']) == kernel_name
+            assert [node.full_name for node in loaded_kernel['ast'].descendants] == [node.full_name for node in kernel['ast'].descendants]
+            assert loaded_kernel['score'] == kernel['score']
+            assert loaded_kernel['depth'] == kernel['depth']
+            assert loaded_kernel['evaluation'] == kernel['evaluation']
+            assert kernel['params'].keys() == loaded_kernel['params'].keys()
+            for param_name, param_value in kernel['params'].items():
+                assert loaded_kernel['params'][param_name].shape == param_value.shape
+                assert np.array_equal(loaded_kernel['params'][param_name], param_value)
+                assert not loaded_kernel['params'][param_name].flags.writeable
+
+
+def test_save_results_contiguous_params(tmpdir, results):
+    path = str(tmpdir.join('results'))
+    save_results(path, results)
+
+    assert os.path.getsize(os.path.join(path, 'params.f64')) == 6 * 8
+    assert np.array_equal(np.fromfile(os.path.join(path, 'params.f64'), dtype='<f8'), [2., 1., 2., 3., 4., 3.])
+
+
+def test_load_results_unsupported_version(tmpdir, results):
+    path = str(tmpdir.join('results'))
+    save_results(path, results)
+    with open(os.path.join(path, 'index.json')) as index_file:
+        index = json.load(index_file)
+    index['format_version'] = 0
+    with open(os.path.join(path, 'index.json'), 'w') as index_file:
+        json.dump(index, index_file)
+
+    with pytest.raises(ValueError):
+        load_results(path)
+
+
+def test_results_to_json(results):
+    converted_results = json.loads(json.dumps(results_to_json(results), allow_nan=False))
+
+    assert converted_results[0]['highscore_progression'] == [None, -1.5]
+    assert converted_results[0]['rbf + white']['ast']['kernel'] == 'sum'
+    assert converted_results[0]['rbf + white']['params']['GPR/kern/rbf/variance'] == [[1., 2.], [3., 4.]]
+    assert converted_results[0]['rbf + white']['evaluation'] == {'iterations': 10, 'optimization_time': 0.1}
+    assert converted_results[1]['linear']['score'] is None
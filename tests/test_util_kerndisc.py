@@ -2,7 +2,7 @@ from random import randint
 
 import pytest
 
-from kerndisc._util import build_all_implemented_base_asts, calculate_relative_improvement, n_best_scored_kernels  # noqa: I202, I100
+from kerndisc._util import build_all_implemented_base_asts, calculate_relative_improvement, Leaderboard, n_best_scored_kernels  # noqa: I202, I100
 from kerndisc.expansion.grammars._grammar_duvenaud import IMPLEMENTED_BASE_KERNEL_NAMES  # noqa: I202, I100
 
 
@@ -30,6 +30,39 @@ def test_n_best_scored_kernels():
     assert n_best_scored_kernels(more_scores, n=len(more_scores)) == list(range(200))
 
 
+def test_leaderboard():
+    scored_kernels = {str(i): {'score': randint(-20, 20)} for i in range(200)}
+    leaderboard = Leaderboard()
+    for kernel_name, value in scored_kernels.items():
+        leaderboard.update(kernel_name, value['score'])
+
+    assert len(leaderboard) == 200
+    assert leaderboard.top(10) == n_best_scored_kernels(scored_kernels, n=10)
+    assert leaderboard.top(None) == n_best_scored_kernels(scored_kernels, n=200)
+
+    scored_kernels['199']['score'] = -1000
+    leaderboard.update('199', -1000)
+    assert leaderboard.top(10) == n_best_scored_kernels(scored_kernels, n=10)
+    assert len(leaderboard) == 200
+
+
+def test_leaderboard_snapshot():
+    leaderboard = Leaderboard()
+    assert leaderboard.snapshot() == []
+
+    leaderboard.update('white', float('inf'))
+    leaderboard.update('rbf', float('nan'))
+    assert leaderboard.snapshot(2) == [('white', float('inf')), ('rbf', float('inf'))]
+
+    leaderboard.update('linear', 2.)
+    leaderboard.update('periodic', 1.)
+    assert leaderboard.snapshot(0) == []
+    assert leaderboard.snapshot() == [('periodic', 1.)]
+
+    assert leaderboard.leader_progression == ['white', 'periodic']
+    assert leaderboard.highscore_progression == [float('inf'), 1.]
+
+
 def test_build_all_implemented_base_asts():
     base_asts = build_all_implemented_base_asts()
     baste_ast_names = [node.name.__name__.lower() for node in base_asts]